@@ -1,11 +1,26 @@
-from flask import Flask, send_from_directory
+from flask import Flask, Response
 from flask_cors import CORS
 from config import Config
-from database.db import init_database
+from database.db import init_app as init_db, init_database, pool_stats, writer_stats
 from routes.auth_routes import auth_bp
 from routes.student_routes import student_bp
 from routes.recruiter_routes import recruiter_bp
 from routes.job_routes import job_bp
+from routes.batch_routes import batch_bp
+from routes.cv_routes import cv_bp
+from models.job_model import Job
+from models.skill_model import Skill
+from models.location_model import Location
+from models.cv_blob_model import CVBlob
+from models.task_model import Task
+from utils.response_cache import response_cache
+from utils.job_snapshot import job_snapshot
+from utils.cv_extractor import cv_extractor
+from utils.cv_tasks import extract_cv_text as extract_cv_text_task
+from utils.task_queue import task_queue
+from utils.metrics import metrics
+from utils.file_handler import delete_unregistered_cv_file, delete_stale_spool_files
+import click
 import os
 
 def create_app():
@@ -16,13 +31,25 @@ def create_app():
     CORS(app)
     
     # Initialize database
+    init_db(app)
     init_database()
+    response_cache.configure(
+        max_bytes=app.config['RESPONSE_CACHE_MAX_BYTES'],
+        ttl=app.config['RESPONSE_CACHE_TTL']
+    )
+    cv_extractor.configure(workers=app.config['CV_EXTRACT_WORKERS'], timeout=app.config['CV_EXTRACT_TIMEOUT'])
+    if app.config['TASK_WORKERS'] is None:
+        app.config['TASK_WORKERS'] = max(2, cv_extractor.size)
+    task_queue.init_app(app)
+    metrics.init_app(app)
     
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(student_bp, url_prefix='/student')
     app.register_blueprint(recruiter_bp, url_prefix='/recruiter')
     app.register_blueprint(job_bp, url_prefix='/jobs')
+    app.register_blueprint(cv_bp, url_prefix='/cvs')
+    app.register_blueprint(batch_bp)
     
     @app.route('/')
     def index():
@@ -30,13 +57,136 @@ def create_app():
     
     @app.route('/health')
     def health():
-        return {'status': 'healthy'}
+        return {
+            'status': 'healthy',
+            'db_pool': pool_stats(),
+            'db_writer': writer_stats(),
+            'response_cache': response_cache.stats(),
+            'job_snapshot': job_snapshot.stats(),
+            'tasks': task_queue.stats()
+        }
+    
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index():
+        """Rebuild the job full-text search index from existing rows"""
+        count = Job.rebuild_search_index()
+        print(f'Indexed {count} active jobs')
+
+    @app.cli.command('backfill-skills')
+    @click.option('--batch-size', default=500, show_default=True, help='Rows tagged per transaction')
+    def backfill_skills(batch_size):
+        """Tag existing jobs and student profiles with normalized skills"""
+        jobs, students = Skill.backfill(batch_size)
+        print(f'Tagged {jobs} jobs and {students} student profiles')
+
+    @app.cli.command('backfill-locations')
+    @click.option('--batch-size', default=500, show_default=True, help='Rows resolved per transaction')
+    def backfill_locations(batch_size):
+        """Resolve existing job and student profile locations against the gazetteer"""
+        jobs, students = Location.backfill(batch_size)
+        print(f'{jobs} jobs and {students} student profiles have a known location')
+
+    @app.cli.command('check-query-plans')
+    def check_query_plans_command():
+        """Fail if any model query plans a full table scan, or a listing misses its covering index"""
+        from database.query_plans import check_query_plans
+        failures = 0
+        for label, sql, plan, scans, uncovered in check_query_plans():
+            status = 'FULL SCAN' if scans else 'NOT COVERED' if uncovered else 'ok'
+            print(f'[{status}] {label}')
+            for detail in plan:
+                print(f'    {detail}')
+            if scans or uncovered:
+                failures += 1
+                print(f'    SQL: {" ".join(sql.split())}')
+        if failures:
+            raise SystemExit(f'{failures} quer{"y" if failures == 1 else "ies"} fell back to a full scan '
+                             f'or an uncovered listing')
+
+    @app.cli.command('check-write-queries')
+    def check_write_queries_command():
+        """Fail if a mutating endpoint issues more statements than its budget"""
+        from database.query_counts import check_write_queries
+        failures = 0
+        for label, status, statements, budget in check_write_queries(app):
+            over = len(statements) > budget
+            print(f'[{"OVER" if over else "ok"}] {label}: {len(statements)}/{budget} statements (HTTP {status})')
+            if over:
+                failures += 1
+                for sql in statements:
+                    print(f'    {" ".join(sql.split())}')
+        if failures:
+            raise SystemExit(f'{failures} endpoint{"" if failures == 1 else "s"} over budget')
+
+    @app.cli.command('slow-queries')
+    @click.option('--top', default=10, show_default=True, help='Statements to show')
+    @click.option('--log', 'path', default=None, help='Log file (default: SLOW_QUERY_LOG)')
+    def slow_queries(top, path):
+        """Rank logged slow statements by total time"""
+        from database.slow_queries import summarize
+        path = path or app.config['SLOW_QUERY_LOG']
+        ranked = summarize(path, top)
+        if not ranked:
+            print(f'No slow queries logged in {path}')
+            return
+        for number, stats in enumerate(ranked, 1):
+            endpoints = ', '.join(f'{name} x{count}' for name, count in
+                                  sorted(stats['endpoints'].items(), key=lambda item: -item[1]))
+            print(f"{number}. {stats['total_ms']:.1f} ms total, {stats['count']} calls, "
+                  f"mean {stats['mean_ms']:.1f} ms, max {stats['max_ms']:.1f} ms, max rows {stats['max_rows']}")
+            print(f"    {stats['sql']}")
+            print(f'    endpoints: {endpoints}')
+            for detail in stats['plan'] or ():
+                print(f'    plan: {detail}')
+
+    @app.cli.command('gc-cv-files')
+    @click.option('--grace-minutes', default=60, show_default=True,
+                  help='Keep unreferenced CVs this long in case they are uploaded again')
+    def gc_cv_files(grace_minutes):
+        """Delete stored CVs no profile references any more"""
+        paths = CVBlob.collect_garbage(grace_minutes * 60, delete_unregistered_cv_file)
+        spooled = delete_stale_spool_files(grace_minutes * 60)
+        usage = CVBlob.get_usage()
+        print(f'Deleted {len(paths)} unreferenced CVs and {spooled} abandoned uploads')
+        print(f'{usage["blobs"]} CVs stored in {usage["stored_bytes"]} bytes '
+              f'({usage["referenced_bytes"]} bytes referenced by profiles)')
+
+    @app.cli.command('prune-job-changes')
+    @click.option('--retention-hours', default=24, show_default=True,
+                  help='Keep job change log entries this long for the in-memory indexes to replay')
+    def prune_job_changes(retention_hours):
+        """Delete old entries from the job change log"""
+        deleted = Job.prune_changes(retention_hours * 3600)
+        print(f'Deleted {deleted} job change log entries')
+
+    @app.cli.command('extract-cv-text')
+    @click.option('--limit', default=10000, show_default=True, help='Most CVs to queue in this run')
+    def extract_cv_text(limit):
+        """Queue text extraction for stored CVs that have none yet"""
+        pending = CVBlob.get_pending_extraction(limit)
+        for sha256, path in pending:
+            extract_cv_text_task.delay(sha256, path)
+        print(f'Queued text extraction for {len(pending)} CVs')
+
+    @app.cli.command('run-tasks')
+    @click.option('--threads', type=int, default=None,
+                  help='Worker threads per process  [default: one per CV extraction process, at least 4]')
+    @click.option('--processes', default=1, show_default=True, help='Worker processes')
+    def run_tasks(threads, processes):
+        """Run background task workers until interrupted"""
+        threads = threads or max(4, cv_extractor.size)
+        print(f'Running {processes} x {threads} task workers; press Ctrl+C to stop')
+        task_queue.run_forever(threads, processes)
 
-    # Serve uploaded files
-    @app.route('/uploads/<path:filename>')
-    def uploaded_file(filename):
-        upload_folder = app.config.get('UPLOAD_FOLDER')
-        return send_from_directory(upload_folder, filename)
+    @app.cli.command('requeue-dead-tasks')
+    @click.option('--name', default=None, help='Only tasks with this name')
+    def requeue_dead_tasks(name):
+        """Give tasks that used up their retries another set of attempts"""
+        print(f'Requeued {Task.requeue_dead(name)} tasks')
     
     return app
 
@@ -0,0 +1,123 @@
+"""Benchmark command line; run from backend/.
+
+    python -m benchmarks seed --db /tmp/bench.db --jobs 50000 --students 20000
+    python -m benchmarks run --db /tmp/bench.db --output results.json --baseline baseline.json
+    python -m benchmarks run --db /tmp/bench.db --url http://localhost:5000 --concurrency 8
+    python -m benchmarks compare results.json baseline.json --threshold p95=0.1
+    python -m benchmarks stress-writes --students 1000 --threads 64
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from benchmarks.report import (DEFAULT_THRESHOLDS, build_report, compare, format_report, load_report,
+                               save_report, settings_mismatch)
+from benchmarks.runner import HttpTarget, TestClientTarget, load_sample, run_benchmark
+from benchmarks.seed import seed_database
+from benchmarks.stress import stress_writes
+
+def _thresholds(values):
+    thresholds = {}
+    for value in values or ():
+        metric, _, limit = value.partition('=')
+        if metric not in DEFAULT_THRESHOLDS or not limit:
+            raise SystemExit(f"Invalid threshold {value!r}; use one of {', '.join(DEFAULT_THRESHOLDS)}=<fraction>")
+        thresholds[metric] = float(limit)
+    return thresholds
+
+def _compare(report, baseline, thresholds):
+    mismatched = settings_mismatch(report, baseline)
+    if mismatched:
+        print(f"Warning: the baseline was run with different {', '.join(mismatched)}")
+    regressions = compare(report, baseline, thresholds)
+    if not regressions:
+        print('No regressions against the baseline')
+        return 0
+    print(f'{len(regressions)} regression{"" if len(regressions) == 1 else "s"} against the baseline:')
+    for name, metric, old, new, change in regressions:
+        print(f'    {name} {metric}: {old} -> {new} ({change:+.1%})')
+    return 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Job portal load benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed = commands.add_parser('seed', help='Fill a database with synthetic data')
+    seed.add_argument('--db', required=True, help='Database file (created or extended)')
+    seed.add_argument('--students', type=int, default=2000)
+    seed.add_argument('--recruiters', type=int, default=100)
+    seed.add_argument('--jobs', type=int, default=5000)
+    seed.add_argument('--applications', type=int, default=20000)
+    seed.add_argument('--alerts', type=int, default=1000)
+    seed.add_argument('--seed', type=int, default=42, help='Random seed; equal seeds give equal data')
+    seed.add_argument('--force', action='store_true', help='Delete an existing database first')
+
+    run = commands.add_parser('run', help='Run the request mix and report latencies')
+    run.add_argument('--db', required=True, help='Seeded database (also used to pick users and jobs)')
+    run.add_argument('--url', help='Base URL of a running server; default is the in-process test client')
+    run.add_argument('--requests', type=int, default=2000, help='Measured requests')
+    run.add_argument('--duration', type=float, help='Stop after this many seconds')
+    run.add_argument('--concurrency', type=int, default=1, help='Worker threads')
+    run.add_argument('--warmup', type=int, default=100, help='Unmeasured requests sent first')
+    run.add_argument('--scenarios', help='Comma-separated scenario names (default: all)')
+    run.add_argument('--read-only', action='store_true', help='Skip scenarios that write')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--output', help='Save the JSON report here')
+    run.add_argument('--baseline', help='Compare against this report; exit 1 on regressions')
+    run.add_argument('--threshold', action='append', metavar='METRIC=FRACTION',
+                     help=f'Override a regression threshold (defaults: {DEFAULT_THRESHOLDS})')
+
+    diff = commands.add_parser('compare', help='Compare a saved report against a baseline')
+    diff.add_argument('report')
+    diff.add_argument('baseline')
+    diff.add_argument('--threshold', action='append', metavar='METRIC=FRACTION')
+
+    stress = commands.add_parser('stress-writes', help='Burst of concurrent applications and status updates; '
+                                                       'exit 1 if any request fails')
+    stress.add_argument('--students', type=int, default=500, help='Students applying to one job at once')
+    stress.add_argument('--status-updates', type=int, default=500)
+    stress.add_argument('--threads', type=int, default=32)
+    stress.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'seed':
+        if args.force:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(args.db + suffix):
+                    os.remove(args.db + suffix)
+        counts = seed_database(args.db, students=args.students, recruiters=args.recruiters, jobs=args.jobs,
+                               applications=args.applications, alerts=args.alerts, seed=args.seed)
+        print(f"Seeded {args.db} in {counts.pop('seconds')}s: {counts}")
+        return 0
+
+    if args.command == 'stress-writes':
+        with tempfile.TemporaryDirectory() as scratch:
+            result = stress_writes(os.path.join(scratch, 'stress.db'), students=args.students,
+                                   status_updates=args.status_updates, threads=args.threads, seed=args.seed)
+        print(json.dumps(result, indent=2))
+        return 1 if result['errors'] or not result['applications_consistent'] else 0
+
+    if args.command == 'compare':
+        return _compare(load_report(args.report), load_report(args.baseline), _thresholds(args.threshold))
+
+    thresholds = _thresholds(args.threshold)
+    scenario_names = set(args.scenarios.split(',')) if args.scenarios else None
+    target = HttpTarget(args.url) if args.url else TestClientTarget(os.path.abspath(args.db))
+    samples, elapsed = run_benchmark(
+        target, load_sample(args.db, args.seed), requests=args.requests, duration=args.duration,
+        concurrency=args.concurrency, warmup=args.warmup, scenario_names=scenario_names,
+        read_only=args.read_only, seed=args.seed)
+    settings = {key: value for key, value in vars(args).items() if key not in ('command', 'baseline', 'output')}
+    report = build_report(samples, elapsed, settings)
+    print(format_report(report))
+    if args.output:
+        save_report(report, args.output)
+        print(f'Saved {args.output}')
+    if args.baseline:
+        return _compare(report, load_report(args.baseline), thresholds)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Latency and throughput reports, and comparison against a baseline.
+
+A report is JSON: run metadata, an "overall" entry and one entry per
+scenario with request and error counts, throughput and latency
+percentiles in milliseconds. compare() flags a regression when a metric
+is worse than the baseline by more than its threshold (a fraction, so
+0.2 means 20%).
+"""
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+
+PERCENTILES = (50, 95, 99)
+
+DEFAULT_THRESHOLDS = {
+    'p50': 0.20,
+    'p95': 0.25,
+    'p99': 0.35,
+    'throughput': 0.15,
+    'error_rate': 0.01,  # absolute increase
+}
+# Latency changes smaller than this are noise, whatever the percentage
+MIN_LATENCY_DELTA_MS = 0.5
+# Scenarios with fewer measured requests are reported but not compared
+MIN_COMPARED_REQUESTS = 20
+# Runs that differ in these settings are not directly comparable
+COMPARABLE_SETTINGS = ('url', 'concurrency', 'scenarios', 'read_only')
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+def _summary(entries, elapsed):
+    latencies = sorted(latency * 1000 for latency, _ in entries)
+    statuses = {}
+    for _, status in entries:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(count for status, count in statuses.items() if status == '0' or int(status) >= 500)
+    summary = {
+        'requests': len(entries),
+        'errors': errors,
+        'error_rate': round(errors / len(entries), 4) if entries else 0.0,
+        'status_counts': statuses,
+        'throughput': round(len(entries) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'max': round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+    for p in PERCENTILES:
+        summary['latency_ms'][f'p{p}'] = round(percentile(latencies, p), 3)
+    return summary
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=5, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def build_report(samples, elapsed, settings):
+    """Summarize runner samples; settings records how the run was made"""
+    everything = [entry for entries in samples.values() for entry in entries]
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'elapsed_seconds': round(elapsed, 3),
+            'settings': settings,
+        },
+        'overall': _summary(everything, elapsed),
+        'scenarios': {name: _summary(entries, elapsed) for name, entries in sorted(samples.items()) if entries},
+    }
+
+def save_report(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(current, baseline, thresholds=None):
+    """Return [(scenario, metric, baseline value, current value, change)] for regressions"""
+    limits = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    regressions = []
+    entries = dict(current['scenarios'], overall=current['overall'])
+    base_entries = dict(baseline['scenarios'], overall=baseline['overall'])
+
+    for name, entry in sorted(entries.items()):
+        base = base_entries.get(name)
+        if base is None or min(entry['requests'], base['requests']) < MIN_COMPARED_REQUESTS:
+            continue
+
+        for metric, limit in limits.items():
+            if metric == 'throughput':
+                old, new = base['throughput'], entry['throughput']
+                if old and (old - new) / old > limit:
+                    regressions.append((name, metric, old, new, round((new - old) / old, 4)))
+            elif metric == 'error_rate':
+                old, new = base['error_rate'], entry['error_rate']
+                if new - old > limit:
+                    regressions.append((name, metric, old, new, round(new - old, 4)))
+            else:
+                old, new = base['latency_ms'][metric], entry['latency_ms'][metric]
+                if new - old > MIN_LATENCY_DELTA_MS and old and (new - old) / old > limit:
+                    regressions.append((name, metric, old, new, round((new - old) / old, 4)))
+    return regressions
+
+def settings_mismatch(current, baseline):
+    """Return the COMPARABLE_SETTINGS that differ between two reports"""
+    mine = current['meta'].get('settings', {})
+    theirs = baseline['meta'].get('settings', {})
+    return [key for key in COMPARABLE_SETTINGS if mine.get(key) != theirs.get(key)]
+
+def format_report(report):
+    """Render a report as a fixed-width table"""
+    lines = [f"{'scenario':<28} {'reqs':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"]
+    rows = sorted(report['scenarios'].items()) + [('overall', report['overall'])]
+    for name, entry in rows:
+        latency = entry['latency_ms']
+        lines.append(f"{name:<28} {entry['requests']:>6} {entry['errors']:>4} {entry['throughput']:>8.1f} "
+                     f"{latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f}")
+    return '\n'.join(lines)
@@ -0,0 +1,183 @@
+"""Drive the request mix against the app and record latencies.
+
+The in-process target sends requests through create_app()'s test client,
+so it measures the application and database without a network. With a
+base URL the same mix goes over real HTTP (one keep-alive connection per
+worker thread) to a running server.
+"""
+import http.client
+import itertools
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+from benchmarks.scenarios import SCENARIOS, WRITE_SCENARIOS
+from benchmarks.seed import PASSWORD
+
+SAMPLE_STUDENTS = 50
+SAMPLE_RECRUITERS = 20
+SAMPLE_JOBS = 2000
+
+class TestClientTarget:
+    """Sends requests through the Flask test client, one client per thread"""
+
+    def __init__(self, database_path):
+        # The config module reads DATABASE_PATH when it is first imported
+        os.environ['DATABASE_PATH'] = database_path
+        from app import create_app
+        self.app = create_app()
+        self._local = threading.local()
+
+    def request(self, method, path, token=None, body=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        response = client.open(path, method=method, json=body, headers=headers)
+        data = response.get_data()
+        response.close()
+        return response.status_code, data
+
+class HttpTarget:
+    """Sends requests to a running server over keep-alive connections"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.connection_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                                 else http.client.HTTPConnection)
+        self.prefix = parts.path.rstrip('/')
+        self._local = threading.local()
+
+    def request(self, method, path, token=None, body=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = self.connection_class(self.host, self.port, timeout=30)
+            try:
+                connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection; reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+
+def load_sample(database_path, seed=0):
+    """Pick the users and rows the scenarios act on"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(f'file:{database_path}?mode=ro', uri=True)
+    try:
+        students = conn.execute("""
+        SELECT u.id, u.email FROM users u JOIN student_profiles sp ON sp.user_id = u.id
+        ORDER BY u.id DESC LIMIT ?
+        """, (SAMPLE_STUDENTS * 20,)).fetchall()
+        recruiters = conn.execute("""
+        SELECT u.id, u.email, j.id, MIN(a.id)
+        FROM users u JOIN jobs j ON j.recruiter_id = u.id JOIN applications a ON a.job_id = j.id
+        WHERE u.role = 'recruiter'
+        GROUP BY j.id
+        ORDER BY j.id DESC LIMIT ?
+        """, (SAMPLE_RECRUITERS * 20,)).fetchall()
+        job_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM jobs WHERE is_active = 1 ORDER BY id DESC LIMIT ?", (SAMPLE_JOBS,))]
+    finally:
+        conn.close()
+    if not students or not recruiters or not job_ids:
+        raise SystemExit('The database needs students, jobs and applications; seed it first')
+
+    # One job per recruiter keeps the sampled recruiters distinct
+    by_recruiter = {}
+    for user_id, email, job_id, application_id in recruiters:
+        by_recruiter.setdefault(user_id, (user_id, email, job_id, application_id))
+    return {
+        'students': rng.sample(students, min(SAMPLE_STUDENTS, len(students))),
+        'recruiters': rng.sample(list(by_recruiter.values()), min(SAMPLE_RECRUITERS, len(by_recruiter))),
+        'job_ids': job_ids,
+    }
+
+def _login(target, email):
+    status, data = target.request('POST', '/auth/login', body={'email': email, 'password': PASSWORD})
+    if status != 200:
+        raise SystemExit(f'Login failed for {email} (HTTP {status}); was the database seeded by this tool?')
+    return json.loads(data)['token']
+
+def run_benchmark(target, sample, requests=2000, duration=None, concurrency=1, warmup=100,
+                  scenario_names=None, read_only=False, seed=0):
+    """Run the weighted mix and return (samples, elapsed seconds).
+
+    samples maps scenario name -> [(latency seconds, status)]; status 0
+    means the request raised. Stops after `requests` measured requests or
+    `duration` seconds, whichever comes first.
+    """
+    scenarios = [s for s in SCENARIOS
+                 if (scenario_names is None or s[0] in scenario_names)
+                 and not (read_only and s[0] in WRITE_SCENARIOS)]
+    if not scenarios:
+        raise SystemExit('No scenarios selected')
+    weights = [weight for _, weight, _, _ in scenarios]
+
+    students = [(email, _login(target, email)) for _, email in sample['students']]
+    recruiters = [(job_id, application_id, _login(target, email))
+                  for _, email, job_id, application_id in sample['recruiters']]
+
+    samples = {name: [] for name, _, _, _ in scenarios}
+    counter = itertools.count()
+    total = warmup + requests
+    deadline = [None]
+    start = [None]
+    start_lock = threading.Lock()
+
+    def worker(number):
+        rng = random.Random(seed * 1000 + number)
+        while True:
+            index = next(counter)
+            if index >= total:
+                return
+            if index >= warmup:
+                with start_lock:
+                    if start[0] is None:
+                        start[0] = time.perf_counter()
+                        if duration:
+                            deadline[0] = start[0] + duration
+                if deadline[0] is not None and time.perf_counter() > deadline[0]:
+                    return
+
+            name, _, role, build = rng.choices(scenarios, weights=weights)[0]
+            student_email, student_token = rng.choice(students)
+            job_id, application_id, recruiter_token = rng.choice(recruiters)
+            method, path, body = build(rng, {
+                'job_ids': sample['job_ids'],
+                'student_email': student_email,
+                'recruiter_job_id': job_id,
+                'recruiter_application_id': application_id,
+            })
+            token = {'student': student_token, 'recruiter': recruiter_token}.get(role)
+
+            began = time.perf_counter()
+            try:
+                status, _ = target.request(method, path, token, body)
+            except Exception:
+                status = 0
+            latency = time.perf_counter() - began
+            if index >= warmup:
+                samples[name].append((latency, status))
+
+    threads = [threading.Thread(target=worker, args=(n,), name=f'bench-{n}') for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start[0] if start[0] is not None else 0.0
+    return samples, elapsed
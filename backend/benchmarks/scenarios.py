@@ -0,0 +1,86 @@
+"""Weighted request mix for the benchmark runner.
+
+Each scenario is (name, weight, role, build). build(rng, sample) returns
+(method, path, json body) for one request; role picks whose token is sent
+(None for anonymous requests). Write scenarios change the benchmark
+database, so repeated runs see slowly growing data; leave them out with
+--read-only for strictly comparable runs.
+"""
+from urllib.parse import urlencode
+from benchmarks.seed import PASSWORD, SKILLS, LOCATIONS, ROLES
+
+SEARCH_SORTS = ['posted_at', 'salary']
+
+def _query(path, params):
+    params = {key: value for key, value in params.items() if value is not None}
+    return f'{path}?{urlencode(params)}' if params else path
+
+def _search_filters(rng, sample):
+    return 'GET', _query('/jobs/search', {
+        'job_type': rng.choice([None, 'full-time', 'internship', 'contract']),
+        'work_mode': rng.choice([None, 'remote', 'hybrid', 'onsite']),
+        'salary_min': rng.choice([None, 30000, 60000, 90000]),
+        'sort_by': rng.choice(SEARCH_SORTS),
+        'page': rng.choice([1, 1, 1, 2, 3]),
+    }), None
+
+def _search_keyword(rng, sample):
+    keyword = rng.choice([rng.choice(ROLES)[0].split()[-1], rng.choice(SKILLS)[0]])
+    return 'GET', _query('/jobs/search', {
+        'keyword': keyword,
+        'location': rng.choice([None, None, rng.choice(LOCATIONS)[0]]),
+        'sort_by': rng.choice(['relevance', 'posted_at']),
+    }), None
+
+def _search_skills(rng, sample):
+    picked = rng.sample([name for name, _ in SKILLS[:15]], 2)
+    return 'GET', _query('/jobs/search', {
+        'skills': ', '.join(picked),
+        'skills_match': rng.choice(['all', 'any']),
+    }), None
+
+def _search_cursor(rng, sample):
+    return 'GET', _query('/jobs/search', {'cursor': '', 'sort_by': rng.choice(SEARCH_SORTS)}), None
+
+def _job_detail(rng, sample):
+    return 'GET', f"/jobs/{rng.choice(sample['job_ids'])}", None
+
+def _recruiter_job_applications(rng, sample):
+    return 'GET', _query(f"/recruiter/jobs/{sample['recruiter_job_id']}/applications", {
+        'sort': rng.choice(['applied_at', 'applied_at', 'match']),
+    }), None
+
+def _candidate_search(rng, sample):
+    return 'GET', _query('/recruiter/candidates/search', {'q': rng.choice(SKILLS[:15])[0]}), None
+
+def _apply(rng, sample):
+    return 'POST', f"/student/jobs/apply/{rng.choice(sample['job_ids'])}", {'cover_letter': 'Benchmark'}
+
+def _update_status(rng, sample):
+    if not sample['recruiter_application_id']:
+        return 'GET', '/recruiter/jobs', None
+    return 'PUT', f"/recruiter/applications/{sample['recruiter_application_id']}/status", {
+        'status': rng.choice(['pending', 'shortlisted', 'rejected']),
+    }
+
+def _login(rng, sample):
+    return 'POST', '/auth/login', {'email': sample['student_email'], 'password': PASSWORD}
+
+SCENARIOS = [
+    ('search_filters', 20, None, _search_filters),
+    ('search_keyword', 15, None, _search_keyword),
+    ('search_skills', 8, None, _search_skills),
+    ('search_cursor', 4, None, _search_cursor),
+    ('job_detail', 15, None, _job_detail),
+    ('student_recommendations', 8, 'student', lambda rng, sample: ('GET', '/student/recommendations', None)),
+    ('student_applications', 6, 'student', lambda rng, sample: ('GET', '/student/applications', None)),
+    ('student_alert_digest', 3, 'student', lambda rng, sample: ('GET', '/student/alerts/digest', None)),
+    ('recruiter_jobs', 5, 'recruiter', lambda rng, sample: ('GET', '/recruiter/jobs', None)),
+    ('recruiter_job_applications', 5, 'recruiter', _recruiter_job_applications),
+    ('recruiter_candidate_search', 3, 'recruiter', _candidate_search),
+    ('apply_to_job', 4, 'student', _apply),
+    ('update_application_status', 3, 'recruiter', _update_status),
+    ('login', 1, None, _login),
+]
+
+WRITE_SCENARIOS = {'apply_to_job', 'update_application_status'}
@@ -0,0 +1,232 @@
+"""Synthetic data generator for benchmark databases.
+
+Rows go straight into SQLite with executemany inside large transactions,
+so the schema's triggers (search index, change log, data versions) fire
+as they would in production. Skills, locations, salaries and job types
+follow skewed distributions so that filters and rankings see realistic
+selectivity: a few skills and cities dominate, salaries are log-normal
+and recent jobs get most applications.
+"""
+import math
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from database.db import configure_pool
+from database.migrate import migrate
+from models.location_model import Location
+from models.skill_model import Skill
+from utils.auth import hash_password
+
+PASSWORD = 'benchmark'
+
+# (spelling, weight); alias spellings exercise skill normalization
+SKILLS = [
+    ('Python', 30), ('JavaScript', 28), ('SQL', 25), ('Java', 20), ('React', 18),
+    ('AWS', 14), ('Node.js', 12), ('TypeScript', 11), ('HTML', 10), ('CSS', 10),
+    ('Docker', 9), ('Kubernetes', 7), ('PostgreSQL', 7), ('MongoDB', 6), ('Go', 5),
+    ('C++', 5), ('C#', 5), ('Machine Learning', 6), ('Angular', 4), ('Vue', 3),
+    ('Django', 5), ('Flask', 4), ('Spark', 3), ('Terraform', 2), ('Rust', 1),
+    ('js', 3), ('ReactJS', 2), ('golang', 1), ('py', 1), ('nodejs', 2),
+]
+LOCATIONS = [
+    ('Bangalore', 25), ('Mumbai', 14), ('Hyderabad', 12), ('Delhi', 10), ('Pune', 10),
+    ('Chennai', 8), ('Gurgaon', 6), ('Noida', 5), ('Kolkata', 4), ('Ahmedabad', 3),
+    ('Kochi', 2), ('Jaipur', 1),
+]
+ROLES = [
+    ('Software Engineer', 20), ('Backend Developer', 12), ('Frontend Developer', 10),
+    ('Full Stack Developer', 10), ('Data Engineer', 7), ('Data Scientist', 6),
+    ('DevOps Engineer', 6), ('QA Engineer', 5), ('Mobile Developer', 4),
+    ('Machine Learning Engineer', 4), ('Product Analyst', 3), ('Site Reliability Engineer', 3),
+]
+LEVELS = [('', 40), ('Junior ', 20), ('Senior ', 25), ('Lead ', 8), ('Principal ', 2), ('Intern ', 5)]
+JOB_TYPES = [('full-time', 65), ('internship', 15), ('contract', 12), ('part-time', 8)]
+WORK_MODES = [('onsite', 45), ('hybrid', 35), ('remote', 20)]
+STATUSES = [('pending', 60), ('shortlisted', 20), ('rejected', 17), ('hired', 3)]
+DEGREES = ['B.Tech Computer Science', 'B.E. Information Technology', 'BCA', 'MCA', 'M.Tech',
+           'B.Sc Mathematics', 'M.Sc Statistics', 'MBA', 'B.Com']
+COMPANY_WORDS = ['Tech', 'Soft', 'Data', 'Cloud', 'Labs', 'Systems', 'Works', 'Logic', 'Byte', 'Net']
+FILLER = ('We are looking for someone who enjoys building reliable products with a small, '
+          'friendly team. You will own features end to end, review code and mentor others. ')
+
+DAYS_OF_HISTORY = 180
+BATCH_SIZE = 5000
+
+class _Picker:
+    """Weighted choice with precomputed cumulative weights"""
+
+    def __init__(self, rng, pairs):
+        self.rng = rng
+        self.values = [value for value, _ in pairs]
+        self.cum_weights = []
+        total = 0
+        for _, weight in pairs:
+            total += weight
+            self.cum_weights.append(total)
+
+    def one(self):
+        return self.rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+    def some(self, low, high):
+        count = self.rng.randint(low, high)
+        picked = dict.fromkeys(self.rng.choices(self.values, cum_weights=self.cum_weights, k=count * 2))
+        return list(picked)[:count]
+
+def _timestamp(moment):
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+def _batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def seed_database(path, students=2000, recruiters=100, jobs=5000, applications=20000,
+                  alerts=1000, seed=42, progress=print):
+    """Create or extend a database at path with synthetic rows.
+
+    Returns a dict of row counts and the elapsed time. Every user's
+    password is PASSWORD.
+    """
+    rng = random.Random(seed)
+    skills = _Picker(rng, SKILLS)
+    locations = _Picker(rng, LOCATIONS)
+    roles = _Picker(rng, ROLES)
+    levels = _Picker(rng, LEVELS)
+    job_types = _Picker(rng, JOB_TYPES)
+    work_modes = _Picker(rng, WORK_MODES)
+    statuses = _Picker(rng, STATUSES)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    password_hash = hash_password(PASSWORD)
+
+    migrate(path)
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")
+
+    def insert(sql, rows, label):
+        count = 0
+        for batch in _batches(rows):
+            conn.execute("BEGIN")
+            conn.executemany(sql, batch)
+            conn.execute("COMMIT")
+            count += len(batch)
+        progress(f'{label}: {count}')
+        return count
+
+    run_id = int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0]) + 1
+    email_prefix = f'bench{run_id}'
+
+    first_user = run_id
+    insert("INSERT INTO users (id, email, password_hash, role) VALUES (?, ?, ?, ?)",
+           ((first_user + i, f'{email_prefix}-r{i}@example.com', password_hash, 'recruiter')
+            for i in range(recruiters)), 'recruiters')
+    recruiter_ids = list(range(first_user, first_user + recruiters))
+    first_student = first_user + recruiters
+    insert("INSERT INTO users (id, email, password_hash, role) VALUES (?, ?, ?, ?)",
+           ((first_student + i, f'{email_prefix}-s{i}@example.com', password_hash, 'student')
+            for i in range(students)), 'students')
+    student_ids = list(range(first_student, first_student + students))
+
+    def recruiter_rows():
+        for user_id in recruiter_ids:
+            name = ''.join(rng.sample(COMPANY_WORDS, 2)) + f' {user_id}'
+            yield (user_id, name, f'{name} builds software for customers across India.',
+                   locations.one(), f'Contact {user_id}')
+    insert("""INSERT INTO recruiter_profiles (user_id, company_name, company_description, location, contact_person)
+              VALUES (?, ?, ?, ?, ?)""", recruiter_rows(), 'recruiter profiles')
+
+    def student_rows():
+        for user_id in student_ids:
+            salary = int(round(rng.lognormvariate(math.log(55000), 0.4), -3))
+            yield (user_id, f'Student {user_id}', rng.choice(DEGREES), ', '.join(skills.some(2, 7)),
+                   locations.one(), salary, f'+91 9{user_id:09d}'[:14])
+    insert("""INSERT INTO student_profiles (user_id, name, education, skills, location, expected_salary, phone)
+              VALUES (?, ?, ?, ?, ?, ?, ?)""", student_rows(), 'student profiles')
+
+    first_job = int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()[0]) + 1
+    job_posted = []
+
+    def job_rows():
+        for _ in range(jobs):
+            # Recent postings are more common than old ones
+            age = min(rng.expovariate(1 / 30), DAYS_OF_HISTORY)
+            posted = now - timedelta(days=age, seconds=rng.randint(0, 86399))
+            job_posted.append(posted)
+            level = levels.one()
+            role = roles.one()
+            job_skills = skills.some(2, 6)
+            salary = None if rng.random() < 0.1 else int(round(
+                rng.lognormvariate(math.log(60000 if level != 'Intern ' else 15000), 0.45), -3))
+            description = (f'{level}{role} working with {", ".join(job_skills)}. '
+                           + FILLER * rng.randint(1, 4))
+            yield (rng.choice(recruiter_ids), f'{level}{role}', description, ', '.join(job_skills),
+                   locations.one(), salary, work_modes.one(), job_types.one(),
+                   _timestamp(posted + timedelta(days=30)), _timestamp(posted),
+                   0 if rng.random() < 0.1 else 1)
+    insert("""INSERT INTO jobs (recruiter_id, title, description, skills_required, location, salary,
+                                work_mode, job_type, deadline, posted_at, is_active)
+              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", job_rows(), 'jobs')
+
+    def application_rows():
+        if not jobs or not students:
+            return
+        # Newer jobs attract more applicants
+        job_weights = list(_cumulative(1.0 / (1 + (now - posted).days) for posted in job_posted))
+        per_student = max(applications // students, 1)
+        produced = 0
+        for student_id in student_ids:
+            if produced >= applications:
+                break
+            wanted = min(rng.randint(0, per_student * 2), applications - produced)
+            picks = dict.fromkeys(rng.choices(range(jobs), cum_weights=job_weights, k=wanted))
+            for index in picks:
+                applied = job_posted[index] + timedelta(hours=rng.randint(1, 24 * 14))
+                yield (first_job + index, student_id, _timestamp(min(applied, now)), statuses.one(),
+                       'I would love to join your team.' if rng.random() < 0.5 else None)
+                produced += 1
+    insert("""INSERT OR IGNORE INTO applications (job_id, student_id, applied_at, status, cover_letter)
+              VALUES (?, ?, ?, ?, ?)""", application_rows(), 'applications')
+
+    def alert_rows():
+        for _ in range(alerts):
+            keyword = rng.choice([roles.one().split()[0], skills.one()])
+            yield (rng.choice(student_ids), keyword.lower(),
+                   locations.one() if rng.random() < 0.6 else None,
+                   rng.choice([None, 30000, 50000, 80000]),
+                   job_types.one() if rng.random() < 0.3 else None)
+    if student_ids:
+        insert("""INSERT INTO job_alerts (student_id, keywords, location, salary_min, job_type)
+                  VALUES (?, ?, ?, ?, ?)""", alert_rows(), 'alerts')
+
+    conn.close()
+
+    # Tag skills through the model so aliases are folded exactly as on write
+    configure_pool(path=path)
+    tagged_jobs, tagged_students = Skill.backfill(batch_size=BATCH_SIZE)
+    progress(f'skill tags: {tagged_jobs} jobs, {tagged_students} students')
+    located_jobs, located_students = Location.backfill(batch_size=BATCH_SIZE)
+    progress(f'known locations: {located_jobs} jobs, {located_students} students')
+
+    with sqlite3.connect(path) as conn:
+        # After the backfills, so the planner sees the final skill and location columns
+        conn.execute("ANALYZE")
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('users', 'jobs', 'applications', 'job_alerts')}
+    counts['seconds'] = round(time.perf_counter() - started, 2)
+    counts['size_bytes'] = os.path.getsize(path)
+    return counts
+
+def _cumulative(weights):
+    total = 0.0
+    for weight in weights:
+        total += weight
+        yield total
@@ -0,0 +1,114 @@
+"""Concurrent write stress test.
+
+Recreates the burst of a popular job opening: many students apply to one
+job while its recruiter changes application statuses, all at the same
+moment from many threads, through the in-process test client. Every
+request has to succeed; a write that hit 'database is locked' would
+surface as HTTP 500. The run also checks that every application was
+stored exactly once and reports how the writer grouped the writes.
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+from database.migrate import migrate
+from utils.auth import generate_token, hash_password
+
+def _prepare(path, students, applications):
+    """One recruiter with a popular job and a second job that already has applicants"""
+    migrate(path)
+    password_hash = hash_password('stress')
+    with sqlite3.connect(path) as conn:
+        recruiter_id = conn.execute("INSERT INTO users (email, password_hash, role) VALUES (?, ?, 'recruiter')",
+                                    ('stress-recruiter@example.com', password_hash)).lastrowid
+        conn.execute("INSERT INTO recruiter_profiles (user_id, company_name) VALUES (?, 'Stress Ltd')",
+                     (recruiter_id,))
+        job_sql = "INSERT INTO jobs (recruiter_id, title, description) VALUES (?, ?, 'Stress test')"
+        popular_job = conn.execute(job_sql, (recruiter_id, 'Popular job')).lastrowid
+        other_job = conn.execute(job_sql, (recruiter_id, 'Older job')).lastrowid
+
+        student_ids = []
+        for number in range(students):
+            student_id = conn.execute("INSERT INTO users (email, password_hash, role) VALUES (?, ?, 'student')",
+                                      (f'stress-{number}@example.com', password_hash)).lastrowid
+            conn.execute("INSERT INTO student_profiles (user_id, name) VALUES (?, ?)",
+                         (student_id, f'Student {number}'))
+            student_ids.append(student_id)
+        application_ids = [conn.execute("INSERT INTO applications (job_id, student_id) VALUES (?, ?)",
+                                        (other_job, student_id)).lastrowid
+                           for student_id in student_ids[:applications]]
+    return recruiter_id, popular_job, student_ids, application_ids
+
+def stress_writes(path, students=500, status_updates=500, threads=32, seed=0):
+    """Run the burst against a new database at path and return a result dict"""
+    recruiter_id, job_id, student_ids, application_ids = _prepare(path, students, min(status_updates, students))
+
+    # The config module reads DATABASE_PATH when it is first imported
+    os.environ['DATABASE_PATH'] = path
+    from app import create_app
+    from database.db import writer_stats
+    app = create_app()
+
+    rng = random.Random(seed)
+    with app.app_context():
+        recruiter_token = generate_token(recruiter_id, 'recruiter')
+        work = [('apply', 'POST', f'/student/jobs/apply/{job_id}', generate_token(student_id, 'student'),
+                 {'cover_letter': 'Hello'}) for student_id in student_ids]
+    work += [('status', 'PUT', f'/recruiter/applications/{rng.choice(application_ids)}/status', recruiter_token,
+              {'status': rng.choice(['shortlisted', 'rejected', 'pending'])}) for _ in range(status_updates)]
+    rng.shuffle(work)
+
+    outcomes = {}
+    latencies = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+    items = iter(work)
+
+    def worker():
+        client = app.test_client()
+        start.wait()
+        while True:
+            with lock:
+                item = next(items, None)
+            if item is None:
+                return
+            kind, method, url, token, body = item
+            began = time.perf_counter()
+            try:
+                response = client.open(url, method=method, json=body, headers={'Authorization': f'Bearer {token}'})
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - began
+            with lock:
+                outcomes[(kind, status)] = outcomes.get((kind, status), 0) + 1
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=worker, name=f'stress-{n}') for n in range(threads)]
+    began = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    with sqlite3.connect(path) as conn:
+        stored, distinct = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT student_id) FROM applications WHERE job_id = ?", (job_id,)
+        ).fetchone()
+
+    expected = {('apply', 201): students, ('status', 200): status_updates}
+    latencies.sort()
+    return {
+        'requests': len(work),
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(work) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else 0.0,
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else 0.0,
+        'outcomes': {f'{kind} {status}': count for (kind, status), count in sorted(outcomes.items(), key=str)},
+        'errors': sum(count for key, count in outcomes.items() if key not in expected),
+        'applications_stored': stored,
+        'applications_consistent': stored == distinct == students,
+        'writer': writer_stats(),
+    }
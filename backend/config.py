@@ -5,13 +5,67 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
     # Database configuration
-    DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'database', 'portal.db')
+    DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(os.path.dirname(__file__), 'database', 'portal.db')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+    DB_POOL_TIMEOUT = 30.0  # seconds to wait for a free connection
+    DB_BUSY_TIMEOUT_MS = 5000
+    DB_CACHE_SIZE_KIB = 16384  # page cache per connection
+    DB_MMAP_SIZE = 128 * 1024 * 1024
+    DB_STATEMENT_CACHE_SIZE = 256  # prepared statements kept per connection
+    # Writes go through one writer thread per process; those arriving within the
+    # window are committed together (group commit)
+    DB_WRITER_BATCH_WINDOW = 0.002  # seconds
+    DB_WRITER_MAX_BATCH = 64  # writes per transaction
+    
+    # Statements slower than SLOW_QUERY_MS are written, with their query plan, to
+    # SLOW_QUERY_LOG (JSON lines); summarize it with `flask slow-queries`
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG') or os.path.join(os.path.dirname(__file__), 'logs', 'slow-queries.jsonl')
+    SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024  # rotated after this size
+    SLOW_QUERY_LOG_BACKUPS = 5
+    
+    # In-process cache for /jobs/search and /jobs/<id> responses
+    RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    RESPONSE_CACHE_TTL = 30  # seconds; entries are also dropped as soon as their data_versions change
+    
+    # Answer /jobs/search requests without keyword or skills from an in-memory
+    # columnar snapshot of the jobs table instead of SQL
+    JOB_SNAPSHOT = os.environ.get('JOB_SNAPSHOT', '1') != '0'
+    
+    # POST /batch
+    BATCH_MAX_REQUESTS = 20
+    
+    # POST /recruiter/jobs/bulk
+    BULK_IMPORT_MAX_BYTES = 512 * 1024 * 1024  # the body is streamed, not buffered
+    BULK_IMPORT_CHUNK_SIZE = 2000  # rows per transaction; bounds how long other writers wait
     
     # File upload configuration
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
     
+    # GET /cvs/<student_id>: 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd)
+    # lets the front proxy send the file; unset, workers serve it with sendfile()
+    CV_OFFLOAD = os.environ.get('CV_OFFLOAD')
+    USE_X_SENDFILE = CV_OFFLOAD == 'x-sendfile'  # read by flask.send_file
+    CV_ACCEL_REDIRECT_PREFIX = '/protected-uploads/'  # internal nginx location aliased to UPLOAD_FOLDER
+    
+    # Processes extracting CV text for candidate search; unset means one per core
+    CV_EXTRACT_WORKERS = int(os.environ.get('CV_EXTRACT_WORKERS', 0)) or None
+    CV_EXTRACT_TIMEOUT = 120  # seconds per file before the task fails and is retried; keep below TASK_LEASE_SECONDS
+    
+    # Background tasks; with TASK_WORKERS = 0 run them with `flask run-tasks` instead.
+    # Threads per web process; unset means one per CV extraction process (at least 2),
+    # since an extraction task holds its thread while a process parses the file
+    TASK_WORKERS = int(os.environ['TASK_WORKERS']) if os.environ.get('TASK_WORKERS') else None
+    TASK_POLL_INTERVAL = 1.0  # seconds between queue checks of an idle worker
+    TASK_LEASE_SECONDS = 300  # a task still running after this is handed to another worker
+    
+    # GET /metrics; with gunicorn-style multi-process servers set METRICS_DIR to a
+    # directory shared by the workers so any of them reports the sum of all
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = 5.0  # seconds between writes of a process's values
+    
     # JWT configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7)
@@ -1,45 +1,678 @@
 import sqlite3
 import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
 from contextlib import contextmanager
+from flask import g, has_app_context
+from database.migrate import migrate
+from database.slow_queries import slow_query_log
 
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'portal.db')
 
+# Default pool settings, overridden from the Flask config by init_app()
+POOL_SETTINGS = {
+    'path': DATABASE_PATH,
+    'size': 8,
+    'timeout': 30.0,
+    'busy_timeout_ms': 5000,
+    'cache_size_kib': 16384,
+    'mmap_size': 128 * 1024 * 1024,
+    'statement_cache_size': 256,
+    'query_only': True,
+}
+
+# Group commit settings of the writer thread, overridden by init_app()
+WRITER_SETTINGS = {
+    'batch_window': 0.002,
+    'max_batch': 64,
+}
+
+# Statements slower than this (seconds; None turns it off) are passed to
+# _slow_query_handler(conn, sql, parameters, many, seconds, rows)
+_slow_query_seconds = None
+_slow_query_handler = None
+
+def set_slow_query_threshold(threshold_ms, handler=None):
+    """Report statements taking threshold_ms or longer to handler; None disables"""
+    global _slow_query_seconds, _slow_query_handler
+    _slow_query_handler = handler
+    _slow_query_seconds = threshold_ms / 1000.0 if threshold_ms is not None and handler else None
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that adds its statements and the time spent executing and
+    fetching them to the connection's counters.
+
+    With a slow-query threshold set it also follows each statement from
+    execute until its rows run out (or the next execute, close or the
+    cursor being dropped) and reports it when the total time reaches the
+    threshold. Rows read by iterating a cursor are stepped outside these
+    methods, so that part of a query is not counted.
+    """
+
+    _statement = None  # (sql, parameters, many) of the statement being followed
+    _elapsed = 0.0
+    _rows = 0
+
+    def _follow(self, sql, parameters, many, elapsed):
+        self._statement = (sql, parameters, many)
+        self._elapsed = elapsed
+        self._rows = 0
+        if self.description is None:
+            self._finish()
+
+    def _finish(self):
+        sql, parameters, many = self._statement
+        self._statement = None
+        threshold = _slow_query_seconds
+        if threshold is not None and self._elapsed >= threshold:
+            rows = self._rows if self.description is not None else self.rowcount
+            _slow_query_handler(self.connection, sql, parameters, many, self._elapsed, rows)
+
+    def execute(self, sql, parameters=()):
+        if self._statement is not None:
+            self._finish()
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connection.sql_statements += 1
+            self.connection.sql_seconds += elapsed
+        if _slow_query_seconds is not None:
+            self._follow(sql, parameters, False, elapsed)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        if self._statement is not None:
+            self._finish()
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connection.sql_statements += 1
+            self.connection.sql_seconds += elapsed
+        if _slow_query_seconds is not None:
+            self._follow(sql, seq_of_parameters, True, elapsed)
+        return self
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            row = super().fetchone()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connection.sql_seconds += elapsed
+        if self._statement is not None:
+            self._elapsed += elapsed
+            if row is None:
+                self._finish()
+            else:
+                self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        try:
+            rows = super().fetchmany(size)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connection.sql_seconds += elapsed
+        if self._statement is not None:
+            self._elapsed += elapsed
+            self._rows += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            rows = super().fetchall()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connection.sql_seconds += elapsed
+        if self._statement is not None:
+            self._elapsed += elapsed
+            self._rows += len(rows)
+            self._finish()
+        return rows
+
+    def close(self):
+        if self._statement is not None:
+            self._finish()
+        super().close()
+
+    def __del__(self):
+        # Most lookups fetch one row and drop the cursor without exhausting it
+        if self._statement is not None:
+            try:
+                self._finish()
+            except Exception:
+                pass
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection counting the statements and SQL time of its cursors.
+
+    The pool resets the counters on every checkout, so they cover the
+    current borrower only.
+    """
+
+    sql_statements = 0
+    sql_seconds = 0.0
+
+    def reset_counters(self):
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the pool timeout"""
+
+class ConnectionPool:
+    """Fixed-size SQLite connection pool with thread affinity.
+
+    Connections are opened lazily, tuned once with pragmas and reused.
+    A thread releasing a connection gets the same one back on its next
+    checkout when it is still idle, which keeps SQLite's page cache and
+    prepared statements warm for that thread. With query_only the
+    connections refuse writes; those go through the DatabaseWriter.
+    """
+
+    def __init__(self, path, size=8, timeout=30.0, busy_timeout_ms=5000,
+                 cache_size_kib=16384, mmap_size=128 * 1024 * 1024,
+                 statement_cache_size=256, query_only=False):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.statement_cache_size = statement_cache_size
+        self.query_only = query_only
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._owners = {}
+        self._all = []
+        self._closed = False
+        self._stats = {
+            'checkouts': 0,
+            'reuses': 0,
+            'affinity_hits': 0,
+            'waits': 0,
+            'wait_time_ms': 0.0,
+            'timeouts': 0,
+            'connections_opened': 0,
+        }
+
+    def _connect(self):
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+            factory=InstrumentedConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if self.query_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def acquire(self):
+        """Check out a connection, preferring the one this thread used last"""
+        thread_id = threading.get_ident()
+        deadline = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout('Connection pool is closed')
+
+                if self._idle:
+                    conn = None
+                    for candidate in reversed(self._idle):
+                        if self._owners.get(id(candidate)) == thread_id:
+                            conn = candidate
+                            self._stats['affinity_hits'] += 1
+                            break
+                    if conn is None:
+                        conn = self._idle[-1]
+                    self._idle.remove(conn)
+                    self._owners[id(conn)] = thread_id
+                    self._stats['checkouts'] += 1
+                    self._stats['reuses'] += 1
+                    conn.reset_counters()
+                    return conn
+
+                if len(self._all) < self.size:
+                    # Reserve the slot before connecting outside the lock
+                    self._all.append(None)
+                    break
+
+                if deadline is None:
+                    deadline = time.monotonic() + self.timeout
+                    self._stats['waits'] += 1
+                    wait_started = time.monotonic()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout('Timed out waiting for a database connection')
+                self._cond.wait(remaining)
+                self._stats['wait_time_ms'] += (time.monotonic() - wait_started) * 1000
+                wait_started = time.monotonic()
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._all.remove(None)
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._all[self._all.index(None)] = conn
+            self._owners[id(conn)] = thread_id
+            self._stats['checkouts'] += 1
+            self._stats['connections_opened'] += 1
+        conn.reset_counters()
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # A broken connection is dropped instead of being reused
+            with self._cond:
+                self._discard(conn)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._discard(conn)
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _discard(self, conn):
+        if conn in self._all:
+            self._all.remove(conn)
+        self._owners.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._cond.notify()
+
+    def close(self):
+        """Close idle connections; busy ones are closed when released"""
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                self._discard(conn)
+            self._idle = []
+
+    def stats(self):
+        """Return a snapshot of pool statistics"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['open'] = len([c for c in self._all if c is not None])
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = stats['open'] - stats['idle']
+        checkouts = stats['checkouts']
+        stats['hit_rate'] = round(stats['reuses'] / checkouts, 4) if checkouts else 0.0
+        stats['affinity_rate'] = round(stats['affinity_hits'] / checkouts, 4) if checkouts else 0.0
+        stats['wait_time_ms'] = round(stats['wait_time_ms'], 3)
+        return stats
+
+WriteResult = namedtuple('WriteResult', 'lastrowid rowcount rows')
+
+class DatabaseWriter:
+    """Applies every write of the process on one thread and connection.
+
+    Callers hand over a function of the connection and block until its
+    transaction has committed. Writes that queue up while a transaction
+    is being applied, or arrive within batch_window seconds of the first
+    one, share one BEGIN IMMEDIATE transaction (group commit), so a burst
+    of small writes costs one commit instead of one each and never
+    contends for SQLite's lock inside the process. Each write runs in its
+    own savepoint: one that raises is rolled back alone and its caller
+    gets the exception, while the rest of the batch commits.
+
+    A caller that gets TimeoutError from run() has only stopped waiting:
+    its write stays queued and may still commit afterwards, so a retry
+    must be safe to apply twice. If the thread dies, the next submit starts
+    a new one that takes over the queue. Callers of the batch it was
+    applying time out; closing the old connection rolls that batch back
+    unless it had already committed.
+    """
+
+    def __init__(self, settings, batch_window=0.002, max_batch=64, timeout=30.0):
+        self.settings = dict(settings, size=1, query_only=False)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats = {'transactions': 0, 'writes': 0, 'failed_writes': 0, 'failed_commits': 0,
+                       'largest_batch': 0}
+
+    def submit(self, func, args=(), trace=None):
+        """Queue func(conn, *args) and return a Future of (result, statements, sql seconds).
+
+        trace, when given, receives every statement func runs.
+        """
+        future = Future()
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._start()
+        self._queue.put((func, args, future, trace))
+        return future
+
+    def run(self, func, args=(), trace=None):
+        """Run func(conn, *args) in the writer and wait for its commit.
+
+        Raises TimeoutError after self.timeout seconds; the write may still commit later.
+        """
+        if threading.current_thread() is self._thread:
+            # A write issued from inside another write joins its transaction
+            return func(self._conn, *args), 0, 0.0
+        return self.submit(func, args, trace).result(self.timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                if self._thread.is_alive():
+                    return
+                # The thread died (an error escaped _apply): closing its
+                # connection rolls back a batch it left open, and the new
+                # thread serves the writes still queued
+                self._conn.close()
+            else:
+                # A forked worker inherits the attributes but not the thread
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._conn = ConnectionPool(**self.settings).acquire()
+            self._conn.isolation_level = None
+            self._thread = threading.Thread(target=self._loop, name='db-writer', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                break
+            batch = [job]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            self._apply(batch)
+        self._conn.close()
+
+    def _apply(self, batch):
+        conn = self._conn
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for func, args, future, trace in batch:
+                value, error = None, None
+                conn.execute("SAVEPOINT write")
+                statements, seconds = conn.sql_statements, conn.sql_seconds
+                if trace is not None:
+                    conn.set_trace_callback(trace)
+                try:
+                    value = func(conn, *args)
+                except Exception as e:
+                    error = e
+                finally:
+                    if trace is not None:
+                        conn.set_trace_callback(None)
+                counters = (conn.sql_statements - statements, conn.sql_seconds - seconds)
+                if error is not None:
+                    conn.execute("ROLLBACK TO write")
+                conn.execute("RELEASE write")
+                outcomes.append((future, error, value, counters))
+            conn.execute("COMMIT")
+        except Exception as e:
+            # The transaction itself failed; nothing in the batch was written
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._stats['failed_commits'] += 1
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        self._stats['transactions'] += 1
+        self._stats['writes'] += len(batch)
+        self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+        for future, error, value, (statements, seconds) in outcomes:
+            if error is None:
+                future.set_result((value, statements, seconds))
+            else:
+                self._stats['failed_writes'] += 1
+                future.set_exception(error)
+
+    def stop(self):
+        """Apply what is queued, then close the connection"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self):
+        """Return writer counters and the number of writes waiting"""
+        stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        transactions = stats['transactions']
+        stats['mean_batch'] = round(stats['writes'] / transactions, 3) if transactions else 0.0
+        return stats
+
+_pool = None
+_writer = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**POOL_SETTINGS)
+    return _pool
+
+def get_writer():
+    """Return the process-wide writer, creating it on first use"""
+    global _writer
+    if _writer is None:
+        with _pool_lock:
+            if _writer is None:
+                _writer = DatabaseWriter(POOL_SETTINGS, timeout=POOL_SETTINGS['timeout'], **WRITER_SETTINGS)
+    return _writer
+
+def configure_pool(**settings):
+    """Replace the pool settings; the next get_pool() and get_writer() calls use them"""
+    global _pool, _writer
+    with _pool_lock:
+        POOL_SETTINGS.update(settings)
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+        if _writer is not None:
+            _writer.stop()
+        _writer = None
+
+def pool_stats():
+    """Return statistics for the connection pool"""
+    return get_pool().stats()
+
+def writer_stats():
+    """Return statistics for the writer thread"""
+    return get_writer().stats()
+
+def init_app(app):
+    """Configure the pool from app config and release request connections on teardown"""
+    configure_pool(
+        path=app.config.get('DATABASE_PATH', DATABASE_PATH),
+        size=app.config.get('DB_POOL_SIZE', POOL_SETTINGS['size']),
+        timeout=app.config.get('DB_POOL_TIMEOUT', POOL_SETTINGS['timeout']),
+        busy_timeout_ms=app.config.get('DB_BUSY_TIMEOUT_MS', POOL_SETTINGS['busy_timeout_ms']),
+        cache_size_kib=app.config.get('DB_CACHE_SIZE_KIB', POOL_SETTINGS['cache_size_kib']),
+        mmap_size=app.config.get('DB_MMAP_SIZE', POOL_SETTINGS['mmap_size']),
+        statement_cache_size=app.config.get('DB_STATEMENT_CACHE_SIZE', POOL_SETTINGS['statement_cache_size']),
+    )
+    WRITER_SETTINGS.update(
+        batch_window=app.config.get('DB_WRITER_BATCH_WINDOW', WRITER_SETTINGS['batch_window']),
+        max_batch=app.config.get('DB_WRITER_MAX_BATCH', WRITER_SETTINGS['max_batch']),
+    )
+    slow_query_log.configure(
+        app.config.get('SLOW_QUERY_LOG'),
+        max_bytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024),
+        backup_count=app.config.get('SLOW_QUERY_LOG_BACKUPS', 5),
+    )
+    set_slow_query_threshold(app.config.get('SLOW_QUERY_MS'), slow_query_log.record if slow_query_log.path else None)
+    app.teardown_appcontext(close_request_connection)
+
+def close_request_connection(exception=None):
+    """Return the request-scoped connection to the pool"""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        if 'sql_statements' in g:
+            conn.set_trace_callback(None)
+        get_pool().release(conn)
+
 def init_database():
-    """Initialize the database with schema"""
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        
-        # Read and execute schema
-        schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
-        with open(schema_path, 'r') as f:
-            schema = f.read()
-        
-        cursor.executescript(schema)
-        conn.commit()
+    """Bring the database schema up to date"""
+    return migrate(POOL_SETTINGS['path'])
 
 @contextmanager
 def get_db():
-    """Get database connection with context manager"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get database connection with context manager.
+
+    Inside an app context the connection is checked out once and shared by
+    every call for the rest of the request; otherwise it is returned to the
+    pool when the block exits.
+    """
+    if has_app_context():
+        conn = g.get('db_conn')
+        if conn is None:
+            conn = get_pool().acquire()
+            g.db_conn = conn
+            # Set by check_write_queries to record every statement of the request
+            statements = g.get('sql_statements')
+            if statements is not None:
+                conn.set_trace_callback(statements.append)
+        yield conn
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
+
+def write_transaction(func, *args):
+    """Run func(conn, *args) on the writer connection and return its result once committed.
+
+    func must not commit or roll back; it runs inside a savepoint of the
+    writer's current transaction, and an exception it raises undoes its
+    own statements only and is raised here.
+    """
+    trace = None
+    if has_app_context():
+        # Set by check_write_queries to record every statement of the request
+        statements = g.get('sql_statements')
+        trace = statements.append if statements is not None else None
+    value, statements, seconds = get_writer().run(func, args, trace)
+    if has_app_context():
+        written, elapsed = g.get('db_write_counters', (0, 0.0))
+        g.db_write_counters = (written + statements, elapsed + seconds)
+        # Versions read earlier in this context (DataVersion) may have moved
+        g.pop('data_versions', None)
+    return value
+
+def _write(conn, query, params):
+    cursor = conn.execute(query, params)
+    rows = cursor.fetchall() if cursor.description is not None else []
+    return WriteResult(cursor.lastrowid, cursor.rowcount, rows)
+
+def write(query, params=()):
+    """Run one write statement and return its WriteResult; RETURNING rows are in .rows"""
+    return write_transaction(_write, query, params)
+
+def backfill_batches(query, func, *args, batch_size=500):
+    """Walk a table in id order and run func(conn, *args, rows) as one write per batch.
+
+    query takes (last_id, limit) and returns rows whose first column is the
+    id, in order. Each batch is a separate write so the writer is held only
+    briefly. Returns the number of rows visited.
+    """
+    last_id = 0
+    count = 0
+    with get_db() as conn:
+        while True:
+            rows = [tuple(row) for row in conn.execute(query, (last_id, batch_size)).fetchall()]
+            if not rows:
+                return count
+            write_transaction(func, *args, rows)
+            count += len(rows)
+            last_id = rows[-1][0]
+
+def request_sql_counters():
+    """(statements, seconds) of SQL run so far in this app context, reads and writes"""
+    statements, seconds = g.get('db_write_counters', (0, 0.0))
+    conn = g.get('db_conn')
+    if conn is not None:
+        statements += conn.sql_statements
+        seconds += conn.sql_seconds
+    return statements, seconds
 
 def execute_query(query, params=None, fetch_one=False, fetch_all=False):
-    """Execute a query and return results"""
+    """Execute a query and return results; writes go through the writer and return lastrowid"""
+    if not (fetch_one or fetch_all):
+        return write(query, params or ()).lastrowid
+
     with get_db() as conn:
         cursor = conn.cursor()
         if params:
             cursor.execute(query, params)
         else:
             cursor.execute(query)
-        
+
         if fetch_one:
-            return dict(cursor.fetchone()) if cursor.fetchone() else None
-        elif fetch_all:
-            return [dict(row) for row in cursor.fetchall()]
-        else:
-            conn.commit()
-            return cursor.lastrowid
\ No newline at end of file
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        return [dict(row) for row in cursor.fetchall()]
\ No newline at end of file
@@ -0,0 +1,100 @@
+import importlib.util
+import os
+import re
+import sqlite3
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+_MIGRATION_NAME = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    """Return [(version, name, path)] for every migration file, in order.
+
+    Migrations are named NNNN_description.sql or NNNN_description.py; a
+    Python migration defines upgrade(conn).
+    """
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _MIGRATION_NAME.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError('Duplicate migration version numbers')
+    return migrations
+
+def split_statements(sql):
+    """Split a SQL script into complete statements (trigger bodies stay intact)"""
+    statements = []
+    buffer = ''
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            if statement:
+                statements.append(statement)
+            buffer = ''
+    leftover = [line for line in buffer.splitlines() if line.strip() and not line.strip().startswith('--')]
+    if leftover:
+        raise ValueError('Incomplete SQL statement at end of migration')
+    return statements
+
+def current_version(conn):
+    """Return the highest applied migration version, or 0"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def _apply(conn, version, name, path):
+    if path.endswith('.py'):
+        spec = importlib.util.spec_from_file_location(f'migration_{version:04d}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(conn)
+    else:
+        with open(path, 'r') as f:
+            for statement in split_statements(f.read()):
+                conn.execute(statement)
+    conn.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name))
+
+def migrate(database_path, directory=MIGRATIONS_DIR):
+    """Apply pending migrations, each in its own transaction.
+
+    Returns the list of versions applied; an up-to-date database costs a
+    single indexed read.
+    """
+    migrations = list_migrations(directory)
+    latest = migrations[-1][0] if migrations else 0
+
+    conn = sqlite3.connect(database_path, isolation_level=None)
+    try:
+        if current_version(conn) >= latest:
+            return []
+
+        applied = []
+        for version, name, path in migrations:
+            # Take the write lock first so concurrent workers apply each migration once
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if version <= current_version(conn):
+                    conn.execute("ROLLBACK")
+                    continue
+                _apply(conn, version, name, path)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(version)
+
+        if applied:
+            conn.execute("PRAGMA optimize")
+        return applied
+    finally:
+        conn.close()
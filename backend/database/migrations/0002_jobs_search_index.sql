@@ -0,0 +1,53 @@
+-- Full-text index over active job postings, kept in sync by the triggers below
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title,
+    description,
+    skills_required,
+    company_name,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_after_insert AFTER INSERT ON jobs
+WHEN NEW.is_active = 1
+BEGIN
+    INSERT INTO jobs_fts (rowid, title, description, skills_required, company_name)
+    VALUES (NEW.id, NEW.title, NEW.description, NEW.skills_required,
+            (SELECT company_name FROM recruiter_profiles WHERE user_id = NEW.recruiter_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_after_update
+AFTER UPDATE OF title, description, skills_required, recruiter_id, is_active ON jobs
+BEGIN
+    DELETE FROM jobs_fts WHERE rowid = OLD.id;
+    INSERT INTO jobs_fts (rowid, title, description, skills_required, company_name)
+    SELECT NEW.id, NEW.title, NEW.description, NEW.skills_required,
+           (SELECT company_name FROM recruiter_profiles WHERE user_id = NEW.recruiter_id)
+    WHERE NEW.is_active = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_after_delete AFTER DELETE ON jobs
+BEGIN
+    DELETE FROM jobs_fts WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS recruiter_profiles_fts_after_insert AFTER INSERT ON recruiter_profiles
+BEGIN
+    UPDATE jobs_fts SET company_name = NEW.company_name
+    WHERE rowid IN (SELECT id FROM jobs WHERE recruiter_id = NEW.user_id AND is_active = 1);
+END;
+
+CREATE TRIGGER IF NOT EXISTS recruiter_profiles_fts_after_update
+AFTER UPDATE OF company_name ON recruiter_profiles
+BEGIN
+    UPDATE jobs_fts SET company_name = NEW.company_name
+    WHERE rowid IN (SELECT id FROM jobs WHERE recruiter_id = NEW.user_id AND is_active = 1);
+END;
+
+-- Index jobs that existed before the search index was introduced
+INSERT INTO jobs_fts (rowid, title, description, skills_required, company_name)
+SELECT j.id, j.title, j.description, j.skills_required, rp.company_name
+FROM jobs j
+LEFT JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id
+WHERE j.is_active = 1
+  AND j.id NOT IN (SELECT rowid FROM jobs_fts);
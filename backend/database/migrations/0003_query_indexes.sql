@@ -0,0 +1,15 @@
+-- Profile lookups and the recruiter_profiles JOIN used by every job query
+CREATE INDEX IF NOT EXISTS idx_student_profiles_user_id ON student_profiles (user_id);
+CREATE INDEX IF NOT EXISTS idx_recruiter_profiles_user_id ON recruiter_profiles (user_id);
+
+-- Recruiter dashboard: a recruiter's jobs, newest first
+CREATE INDEX IF NOT EXISTS idx_jobs_recruiter_posted ON jobs (recruiter_id, posted_at);
+
+-- Job search orderings over active jobs
+CREATE INDEX IF NOT EXISTS idx_jobs_active_posted ON jobs (is_active, posted_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_active_salary ON jobs (is_active, salary);
+CREATE INDEX IF NOT EXISTS idx_jobs_active_title ON jobs (is_active, title);
+
+-- Application history per student and applicant lists per job, newest first
+CREATE INDEX IF NOT EXISTS idx_applications_student_applied ON applications (student_id, applied_at);
+CREATE INDEX IF NOT EXISTS idx_applications_job_applied ON applications (job_id, applied_at);
@@ -0,0 +1,70 @@
+-- Canonical skill dictionary; names are stored normalized (lowercase, single spaces)
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+-- Alternative spellings folded onto a canonical skill
+CREATE TABLE IF NOT EXISTS skill_aliases (
+    alias TEXT PRIMARY KEY,
+    skill_id INTEGER NOT NULL,
+    FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Inverted indexes: skill -> jobs and skill -> students
+CREATE TABLE IF NOT EXISTS job_skills (
+    skill_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (skill_id, job_id),
+    FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE,
+    FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills (job_id);
+
+CREATE TABLE IF NOT EXISTS student_skills (
+    skill_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL,
+    PRIMARY KEY (skill_id, student_id),
+    FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE,
+    FOREIGN KEY (student_id) REFERENCES users (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_student_skills_student ON student_skills (student_id);
+
+-- Seed common skills and their aliases
+INSERT OR IGNORE INTO skills (name) VALUES
+    ('javascript'), ('typescript'), ('python'), ('node.js'), ('react'), ('vue'),
+    ('angular'), ('go'), ('c++'), ('c#'), ('postgresql'), ('mongodb'),
+    ('kubernetes'), ('aws'), ('machine learning'), ('artificial intelligence'),
+    ('html'), ('css'), ('sql'), ('java');
+
+INSERT OR IGNORE INTO skill_aliases (alias, skill_id)
+SELECT alias, (SELECT id FROM skills WHERE name = canonical)
+FROM (
+    SELECT 'js' AS alias, 'javascript' AS canonical
+    UNION ALL SELECT 'es6', 'javascript'
+    UNION ALL SELECT 'ecmascript', 'javascript'
+    UNION ALL SELECT 'ts', 'typescript'
+    UNION ALL SELECT 'py', 'python'
+    UNION ALL SELECT 'python3', 'python'
+    UNION ALL SELECT 'node', 'node.js'
+    UNION ALL SELECT 'nodejs', 'node.js'
+    UNION ALL SELECT 'reactjs', 'react'
+    UNION ALL SELECT 'react.js', 'react'
+    UNION ALL SELECT 'vuejs', 'vue'
+    UNION ALL SELECT 'vue.js', 'vue'
+    UNION ALL SELECT 'angularjs', 'angular'
+    UNION ALL SELECT 'golang', 'go'
+    UNION ALL SELECT 'cpp', 'c++'
+    UNION ALL SELECT 'csharp', 'c#'
+    UNION ALL SELECT 'c sharp', 'c#'
+    UNION ALL SELECT 'postgres', 'postgresql'
+    UNION ALL SELECT 'mongo', 'mongodb'
+    UNION ALL SELECT 'k8s', 'kubernetes'
+    UNION ALL SELECT 'amazon web services', 'aws'
+    UNION ALL SELECT 'ml', 'machine learning'
+    UNION ALL SELECT 'ai', 'artificial intelligence'
+    UNION ALL SELECT 'html5', 'html'
+    UNION ALL SELECT 'css3', 'css'
+);
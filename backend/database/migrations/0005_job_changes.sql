@@ -0,0 +1,21 @@
+-- Append-only log of job writes; in-memory indexes replay it to stay current
+CREATE TABLE IF NOT EXISTS job_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS job_changes_after_insert AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO job_changes (job_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_changes_after_update AFTER UPDATE ON jobs
+BEGIN
+    INSERT INTO job_changes (job_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_changes_after_delete AFTER DELETE ON jobs
+BEGIN
+    INSERT INTO job_changes (job_id) VALUES (OLD.id);
+END;
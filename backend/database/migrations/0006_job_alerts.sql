@@ -0,0 +1,16 @@
+CREATE INDEX IF NOT EXISTS idx_job_alerts_student ON job_alerts (student_id);
+
+-- Jobs matched against student alerts, read by the alert digest
+CREATE TABLE IF NOT EXISTS alert_matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL,
+    matched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (alert_id) REFERENCES job_alerts (id) ON DELETE CASCADE,
+    FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE,
+    FOREIGN KEY (student_id) REFERENCES users (id) ON DELETE CASCADE,
+    UNIQUE(alert_id, job_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_alert_matches_student ON alert_matches (student_id, id);
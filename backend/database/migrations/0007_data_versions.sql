@@ -0,0 +1,135 @@
+-- Per-resource change counters behind ETag/Last-Modified validators.
+-- Scopes: jobs (any job listing), job:<id>, recruiter:<user_id>,
+-- recruiter-jobs:<user_id>, student:<user_id>, student-apps:<user_id>,
+-- job-apps:<job_id>, alerts:<user_id>, alert-matches:<user_id>
+CREATE TABLE IF NOT EXISTS data_versions (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_jobs_after_insert AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('jobs', 1),
+        ('job:' || NEW.id, 1),
+        ('recruiter-jobs:' || NEW.recruiter_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_jobs_after_update AFTER UPDATE ON jobs
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('jobs', 1),
+        ('job:' || NEW.id, 1),
+        ('recruiter-jobs:' || NEW.recruiter_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_jobs_after_delete AFTER DELETE ON jobs
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('jobs', 1),
+        ('job:' || OLD.id, 1),
+        ('recruiter-jobs:' || OLD.recruiter_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_recruiter_profiles_after_insert AFTER INSERT ON recruiter_profiles
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('recruiter:' || NEW.user_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_recruiter_profiles_after_update AFTER UPDATE ON recruiter_profiles
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('recruiter:' || NEW.user_id, 1),
+        ('jobs', 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+    -- Company details are shown on every job of the recruiter
+    INSERT INTO data_versions (scope, version)
+    SELECT 'job:' || id, 1 FROM jobs WHERE recruiter_id = NEW.user_id
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_student_profiles_after_insert AFTER INSERT ON student_profiles
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('student:' || NEW.user_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_student_profiles_after_update AFTER UPDATE ON student_profiles
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('student:' || NEW.user_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+    -- Applicant lists show the student's profile
+    INSERT INTO data_versions (scope, version)
+    SELECT 'job-apps:' || job_id, 1 FROM applications WHERE student_id = NEW.user_id
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_applications_after_insert AFTER INSERT ON applications
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('student-apps:' || NEW.student_id, 1),
+        ('job-apps:' || NEW.job_id, 1),
+        ('recruiter-jobs:' || (SELECT recruiter_id FROM jobs WHERE id = NEW.job_id), 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_applications_after_update AFTER UPDATE ON applications
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('student-apps:' || NEW.student_id, 1),
+        ('job-apps:' || NEW.job_id, 1),
+        ('recruiter-jobs:' || (SELECT recruiter_id FROM jobs WHERE id = NEW.job_id), 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_applications_after_delete AFTER DELETE ON applications
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('student-apps:' || OLD.student_id, 1),
+        ('job-apps:' || OLD.job_id, 1),
+        ('recruiter-jobs:' || (SELECT recruiter_id FROM jobs WHERE id = OLD.job_id), 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_job_alerts_after_insert AFTER INSERT ON job_alerts
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alerts:' || NEW.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_job_alerts_after_update AFTER UPDATE ON job_alerts
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alerts:' || NEW.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_job_alerts_after_delete AFTER DELETE ON job_alerts
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alerts:' || OLD.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_alert_matches_after_insert AFTER INSERT ON alert_matches
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alert-matches:' || NEW.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_alert_matches_after_delete AFTER DELETE ON alert_matches
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alert-matches:' || OLD.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
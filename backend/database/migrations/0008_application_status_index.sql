@@ -0,0 +1,3 @@
+-- Applicant listings filter by status within a job and page newest first;
+-- per-status counts for a job are answered from this index alone
+CREATE INDEX IF NOT EXISTS idx_applications_job_status_applied ON applications (job_id, status, applied_at);
@@ -0,0 +1,12 @@
+-- Content-addressed CV files: one row per distinct file, counted by the profiles using it
+CREATE TABLE IF NOT EXISTS cv_blobs (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    orphaned_at TIMESTAMP
+) WITHOUT ROWID;
+
+-- Garbage collection only looks at unreferenced blobs
+CREATE INDEX IF NOT EXISTS idx_cv_blobs_orphaned ON cv_blobs (orphaned_at) WHERE ref_count <= 0;
@@ -0,0 +1,51 @@
+-- Text extracted from each stored CV by the background extractor; NULL until it has run
+ALTER TABLE cv_blobs ADD COLUMN text TEXT;
+ALTER TABLE cv_blobs ADD COLUMN extracted_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_cv_blobs_pending ON cv_blobs (created_at) WHERE extracted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_student_profiles_cv_filename ON student_profiles (cv_filename);
+
+-- Full-text index over candidates for recruiter search; rowid is the student's user id
+CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+    skills,
+    education,
+    cv_text,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS candidates_fts_after_insert AFTER INSERT ON student_profiles
+BEGIN
+    INSERT INTO candidates_fts (rowid, skills, education, cv_text)
+    VALUES (NEW.user_id, NEW.skills, NEW.education,
+            (SELECT text FROM cv_blobs WHERE path = NEW.cv_filename));
+END;
+
+CREATE TRIGGER IF NOT EXISTS candidates_fts_after_update
+AFTER UPDATE OF skills, education, cv_filename ON student_profiles
+BEGIN
+    DELETE FROM candidates_fts WHERE rowid = OLD.user_id;
+    INSERT INTO candidates_fts (rowid, skills, education, cv_text)
+    VALUES (NEW.user_id, NEW.skills, NEW.education,
+            (SELECT text FROM cv_blobs WHERE path = NEW.cv_filename));
+END;
+
+CREATE TRIGGER IF NOT EXISTS candidates_fts_after_delete AFTER DELETE ON student_profiles
+BEGIN
+    DELETE FROM candidates_fts WHERE rowid = OLD.user_id;
+END;
+
+-- Extraction finishes after the upload: refresh every profile using the blob
+CREATE TRIGGER IF NOT EXISTS cv_blobs_candidates_fts_after_text AFTER UPDATE OF text ON cv_blobs
+BEGIN
+    DELETE FROM candidates_fts
+    WHERE rowid IN (SELECT user_id FROM student_profiles WHERE cv_filename = NEW.path);
+    INSERT INTO candidates_fts (rowid, skills, education, cv_text)
+    SELECT user_id, skills, education, NEW.text FROM student_profiles WHERE cv_filename = NEW.path;
+END;
+
+-- Index students that existed before candidate search; their CVs are queued by
+-- `flask extract-cv-text`
+INSERT INTO candidates_fts (rowid, skills, education)
+SELECT user_id, skills, education FROM student_profiles
+WHERE user_id NOT IN (SELECT rowid FROM candidates_fts);
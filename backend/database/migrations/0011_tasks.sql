@@ -0,0 +1,21 @@
+-- Durable background tasks. Workers claim a queued task by leasing it; a lease
+-- that runs out (crashed worker) puts the task back in the queue. Tasks that
+-- keep failing end up 'dead' until requeued by hand. Finished tasks are deleted.
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'dead')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at REAL NOT NULL,
+    lease_expires_at REAL,
+    worker TEXT,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Claim order: highest priority first, then oldest due
+CREATE INDEX IF NOT EXISTS idx_tasks_queued ON tasks (priority DESC, run_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_tasks_running ON tasks (lease_expires_at) WHERE status = 'running';
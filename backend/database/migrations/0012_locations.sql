@@ -0,0 +1,147 @@
+-- Offline gazetteer: canonical places with their coordinates
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    region TEXT,
+    country TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL
+);
+
+-- Spellings folded onto a place, stored normalized (lowercase, single spaces);
+-- every place is also listed under its own name
+CREATE TABLE IF NOT EXISTS location_aliases (
+    alias TEXT PRIMARY KEY,
+    location_id INTEGER NOT NULL,
+    FOREIGN KEY (location_id) REFERENCES locations (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Bounding boxes (a point per place) for radius search prefiltering
+CREATE VIRTUAL TABLE IF NOT EXISTS location_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+
+CREATE TRIGGER IF NOT EXISTS location_index_after_insert AFTER INSERT ON locations
+BEGIN
+    INSERT INTO location_index (id, min_lat, max_lat, min_lon, max_lon)
+    VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS location_index_after_update AFTER UPDATE OF latitude, longitude ON locations
+BEGIN
+    UPDATE location_index
+    SET min_lat = NEW.latitude, max_lat = NEW.latitude, min_lon = NEW.longitude, max_lon = NEW.longitude
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS location_index_after_delete AFTER DELETE ON locations
+BEGIN
+    DELETE FROM location_index WHERE id = OLD.id;
+END;
+
+-- Free-text locations resolved against the gazetteer on write (NULL when unknown)
+ALTER TABLE jobs ADD COLUMN location_id INTEGER REFERENCES locations (id);
+ALTER TABLE student_profiles ADD COLUMN location_id INTEGER REFERENCES locations (id);
+
+-- Location and radius filters over active jobs, newest first. Partial, so plain
+-- searches keep using the (is_active, sort column) indexes
+CREATE INDEX IF NOT EXISTS idx_jobs_active_location ON jobs (location_id, posted_at) WHERE is_active = 1;
+
+-- Seed the gazetteer
+INSERT INTO locations (name, region, country, latitude, longitude) VALUES
+    ('Bengaluru', 'Karnataka', 'IN', 12.9716, 77.5946),
+    ('Mysuru', 'Karnataka', 'IN', 12.2958, 76.6394),
+    ('Mangaluru', 'Karnataka', 'IN', 12.9141, 74.8560),
+    ('Hubballi', 'Karnataka', 'IN', 15.3647, 75.1240),
+    ('Belagavi', 'Karnataka', 'IN', 15.8497, 74.4977),
+    ('Mumbai', 'Maharashtra', 'IN', 19.0760, 72.8777),
+    ('Navi Mumbai', 'Maharashtra', 'IN', 19.0330, 73.0297),
+    ('Thane', 'Maharashtra', 'IN', 19.2183, 72.9781),
+    ('Pune', 'Maharashtra', 'IN', 18.5204, 73.8567),
+    ('Nagpur', 'Maharashtra', 'IN', 21.1458, 79.0882),
+    ('Nashik', 'Maharashtra', 'IN', 19.9975, 73.7898),
+    ('Hyderabad', 'Telangana', 'IN', 17.3850, 78.4867),
+    ('Secunderabad', 'Telangana', 'IN', 17.4399, 78.4983),
+    ('Visakhapatnam', 'Andhra Pradesh', 'IN', 17.6868, 83.2185),
+    ('Vijayawada', 'Andhra Pradesh', 'IN', 16.5062, 80.6480),
+    ('Chennai', 'Tamil Nadu', 'IN', 13.0827, 80.2707),
+    ('Coimbatore', 'Tamil Nadu', 'IN', 11.0168, 76.9558),
+    ('Madurai', 'Tamil Nadu', 'IN', 9.9252, 78.1198),
+    ('Tiruchirappalli', 'Tamil Nadu', 'IN', 10.7905, 78.7047),
+    ('Kochi', 'Kerala', 'IN', 9.9312, 76.2673),
+    ('Thiruvananthapuram', 'Kerala', 'IN', 8.5241, 76.9366),
+    ('Kozhikode', 'Kerala', 'IN', 11.2588, 75.7804),
+    ('New Delhi', 'Delhi', 'IN', 28.6139, 77.2090),
+    ('Gurugram', 'Haryana', 'IN', 28.4595, 77.0266),
+    ('Faridabad', 'Haryana', 'IN', 28.4089, 77.3178),
+    ('Noida', 'Uttar Pradesh', 'IN', 28.5355, 77.3910),
+    ('Greater Noida', 'Uttar Pradesh', 'IN', 28.4744, 77.5040),
+    ('Ghaziabad', 'Uttar Pradesh', 'IN', 28.6692, 77.4538),
+    ('Lucknow', 'Uttar Pradesh', 'IN', 26.8467, 80.9462),
+    ('Kanpur', 'Uttar Pradesh', 'IN', 26.4499, 80.3319),
+    ('Varanasi', 'Uttar Pradesh', 'IN', 25.3176, 82.9739),
+    ('Agra', 'Uttar Pradesh', 'IN', 27.1767, 78.0081),
+    ('Dehradun', 'Uttarakhand', 'IN', 30.3165, 78.0322),
+    ('Chandigarh', 'Chandigarh', 'IN', 30.7333, 76.7794),
+    ('Mohali', 'Punjab', 'IN', 30.7046, 76.7179),
+    ('Ludhiana', 'Punjab', 'IN', 30.9010, 75.8573),
+    ('Amritsar', 'Punjab', 'IN', 31.6340, 74.8723),
+    ('Jaipur', 'Rajasthan', 'IN', 26.9124, 75.7873),
+    ('Ahmedabad', 'Gujarat', 'IN', 23.0225, 72.5714),
+    ('Gandhinagar', 'Gujarat', 'IN', 23.2156, 72.6369),
+    ('Vadodara', 'Gujarat', 'IN', 22.3072, 73.1812),
+    ('Surat', 'Gujarat', 'IN', 21.1702, 72.8311),
+    ('Indore', 'Madhya Pradesh', 'IN', 22.7196, 75.8577),
+    ('Bhopal', 'Madhya Pradesh', 'IN', 23.2599, 77.4126),
+    ('Raipur', 'Chhattisgarh', 'IN', 21.2514, 81.6296),
+    ('Kolkata', 'West Bengal', 'IN', 22.5726, 88.3639),
+    ('Bhubaneswar', 'Odisha', 'IN', 20.2961, 85.8245),
+    ('Patna', 'Bihar', 'IN', 25.5941, 85.1376),
+    ('Ranchi', 'Jharkhand', 'IN', 23.3441, 85.3096),
+    ('Guwahati', 'Assam', 'IN', 26.1445, 91.7362),
+    ('Panaji', 'Goa', 'IN', 15.4909, 73.8278),
+    ('Srinagar', 'Jammu and Kashmir', 'IN', 34.0837, 74.7973),
+    ('Singapore', NULL, 'SG', 1.3521, 103.8198),
+    ('Dubai', NULL, 'AE', 25.2048, 55.2708),
+    ('London', 'England', 'GB', 51.5074, -0.1278),
+    ('Dublin', NULL, 'IE', 53.3498, -6.2603),
+    ('Amsterdam', NULL, 'NL', 52.3676, 4.9041),
+    ('Berlin', NULL, 'DE', 52.5200, 13.4050),
+    ('New York', 'New York', 'US', 40.7128, -74.0060),
+    ('San Francisco', 'California', 'US', 37.7749, -122.4194),
+    ('Seattle', 'Washington', 'US', 47.6062, -122.3321),
+    ('Toronto', 'Ontario', 'CA', 43.6532, -79.3832),
+    ('Sydney', 'New South Wales', 'AU', -33.8688, 151.2093),
+    ('Tokyo', NULL, 'JP', 35.6762, 139.6503);
+
+INSERT OR IGNORE INTO location_aliases (alias, location_id)
+SELECT lower(name), id FROM locations;
+
+INSERT OR IGNORE INTO location_aliases (alias, location_id)
+SELECT alias, (SELECT id FROM locations WHERE name = canonical)
+FROM (
+    SELECT 'bangalore' AS alias, 'Bengaluru' AS canonical
+    UNION ALL SELECT 'blr', 'Bengaluru'
+    UNION ALL SELECT 'mysore', 'Mysuru'
+    UNION ALL SELECT 'mangalore', 'Mangaluru'
+    UNION ALL SELECT 'hubli', 'Hubballi'
+    UNION ALL SELECT 'belgaum', 'Belagavi'
+    UNION ALL SELECT 'bombay', 'Mumbai'
+    UNION ALL SELECT 'poona', 'Pune'
+    UNION ALL SELECT 'vizag', 'Visakhapatnam'
+    UNION ALL SELECT 'madras', 'Chennai'
+    UNION ALL SELECT 'trichy', 'Tiruchirappalli'
+    UNION ALL SELECT 'cochin', 'Kochi'
+    UNION ALL SELECT 'ernakulam', 'Kochi'
+    UNION ALL SELECT 'trivandrum', 'Thiruvananthapuram'
+    UNION ALL SELECT 'calicut', 'Kozhikode'
+    UNION ALL SELECT 'delhi', 'New Delhi'
+    UNION ALL SELECT 'gurgaon', 'Gurugram'
+    UNION ALL SELECT 'calcutta', 'Kolkata'
+    UNION ALL SELECT 'benares', 'Varanasi'
+    UNION ALL SELECT 'baroda', 'Vadodara'
+    UNION ALL SELECT 'amdavad', 'Ahmedabad'
+    UNION ALL SELECT 'goa', 'Panaji'
+    UNION ALL SELECT 'nyc', 'New York'
+    UNION ALL SELECT 'new york city', 'New York'
+    UNION ALL SELECT 'sf', 'San Francisco'
+    UNION ALL SELECT 'bay area', 'San Francisco'
+);
@@ -0,0 +1,3 @@
+-- Dead tasks are kept until requeued by hand; lets the /health counts and
+-- requeue-dead-tasks find them without reading the whole queue
+CREATE INDEX IF NOT EXISTS idx_tasks_dead ON tasks (name) WHERE status = 'dead';
@@ -0,0 +1,29 @@
+-- A global 'alerts' scope bumped by every alert change, so alert matching
+-- in any process (web or run-tasks) knows when to rebuild its index
+DROP TRIGGER IF EXISTS data_versions_job_alerts_after_insert;
+DROP TRIGGER IF EXISTS data_versions_job_alerts_after_update;
+DROP TRIGGER IF EXISTS data_versions_job_alerts_after_delete;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_job_alerts_after_insert AFTER INSERT ON job_alerts
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alerts', 1),
+        ('alerts:' || NEW.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_job_alerts_after_update AFTER UPDATE ON job_alerts
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alerts', 1),
+        ('alerts:' || NEW.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_versions_job_alerts_after_delete AFTER DELETE ON job_alerts
+BEGIN
+    INSERT INTO data_versions (scope, version) VALUES
+        ('alerts', 1),
+        ('alerts:' || OLD.student_id, 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
@@ -0,0 +1,23 @@
+-- Job listings select the page ids first and join full rows for that page
+-- only (Job.search_jobs). These partial indexes hold only active jobs and
+-- every column that id query filters, sorts and joins on, so it walks the
+-- index alone. id follows the sort column to keep the (sort, id) order;
+-- is_active is listed too, as SQLite counts the WHERE column as uncovered
+-- otherwise.
+DROP INDEX IF EXISTS idx_jobs_active_posted;
+DROP INDEX IF EXISTS idx_jobs_active_salary;
+DROP INDEX IF EXISTS idx_jobs_active_title;
+DROP INDEX IF EXISTS idx_jobs_active_location;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_listed_posted
+    ON jobs (posted_at, id, job_type, work_mode, salary, location_id, recruiter_id, is_active)
+    WHERE is_active = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_listed_salary
+    ON jobs (salary, id, job_type, work_mode, posted_at, location_id, recruiter_id, is_active)
+    WHERE is_active = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_listed_title
+    ON jobs (title, id, job_type, work_mode, salary, location_id, recruiter_id, is_active)
+    WHERE is_active = 1;
+CREATE INDEX IF NOT EXISTS idx_jobs_listed_location
+    ON jobs (location_id, posted_at, id, job_type, work_mode, salary, recruiter_id, is_active)
+    WHERE is_active = 1;
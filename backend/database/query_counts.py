@@ -0,0 +1,90 @@
+"""Statement budgets for the mutating endpoints.
+
+Each entry in WRITE_BUDGETS sends one request through the test client
+against a scratch database and counts the SQL statements the request
+issues (trigger programs, BEGIN and COMMIT are not counted). A request
+over its budget usually means a read-then-write round trip crept back
+into a route. Run it with `flask check-write-queries`.
+"""
+import contextvars
+import os
+import tempfile
+from flask import g, request_started
+from database.db import POOL_SETTINGS, configure_pool
+from database.migrate import migrate
+from utils.task_queue import task_queue
+
+# (label, method, path, json body, who, budget); paths are formatted with the ids below
+WRITE_BUDGETS = [
+    # Queuing the alert matching task is the one extra statement
+    ('create job', 'post', '/recruiter/jobs', {'title': 'Data Engineer', 'description': 'Pipelines'}, 'recruiter', 2),
+    ('update job', 'put', '/recruiter/jobs/{job_id}', {'salary': 90000}, 'recruiter', 1),
+    # The gazetteer lookup resolving a location is the one extra statement
+    ('move job', 'put', '/recruiter/jobs/{job_id}', {'location': 'Bangalore, India'}, 'recruiter', 2),
+    ('update job of another recruiter', 'put', '/recruiter/jobs/{job_id}', {'salary': 1}, 'other', 1),
+    ('apply to job', 'post', '/student/jobs/apply/{job_id}', {'cover_letter': 'Hello'}, 'student', 1),
+    ('apply twice', 'post', '/student/jobs/apply/{job_id}', {}, 'student', 2),
+    ('update application status', 'put', '/recruiter/applications/{application_id}/status',
+     {'status': 'shortlisted'}, 'recruiter', 1),
+    ('update student profile', 'put', '/student/profile', {'bio': 'Backend developer'}, 'student', 1),
+    ('update recruiter profile', 'put', '/recruiter/profile', {'website': 'https://example.com'}, 'recruiter', 1),
+    ('delete job', 'delete', '/recruiter/jobs/{job_id}', None, 'recruiter', 1),
+]
+
+def _counted(statements):
+    counted = []
+    for sql in statements:
+        if not sql.lstrip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')):
+            continue
+        # Each trigger program that fires is traced again under the statement that fired it
+        if counted and counted[-1] == sql:
+            continue
+        counted.append(sql)
+    return counted
+
+def _run_budgets(app):
+    client = app.test_client()
+    tokens = {}
+    for who, role, extra in [('recruiter', 'recruiter', {'company_name': 'Acme'}),
+                             ('other', 'recruiter', {'company_name': 'Globex'}),
+                             ('student', 'student', {'name': 'Sam'})]:
+        response = client.post('/auth/signup', json=dict(
+            extra, email=f'{who}@example.com', password='password', role=role))
+        tokens[who] = response.get_json()['token']
+
+    ids = {}
+    results = []
+    statements = []
+
+    def record(sender, **extra):
+        g.sql_statements = statements
+
+    with request_started.connected_to(record, app):
+        for label, method, path_template, body, who, budget in WRITE_BUDGETS:
+            statements.clear()
+            response = getattr(client, method)(
+                path_template.format(**ids), json=body,
+                headers={'Authorization': f'Bearer {tokens[who]}'})
+            data = response.get_json(silent=True) or {}
+            for key in ('job_id', 'application_id'):
+                if key not in ids and data.get(key):
+                    ids[key] = data[key]
+            results.append((label, response.status_code, _counted(statements), budget))
+    return results
+
+def check_write_queries(app):
+    """Run every budgeted request and return [(label, status, statements, budget)]"""
+    original_path = POOL_SETTINGS['path']
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, 'portal.db')
+        migrate(path)
+        configure_pool(path=path)
+        try:
+            # An empty context has no app context to inherit, so every request
+            # gets its own flask.g and connection, as it would in production
+            results = contextvars.Context().run(_run_budgets, app)
+            # The requests started task workers; stop them before the scratch database goes
+            task_queue.stop()
+        finally:
+            configure_pool(path=original_path)
+    return results
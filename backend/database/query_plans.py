@@ -0,0 +1,180 @@
+"""EXPLAIN QUERY PLAN checks for the SQL issued by the models.
+
+Each entry in PLAN_CHECKS calls model read methods the way the routes
+do. The statements they run are captured through the connection's trace
+callback, so the check always sees the SQL the models really send, and
+every plan is inspected for full table scans. Listing queries named in
+COVERED_CHECKS must also pick their page from a covering index, reading
+table rows by primary key only for the page itself. Statements that would
+change data, like leasing a task, are listed in STATEMENT_PLAN_CHECKS and
+only explained. Run it against a large seeded database with
+`flask check-query-plans`.
+
+Full loads of the in-memory indexes (Job.get_jobs_for_index() without
+ids, JobAlert.iter_active_alerts) read every row on purpose and are not
+checked.
+"""
+from database.db import get_db
+from models.user_model import User
+from models.student_model import StudentProfile
+from models.recruiter_model import RecruiterProfile
+from models.job_model import Job, _count_cache
+from models.location_model import Location
+from models.application_model import Application
+from models.cv_blob_model import CVBlob
+from models.alert_model import JobAlert
+from models.task_model import Task, READY_QUERY, CLAIM_QUERY
+from models.version_model import DataVersion
+
+def _sample_ids(conn):
+    """Pick real ids so lookups hit existing rows"""
+    def first(query):
+        row = conn.execute(query).fetchone()
+        return row[0] if row and row[0] is not None else 1
+
+    return {
+        'job_id': first("SELECT MAX(id) FROM jobs"),
+        'recruiter_id': first("SELECT MAX(user_id) FROM recruiter_profiles"),
+        'student_id': first("SELECT MAX(user_id) FROM student_profiles"),
+        'email': first("SELECT email FROM users ORDER BY id DESC LIMIT 1"),
+        'alert_student_id': first("SELECT student_id FROM job_alerts ORDER BY id DESC LIMIT 1"),
+        'match_id': first("SELECT MAX(id) FROM alert_matches"),
+        'change_seq': first("SELECT MAX(seq) FROM job_changes"),
+    }
+
+PLAN_CHECKS = [
+    ('user by email', lambda ids: User.get_user_by_email(ids['email'])),
+    ('user by id', lambda ids: User.get_user_by_id(ids['student_id'])),
+    ('student profile', lambda ids: StudentProfile.get_profile_by_user_id(ids['student_id'])),
+    ('student cv access', lambda ids: StudentProfile.get_cv_for_viewer(ids['student_id'], ids['recruiter_id'], 'recruiter')),
+    ('candidate search', lambda ids: StudentProfile.search_candidates('python develop*')),
+    ('cv extraction backlog', lambda ids: CVBlob.get_pending_extraction()),
+    ('recruiter profile', lambda ids: RecruiterProfile.get_profile_by_user_id(ids['recruiter_id'])),
+    ('job detail', lambda ids: Job.get_job_by_id(ids['job_id'])),
+    ('jobs by ids', lambda ids: Job.get_jobs_by_ids(list(range(ids['job_id'], ids['job_id'] - 20, -1)))),
+    ('job skills', lambda ids: Job.get_skill_ids(ids['job_id'])),
+    ('job versions', lambda ids: DataVersion.get_versions(['jobs', f"job:{ids['job_id']}"])),
+    ('job changes', lambda ids: Job.get_changes_since(max(ids['change_seq'] - 100, 0))),
+    ('job change position', lambda ids: Job.get_last_change_seq()),
+    ('jobs for index refresh', lambda ids: list(Job.get_jobs_for_index([ids['job_id'], ids['job_id'] - 1]))),
+    ('jobs for alert matching', lambda ids: Job.get_jobs_for_matching([ids['job_id'], ids['job_id'] - 1])),
+    ('search newest', lambda ids: Job.search_jobs()),
+    ('search by salary', lambda ids: Job.search_jobs(sort_by='salary')),
+    ('search by title', lambda ids: Job.search_jobs(sort_by='title', order='ASC')),
+    ('search filtered', lambda ids: Job.search_jobs(job_type='full-time', work_mode='remote', salary_min=50000)),
+    ('search by location', lambda ids: Job.search_jobs(location='Bangalore')),
+    ('search near', lambda ids: Job.search_jobs(location_ids=tuple(Location.within_radius(28.61, 77.21, 50)))),
+    ('search all skills', lambda ids: Job.search_jobs(skills='python, sql')),
+    ('search any skill', lambda ids: Job.search_jobs(skills='python, sql', skills_match='any')),
+    ('search keyword', lambda ids: Job.search_jobs(keyword='engineer')),
+    ('search relevance', lambda ids: Job.search_jobs(keyword='python develop*', sort_by='relevance')),
+    ('search cursor page', lambda ids: Job.search_jobs_after(Job.search_jobs(per_page=5)[1], per_page=5)),
+    ('search count', lambda ids: Job.count_jobs(job_type='internship', salary_min=1)),
+    ('recruiter jobs', lambda ids: Job.get_jobs_by_recruiter(ids['recruiter_id'])),
+    ('job applications', lambda ids: Application.get_applications_by_job(ids['job_id'])),
+    ('job applications page', lambda ids: Application.get_applications_page(ids['job_id'], after=('9999', 1 << 62))),
+    ('job applications by status', lambda ids: Application.get_applications_page(ids['job_id'], status='pending')),
+    ('job application counts', lambda ids: Application.get_status_counts(ids['job_id'])),
+    ('job applicants ranking', lambda ids: list(Application.iter_applicants_for_ranking(ids['job_id']))),
+    ('job applicants export', lambda ids: list(Application.iter_applications_by_job(ids['job_id'], status='hired'))),
+    ('student applications', lambda ids: Application.get_applications_by_student(ids['student_id'])),
+    ('student applied job ids', lambda ids: Application.get_applied_job_ids(ids['student_id'])),
+    ('student skills', lambda ids: StudentProfile.get_skill_ids(ids['student_id'])),
+    ('student alerts', lambda ids: JobAlert.get_alerts_by_student(ids['alert_student_id'])),
+    ('alert digest', lambda ids: JobAlert.get_digest(ids['alert_student_id'])),
+    ('alert digest page', lambda ids: JobAlert.get_digest(ids['alert_student_id'], before_id=ids['match_id'])),
+    ('task counts', lambda ids: Task.get_counts()),
+    ('application exists', lambda ids: Application.check_application_exists(ids['job_id'], ids['student_id'])),
+]
+
+# Listing checks and the alias of the listed table: every read of it must
+# use a covering index or a primary key lookup, and one must be covering
+COVERED_CHECKS = {
+    'search newest': 'j',
+    'search by salary': 'j',
+    'search by title': 'j',
+    'search filtered': 'j',
+    'search near': 'j',
+    'search cursor page': 'j',
+    'search count': 'j',
+    'job applications page': 'a',
+    'job applications by status': 'a',
+    'job application counts': 'applications',
+}
+
+# (label, sql, sample parameters) for statements that are explained but not run
+STATEMENT_PLAN_CHECKS = [
+    ('task ready check', READY_QUERY, (0,)),
+    ('task claim', CLAIM_QUERY, (0, 'plan-check', 0)),
+]
+
+def explain(conn, sql, params=()):
+    """Return the plan detail lines for a statement"""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+def full_scans(plan):
+    """Return plan lines that scan a whole table without an index"""
+    offenders = []
+    # Subqueries the plan fills first (a page of ids) are scanned by name
+    subqueries = {detail.split(' ', 1)[1] for detail in plan if detail.startswith(('MATERIALIZE ', 'CO-ROUTINE '))}
+    for detail in plan:
+        if not detail.startswith('SCAN '):
+            continue
+        if detail[len('SCAN '):] in subqueries:
+            continue
+        if 'USING' in detail or 'VIRTUAL TABLE' in detail:
+            continue
+        if detail.startswith('SCAN (') or detail == 'SCAN CONSTANT ROW':
+            continue
+        offenders.append(detail)
+    return offenders
+
+def uncovered_reads(plan, alias):
+    """Return plan lines reading alias other than by covering index or primary key.
+
+    When none of the reads is covering, all of them are returned, so a plan
+    that fetches every row by rowid fails too.
+    """
+    reads = [detail for detail in plan if detail.startswith((f'SCAN {alias} ', f'SEARCH {alias} '))]
+    if not reads:
+        return []
+    offenders = [detail for detail in reads
+                 if 'USING COVERING INDEX' not in detail and 'USING INTEGER PRIMARY KEY' not in detail]
+    if not any('USING COVERING INDEX' in detail for detail in reads):
+        offenders = offenders or reads
+    return offenders
+
+def check_query_plans():
+    """Run every plan check and return [(label, sql, plan, full_scans, uncovered)].
+
+    Must be called inside an app context so the models share the traced
+    request connection.
+    """
+    results = []
+    # Cached totals would hide the count query from the trace
+    _count_cache.clear()
+    with get_db() as conn:
+        ids = _sample_ids(conn)
+        for label, call in PLAN_CHECKS:
+            statements = []
+            conn.set_trace_callback(statements.append)
+            try:
+                call(ids)
+            finally:
+                conn.set_trace_callback(None)
+
+            for sql in statements:
+                if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                    continue
+                # FTS5 reads its shadow tables (quoted as 'main'.'x') on first use per connection
+                if "'main'." in sql:
+                    continue
+                plan = explain(conn, sql)
+                alias = COVERED_CHECKS.get(label)
+                uncovered = uncovered_reads(plan, alias) if alias else []
+                results.append((label, sql, plan, full_scans(plan), uncovered))
+        
+        for label, sql, params in STATEMENT_PLAN_CHECKS:
+            plan = explain(conn, sql, params)
+            results.append((label, sql, plan, full_scans(plan), []))
+    return results
@@ -0,0 +1,179 @@
+"""Slow-query log.
+
+Pool connections report every statement that takes longer than
+SLOW_QUERY_MS, from execute to the last fetched row, to slow_query_log.
+Each one becomes a JSON line with the normalized SQL (literals and
+IN-lists folded), the types of its parameters but not their values, the
+duration, the row count and the endpoint being served. The first time a
+normalized statement is seen in a process its EXPLAIN QUERY PLAN is
+captured into the record as well. The file rotates by size; summarize()
+(`flask slow-queries`) ranks statements by total time across the file
+and its rotated copies.
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from flask import has_request_context, request
+
+# Distinct statements whose plan is remembered before the set starts over
+MAX_EXPLAINED = 2000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])\d+(?:\.\d+)?(?![\w.])')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+def normalize_sql(sql):
+    """Collapse whitespace and replace literals so equivalent statements match"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+def _shape(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f'blob({len(value)})'
+    if isinstance(value, str):
+        return f'text({len(value)})'
+    return type(value).__name__
+
+def parameter_shapes(parameters, many=False):
+    """Describe parameters by type and length, never by value"""
+    if many:
+        try:
+            count = len(parameters)
+        except TypeError:
+            count = None
+        first = parameters[0] if count else None
+        return {'rows': count, 'first': parameter_shapes(first) if first is not None else None}
+    if isinstance(parameters, dict):
+        return {key: _shape(value) for key, value in parameters.items()}
+    return [_shape(value) for value in parameters or ()]
+
+class SlowQueryLog:
+    """Writes slow statements to a rotating JSON-lines file"""
+
+    def __init__(self):
+        self.path = None
+        self._logger = logging.getLogger('job_portal.slow_queries')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._handler = None
+        self._explained = set()
+        self._lock = threading.Lock()
+
+    def configure(self, path, max_bytes=10 * 1024 * 1024, backup_count=5):
+        """Log to path, keeping backup_count rotated files of max_bytes"""
+        with self._lock:
+            if self._handler is not None:
+                self._logger.removeHandler(self._handler)
+                self._handler.close()
+                self._handler = None
+            self.path = path
+            self._explained.clear()
+            if path:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                    delay=True)
+                self._handler.setFormatter(logging.Formatter('%(message)s'))
+                self._logger.addHandler(self._handler)
+
+    def record(self, conn, sql, parameters, many, seconds, rows):
+        """Log one slow statement; called by the instrumented cursor"""
+        if self._handler is None:
+            return
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        entry = {
+            'time': round(time.time(), 3),
+            'pid': os.getpid(),
+            'fingerprint': key,
+            'sql': normalized,
+            'params': parameter_shapes(parameters, many),
+            'duration_ms': round(seconds * 1000, 3),
+            'rows': rows,
+            'endpoint': request.endpoint if has_request_context() else None,
+        }
+        with self._lock:
+            first = key not in self._explained
+            if first:
+                if len(self._explained) >= MAX_EXPLAINED:
+                    self._explained.clear()
+                self._explained.add(key)
+        if first:
+            entry['plan'] = self._explain(conn, sql, parameters, many)
+        self._logger.info(json.dumps(entry))
+
+    def _explain(self, conn, sql, parameters, many):
+        if many:
+            try:
+                parameters = parameters[0]
+            except (TypeError, IndexError, KeyError):
+                return None
+        try:
+            # The base class method bypasses the instrumented cursor, so the
+            # EXPLAIN is neither counted nor reported as slow itself
+            rows = sqlite3.Connection.execute(conn, f'EXPLAIN QUERY PLAN {sql}', parameters or ()).fetchall()
+        except (sqlite3.Error, ValueError):
+            return None
+        return [row[3] for row in rows]
+
+def log_files(path):
+    """The log and its rotated copies, oldest first"""
+    rotated = sorted(glob.glob(f'{glob.escape(path)}.[0-9]*'),
+                     key=lambda name: int(name.rsplit('.', 1)[1]), reverse=True)
+    return rotated + ([path] if os.path.exists(path) else [])
+
+def summarize(path, top=10):
+    """Aggregate the log by statement; return the top entries by total time"""
+    statements = {}
+    for filename in log_files(path):
+        with open(filename) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                stats = statements.get(entry['fingerprint'])
+                if stats is None:
+                    stats = statements[entry['fingerprint']] = {
+                        'fingerprint': entry['fingerprint'],
+                        'sql': entry['sql'],
+                        'count': 0,
+                        'total_ms': 0.0,
+                        'max_ms': 0.0,
+                        'max_rows': None,
+                        'endpoints': {},
+                        'plan': None,
+                        'last_seen': 0,
+                    }
+                stats['count'] += 1
+                stats['total_ms'] += entry['duration_ms']
+                stats['max_ms'] = max(stats['max_ms'], entry['duration_ms'])
+                if entry.get('rows') is not None:
+                    stats['max_rows'] = max(stats['max_rows'] or 0, entry['rows'])
+                endpoint = entry.get('endpoint') or '-'
+                stats['endpoints'][endpoint] = stats['endpoints'].get(endpoint, 0) + 1
+                if entry.get('plan') is not None:
+                    stats['plan'] = entry['plan']
+                stats['last_seen'] = max(stats['last_seen'], entry['time'])
+
+    ranked = sorted(statements.values(), key=lambda stats: stats['total_ms'], reverse=True)[:top]
+    for stats in ranked:
+        stats['total_ms'] = round(stats['total_ms'], 3)
+        stats['mean_ms'] = round(stats['total_ms'] / stats['count'], 3)
+    return ranked
+
+slow_query_log = SlowQueryLog()
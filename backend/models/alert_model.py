@@ -0,0 +1,103 @@
+from database.db import execute_query, get_db, write, write_transaction
+
+class JobAlert:
+    @staticmethod
+    def create_alert(student_id, keywords=None, location=None, salary_min=None, job_type=None):
+        """Create job alert"""
+        query = """
+        INSERT INTO job_alerts (student_id, keywords, location, salary_min, job_type)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        return execute_query(query, (student_id, keywords, location, salary_min, job_type))
+    
+    @staticmethod
+    def get_alert(alert_id, student_id):
+        """Get one alert owned by a student"""
+        query = "SELECT * FROM job_alerts WHERE id = ? AND student_id = ?"
+        with get_db() as conn:
+            row = conn.execute(query, (alert_id, student_id)).fetchone()
+            return dict(row) if row else None
+    
+    @staticmethod
+    def get_alerts_by_student(student_id):
+        """Get all alerts of a student"""
+        query = "SELECT * FROM job_alerts WHERE student_id = ? ORDER BY created_at DESC"
+        with get_db() as conn:
+            return [dict(row) for row in conn.execute(query, (student_id,))]
+    
+    @staticmethod
+    def update_alert(alert_id, student_id, **kwargs):
+        """Update alert fields; returns False when nothing was updated"""
+        fields = []
+        values = []
+        
+        for field, value in kwargs.items():
+            fields.append(f"{field} = ?")
+            values.append(value)
+        
+        if not fields:
+            return False
+        
+        values.extend([alert_id, student_id])
+        query = f"UPDATE job_alerts SET {', '.join(fields)} WHERE id = ? AND student_id = ?"
+        return write(query, values).rowcount > 0
+    
+    @staticmethod
+    def delete_alert(alert_id, student_id):
+        """Delete alert and its matches"""
+        def delete(conn):
+            cursor = conn.execute(
+                "DELETE FROM job_alerts WHERE id = ? AND student_id = ?", (alert_id, student_id)
+            )
+            if cursor.rowcount:
+                conn.execute("DELETE FROM alert_matches WHERE alert_id = ?", (alert_id,))
+            return cursor.rowcount > 0
+        
+        return write_transaction(delete)
+    
+    @staticmethod
+    def iter_active_alerts():
+        """Yield every active alert, streaming in batches"""
+        query = """
+        SELECT id, student_id, keywords, location, salary_min, job_type
+        FROM job_alerts WHERE is_active = 1
+        """
+        with get_db() as conn:
+            cursor = conn.execute(query)
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+    
+    @staticmethod
+    def save_matches(matches):
+        """Store (alert_id, job_id, student_id) matches, ignoring duplicates"""
+        query = "INSERT OR IGNORE INTO alert_matches (alert_id, job_id, student_id) VALUES (?, ?, ?)"
+        def insert(conn):
+            conn.executemany(query, matches)
+        
+        write_transaction(insert)
+    
+    @staticmethod
+    def get_digest(student_id, before_id=None, limit=50):
+        """Get matched jobs for a student, newest first"""
+        query = """
+        SELECT m.id AS match_id, m.alert_id, m.matched_at,
+               j.id, j.title, j.location, j.salary, j.work_mode, j.job_type, j.posted_at,
+               rp.company_name
+        FROM alert_matches m
+        JOIN jobs j ON m.job_id = j.id
+        JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id
+        WHERE m.student_id = ? AND j.is_active = 1
+        """
+        params = [student_id]
+        if before_id:
+            query += " AND m.id < ?"
+            params.append(before_id)
+        query += " ORDER BY m.id DESC LIMIT ?"
+        params.append(limit)
+        
+        with get_db() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
@@ -1,14 +1,27 @@
-from database.db import execute_query, get_db
+import json
+from database.db import get_db, write, write_transaction
+
+# Column order of applicant exports, matching iter_applications_by_job
+EXPORT_COLUMNS = ['application_id', 'applied_at', 'status', 'name', 'email', 'phone',
+                  'education', 'skills', 'cv_filename', 'cover_letter']
 
 class Application:
     @staticmethod
     def create_application(job_id, student_id, cover_letter=None):
-        """Create job application"""
+        """Create job application.
+
+        The job must be active and the student must not have applied yet;
+        both are checked by the INSERT itself. Returns the new id, or None
+        when either check failed.
+        """
         query = """
         INSERT INTO applications (job_id, student_id, cover_letter)
-        VALUES (?, ?, ?)
+        SELECT id, ?, ? FROM jobs WHERE id = ? AND is_active = 1
+        ON CONFLICT (job_id, student_id) DO NOTHING
+        RETURNING id
         """
-        return execute_query(query, (job_id, student_id, cover_letter))
+        rows = write(query, (student_id, cover_letter, job_id)).rows
+        return rows[0][0] if rows else None
     
     @staticmethod
     def get_applications_by_job(job_id):
@@ -26,6 +39,110 @@ class Application:
             cursor.execute(query, (job_id,))
             return [dict(row) for row in cursor.fetchall()]
     
+    @staticmethod
+    def get_applications_page(job_id, status=None, after=None, limit=50):
+        """Get one newest-first page of a job's applicants.
+
+        after is the (applied_at, id) of the last row of the previous page.
+        """
+        conditions = ["a.job_id = ?"]
+        params = [job_id]
+        if status:
+            conditions.append("a.status = ?")
+            params.append(status)
+        if after:
+            conditions.append("(a.applied_at, a.id) < (?, ?)")
+            params.extend(after)
+        
+        # The page's ids come from the (job_id, [status,] applied_at) index
+        # alone; full rows are joined for that page only
+        query = f"""
+        SELECT a.*, sp.name, sp.phone, sp.education, sp.skills, sp.expected_salary, sp.cv_filename, u.email
+        FROM (
+            SELECT a.id
+            FROM applications a
+            WHERE {' AND '.join(conditions)}
+            ORDER BY a.applied_at DESC, a.id DESC
+            LIMIT ?
+        ) page
+        JOIN applications a ON a.id = page.id
+        JOIN student_profiles sp ON a.student_id = sp.user_id
+        JOIN users u ON a.student_id = u.id
+        ORDER BY a.applied_at DESC, a.id DESC
+        """
+        with get_db() as conn:
+            return [dict(row) for row in conn.execute(query, params + [limit])]
+    
+    @staticmethod
+    def get_status_counts(job_id):
+        """Get {status: count} for a job's applications"""
+        query = "SELECT status, COUNT(*) FROM applications WHERE job_id = ? GROUP BY status"
+        with get_db() as conn:
+            return {row[0]: row[1] for row in conn.execute(query, (job_id,))}
+    
+    @staticmethod
+    def iter_applicants_for_ranking(job_id, batch_size=500):
+        """Yield batches of every applicant of a job, with their skill ids, in one pass"""
+        query = """
+        SELECT a.*, sp.name, sp.phone, sp.education, sp.skills, sp.expected_salary, sp.cv_filename, u.email,
+               (SELECT group_concat(ss.skill_id) FROM student_skills ss
+                WHERE ss.student_id = a.student_id) AS skill_ids
+        FROM applications a
+        JOIN student_profiles sp ON a.student_id = sp.user_id
+        JOIN users u ON a.student_id = u.id
+        WHERE a.job_id = ?
+        """
+        with get_db() as conn:
+            cursor = conn.execute(query, (job_id,))
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+    
+    @staticmethod
+    def iter_applications_by_job(job_id, status=None, applied_from=None, applied_before=None,
+                                 batch_size=500):
+        """Yield lists of applicant rows for a job, newest first, without loading them all.
+
+        Rows come from one statement read with fetchmany, so the export
+        sees a single snapshot while holding at most batch_size rows.
+        """
+        conditions = ["a.job_id = ?"]
+        params = [job_id]
+        if status:
+            conditions.append("a.status = ?")
+            params.append(status)
+        if applied_from:
+            conditions.append("a.applied_at >= ?")
+            params.append(applied_from)
+        if applied_before:
+            conditions.append("a.applied_at < ?")
+            params.append(applied_before)
+        
+        query = f"""
+        SELECT a.id AS application_id, a.applied_at, a.status, sp.name, u.email, sp.phone,
+               sp.education, sp.skills, sp.cv_filename, a.cover_letter
+        FROM applications a
+        JOIN student_profiles sp ON a.student_id = sp.user_id
+        JOIN users u ON a.student_id = u.id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY a.applied_at DESC
+        """
+        with get_db() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+    
     @staticmethod
     def get_applications_by_student(student_id):
         """Get all applications by a student"""
@@ -42,6 +159,13 @@ class Application:
             cursor.execute(query, (student_id,))
             return [dict(row) for row in cursor.fetchall()]
     
+    @staticmethod
+    def get_applied_job_ids(student_id):
+        """Get ids of the jobs a student has applied to"""
+        query = "SELECT job_id FROM applications WHERE student_id = ?"
+        with get_db() as conn:
+            return [row[0] for row in conn.execute(query, (student_id,))]
+    
     @staticmethod
     def check_application_exists(job_id, student_id):
         """Check if student has already applied to job"""
@@ -52,7 +176,47 @@ class Application:
             return cursor.fetchone() is not None
     
     @staticmethod
-    def update_application_status(application_id, status):
-        """Update application status"""
-        query = "UPDATE applications SET status = ? WHERE id = ?"
-        execute_query(query, (status, application_id))
\ No newline at end of file
+    def update_statuses(recruiter_id, status, application_ids=None, job_id=None, from_status=None):
+        """Move a recruiter's applications to status in one transaction.
+
+        Targets either the given application ids or every application of
+        job_id (optionally only those currently in from_status). Ids that
+        are missing or belong to another recruiter's job are left alone.
+        Returns {'matched': owned targets, 'updated': rows whose status changed}.
+        """
+        if application_ids is not None:
+            target = """
+            FROM applications
+            WHERE id IN (SELECT value FROM json_each(?))
+              AND job_id IN (SELECT id FROM jobs WHERE recruiter_id = ?)
+            """
+            params = [json.dumps(application_ids), recruiter_id]
+        else:
+            target = """
+            FROM applications
+            WHERE job_id = (SELECT id FROM jobs WHERE id = ? AND recruiter_id = ?)
+            """
+            params = [job_id, recruiter_id]
+        if from_status:
+            target += " AND status = ?"
+            params.append(from_status)
+        
+        def update(conn):
+            matched = conn.execute(f"SELECT COUNT(*) {target}", params).fetchone()[0]
+            updated = conn.execute(
+                f"UPDATE applications SET status = ? WHERE id IN (SELECT id {target}) AND status != ?",
+                [status] + params + [status]
+            ).rowcount
+            return {'matched': matched, 'updated': updated}
+        
+        return write_transaction(update)
+    
+    @staticmethod
+    def update_application_status(application_id, status, recruiter_id):
+        """Update application status if it is on one of recruiter_id's jobs; returns False otherwise"""
+        query = """
+        UPDATE applications SET status = ?
+        WHERE id = ? AND job_id IN (SELECT id FROM jobs WHERE recruiter_id = ?)
+        RETURNING id
+        """
+        return bool(write(query, (status, application_id, recruiter_id)).rows)
\ No newline at end of file
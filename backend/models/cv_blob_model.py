@@ -0,0 +1,77 @@
+from database.db import get_db, write
+
+class CVBlob:
+    @staticmethod
+    def acquire(conn, sha256, path, size):
+        """Add a reference to a stored file, registering it on first use; the caller commits.
+
+        Returns the blob's stored path, which keeps the extension of its first upload.
+        """
+        return conn.execute("""
+        INSERT INTO cv_blobs (sha256, path, size, ref_count) VALUES (?, ?, ?, 1)
+        ON CONFLICT (sha256) DO UPDATE SET ref_count = ref_count + 1, orphaned_at = NULL
+        RETURNING path
+        """, (sha256, path, size)).fetchall()[0][0]
+    
+    @staticmethod
+    def release(conn, path):
+        """Drop a reference to a stored file; returns False if path is not a blob. The caller commits"""
+        cursor = conn.execute("""
+        UPDATE cv_blobs
+        SET ref_count = ref_count - 1,
+            orphaned_at = CASE WHEN ref_count <= 1 THEN CURRENT_TIMESTAMP ELSE orphaned_at END
+        WHERE path = ?
+        """, (path,))
+        return cursor.rowcount > 0
+    
+    @staticmethod
+    def collect_garbage(grace_seconds, delete_file):
+        """Delete blobs unreferenced for longer than grace_seconds and return the paths removed.
+
+        The rows are deleted and committed first; the files are removed
+        afterwards, outside the write transaction, through
+        delete_file(path, is_registered). An upload of the same content may
+        register the path again in between, so delete_file checks
+        CVBlob.is_registered and keeps the file in that case.
+        """
+        paths = [row[0] for row in write("""
+        DELETE FROM cv_blobs
+        WHERE ref_count <= 0 AND orphaned_at < datetime('now', ?)
+        RETURNING path
+        """, (f'-{int(grace_seconds)} seconds',)).rows]
+        return [path for path in paths if delete_file(path, CVBlob.is_registered)]
+    
+    @staticmethod
+    def is_registered(path):
+        """Check whether a committed blob row uses a stored path"""
+        with get_db() as conn:
+            return conn.execute("SELECT 1 FROM cv_blobs WHERE path = ?", (path,)).fetchone() is not None
+    
+    @staticmethod
+    def get_usage():
+        """Get blob count, bytes on disk and bytes referenced (before deduplication)"""
+        query = """
+        SELECT COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS stored_bytes,
+               COALESCE(SUM(size * MAX(ref_count, 0)), 0) AS referenced_bytes
+        FROM cv_blobs
+        """
+        with get_db() as conn:
+            return dict(conn.execute(query).fetchone())
+    
+    @staticmethod
+    def save_text(sha256, text):
+        """Store the text extracted from a blob; triggers reindex the profiles using it"""
+        query = "UPDATE cv_blobs SET text = ?, extracted_at = CURRENT_TIMESTAMP WHERE sha256 = ?"
+        write(query, (text, sha256))
+    
+    @staticmethod
+    def get_pending_extraction(limit=1000):
+        """Get [(sha256, path)] of referenced blobs whose text has not been extracted"""
+        query = """
+        SELECT sha256, path FROM cv_blobs
+        WHERE extracted_at IS NULL AND ref_count > 0
+        ORDER BY created_at
+        LIMIT ?
+        """
+        with get_db() as conn:
+            return [(row[0], row[1]) for row in conn.execute(query, (limit,))]
\ No newline at end of file
@@ -1,4 +1,117 @@
-from database.db import execute_query, get_db
+import base64
+import json
+import re
+from database.db import get_db, write, write_transaction
+from models.location_model import Location
+from models.skill_model import Skill, parse_skills
+from models.version_model import DataVersion
+from utils.ttl_cache import TTLCache
+
+# bm25() column weights for jobs_fts: title, description, skills_required, company_name
+SEARCH_RANK_WEIGHTS = (10.0, 1.0, 4.0, 2.0)
+
+# Search totals are exact up to this many matches, then estimated
+COUNT_EXACT_LIMIT = 10000
+COUNT_SAMPLE_SIZE = 5000
+COUNT_CACHE_TTL = 30  # seconds
+
+_count_cache = TTLCache(ttl=COUNT_CACHE_TTL, max_entries=1024)
+
+# job_changes entries are kept this long; an in-memory index that has not
+# replayed the log for longer finds a gap and reloads everything
+CHANGE_LOG_RETENTION_SECONDS = 24 * 3600
+
+_PHRASE_OR_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+def build_match_query(keyword):
+    """Translate a user keyword string into an FTS5 MATCH expression.
+
+    Quoted text becomes a phrase, a trailing * makes a prefix query and
+    every other word is matched as a literal term; all parts are ANDed.
+    Returns None when nothing searchable is left.
+    """
+    parts = []
+    for phrase, word in _PHRASE_OR_TERM.findall(keyword):
+        if phrase:
+            tokens = re.findall(r'\w+', phrase)
+            if tokens:
+                parts.append('"' + ' '.join(tokens) + '"')
+            continue
+
+        is_prefix = word.endswith('*')
+        tokens = re.findall(r'\w+', word)
+        for i, token in enumerate(tokens):
+            term = f'"{token}"'
+            if is_prefix and i == len(tokens) - 1:
+                term += '*'
+            parts.append(term)
+
+    return ' AND '.join(parts) if parts else None
+
+def encode_cursor(sort_by, order, key, job_id, direction):
+    """Encode a keyset position as an opaque URL-safe token"""
+    payload = json.dumps([sort_by, order, key, job_id, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token, sort_by, order):
+    """Decode a cursor token into (key, job_id, direction)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_sort, cursor_order, key, job_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    
+    if (cursor_sort, cursor_order) != (sort_by, order) or direction not in ('next', 'prev') \
+            or not isinstance(job_id, int):
+        raise ValueError('Cursor does not match the requested sort order')
+    return key, job_id, direction
+
+def _keyset_condition(sort_expr, key, last_id, descending, nullable=False):
+    """WHERE clause selecting rows after (key, last_id) in the given direction.
+
+    SQLite sorts NULLs first in ascending order, so a NULL sort key (only
+    possible for salary, hence nullable) needs its own branch. It is left
+    out otherwise: the OR turns the plan into a multi-index OR over the
+    joined tables.
+    """
+    op = '<' if descending else '>'
+    if key is None:
+        if descending:
+            return f"({sort_expr} IS NULL AND j.id < ?)", [last_id]
+        return f"({sort_expr} IS NOT NULL OR j.id > ?)", [last_id]
+    
+    condition = f"(({sort_expr}, j.id) {op} (?, ?)"
+    if descending and nullable:
+        condition += f" OR {sort_expr} IS NULL"
+    return condition + ")", [key, last_id]
+
+def _page_query(from_clause, conditions, sort_expr, order, limit_clause):
+    """SQL for one page of jobs: pick the page's ids, then join full rows for those only.
+
+    The id query reads only columns of the idx_jobs_listed_* indexes, so
+    skipped and filtered-out jobs never load their rows.
+    """
+    return f"""
+    SELECT j.*, rp.company_name, rp.company_description, page.sort_key
+    FROM (
+        SELECT j.id, {sort_expr} AS sort_key
+        FROM {from_clause}
+        WHERE {' AND '.join(conditions)}
+        ORDER BY sort_key {order}, j.id {order}
+        {limit_clause}
+    ) page
+    JOIN jobs j ON j.id = page.id
+    JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id
+    ORDER BY page.sort_key {order}, j.id {order}
+    """
+
+def _strip_sort_keys(jobs, sort_by):
+    """Drop the internal sort_key column, exposing it only as the relevance score"""
+    for job in jobs:
+        key = job.pop('sort_key')
+        if sort_by == 'relevance':
+            job['relevance'] = key
+    return jobs
 
 class Job:
     @staticmethod
@@ -7,11 +120,45 @@ class Job:
         """Create a new job posting"""
         query = """
         INSERT INTO jobs 
-        (recruiter_id, title, description, skills_required, location, salary, work_mode, job_type, deadline)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        (recruiter_id, title, description, skills_required, location, salary, work_mode, job_type, deadline,
+         location_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        def insert(conn):
+            job_id = conn.execute(query, (recruiter_id, title, description, skills_required,
+                                          location, salary, work_mode, job_type, deadline,
+                                          Location.resolve_id(conn, location))).lastrowid
+            Skill.tag_new_jobs(conn, [(job_id, skills_required)])
+            return job_id
+        
+        return write_transaction(insert)
+    
+    @staticmethod
+    def create_jobs(recruiter_id, rows):
+        """Insert many jobs in one transaction and return their ids in row order.
+
+        rows are (title, description, skills_required, location, salary,
+        work_mode, job_type, deadline) tuples.
+        """
+        query = """
+        INSERT INTO jobs 
+        (recruiter_id, title, description, skills_required, location, salary, work_mode, job_type, deadline,
+         location_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return execute_query(query, (recruiter_id, title, description, skills_required, 
-                                   location, salary, work_mode, job_type, deadline))
+        def insert(conn):
+            # The writer holds the write lock for the whole transaction, so
+            # every id above the current maximum belongs to this batch
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()[0]
+            location_ids = Location.resolve_ids(conn, [row[3] for row in rows])
+            conn.executemany(query, [(recruiter_id,) + tuple(row) + (location_ids[row[3]],) for row in rows])
+            job_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM jobs WHERE id > ? ORDER BY id", (last_id,)
+            )]
+            Skill.tag_new_jobs(conn, [(job_id, row[2]) for job_id, row in zip(job_ids, rows)])
+            return job_ids
+        
+        return write_transaction(insert)
     
     @staticmethod
     def get_job_by_id(job_id):
@@ -29,63 +176,257 @@ class Job:
             return dict(row) if row else None
     
     @staticmethod
-    def search_jobs(keyword=None, location=None, job_type=None, work_mode=None, 
-                   salary_min=None, skills=None, sort_by='posted_at', order='DESC', 
-                   page=1, per_page=20):
-        """Search jobs with filters"""
-        offset = (page - 1) * per_page
+    def _search_filters(keyword=None, location=None, job_type=None, work_mode=None,
+                        salary_min=None, skills=None, skills_match='all', location_ids=None):
+        """Build the FROM clause, WHERE conditions and params shared by search and count"""
+        match_query = build_match_query(keyword) if keyword else None
         
-        # Base query
-        query = """
-        SELECT j.*, rp.company_name, rp.company_description
-        FROM jobs j
-        JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id
-        WHERE j.is_active = 1
-        """
+        # Keyword searches are driven by the full-text index
+        from_clause = "jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid" if match_query else "jobs j"
+        from_clause += " JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id"
         
+        conditions = ["j.is_active = 1"]
         params = []
         
         # Add filters
-        if keyword:
-            query += " AND (j.title LIKE ? OR j.description LIKE ?)"
-            params.extend([f"%{keyword}%", f"%{keyword}%"])
+        if match_query:
+            conditions.append("jobs_fts MATCH ?")
+            params.append(match_query)
         
         if location:
-            query += " AND j.location LIKE ?"
-            params.append(f"%{location}%")
+            location_id = Location.get_id(location)
+            # A known place matches every spelling of it; anything else is a substring
+            if location_id is not None:
+                conditions.append("j.location_id = ?")
+                params.append(location_id)
+            else:
+                conditions.append("j.location LIKE ?")
+                params.append(f"%{location}%")
+        
+        if location_ids is not None:
+            # Places within a radius, from Location.within_radius()
+            if location_ids:
+                conditions.append(f"j.location_id IN ({', '.join('?' * len(location_ids))})")
+                params.extend(location_ids)
+            else:
+                conditions.append("0")
         
         if job_type:
-            query += " AND j.job_type = ?"
+            conditions.append("j.job_type = ?")
             params.append(job_type)
         
         if work_mode:
-            query += " AND j.work_mode = ?"
+            conditions.append("j.work_mode = ?")
             params.append(work_mode)
         
         if salary_min:
-            query += " AND j.salary >= ?"
+            conditions.append("j.salary >= ?")
             params.append(salary_min)
         
         if skills:
-            query += " AND j.skills_required LIKE ?"
-            params.append(f"%{skills}%")
+            condition, skill_params = Job._skills_condition(skills, skills_match)
+            conditions.append(condition)
+            params.extend(skill_params)
         
-        # Add sorting
-        valid_sort_fields = ['posted_at', 'salary', 'title']
+        return from_clause, conditions, params, match_query
+    
+    @staticmethod
+    def _skills_condition(skills, skills_match):
+        """Filter through the job_skills index: every skill ('all') or at least one ('any')"""
+        names = parse_skills(skills)
+        with get_db() as conn:
+            known = Skill.lookup_ids(conn, names)
+        skill_ids = list(dict.fromkeys(known.values()))
+        
+        if not skill_ids or (skills_match != 'any' and len(known) < len(names)):
+            # A skill nobody has tagged cannot match
+            return "0", []
+        
+        placeholders = ', '.join('?' * len(skill_ids))
+        if skills_match == 'any':
+            return f"j.id IN (SELECT job_id FROM job_skills WHERE skill_id IN ({placeholders}))", skill_ids
+        return (
+            f"j.id IN (SELECT job_id FROM job_skills WHERE skill_id IN ({placeholders}) "
+            f"GROUP BY job_id HAVING COUNT(*) = ?)",
+            skill_ids + [len(skill_ids)]
+        )
+    
+    @staticmethod
+    def _search_order(sort_by, order, match_query):
+        """Validate sorting and return (sort_by, order, sort expression)"""
+        valid_sort_fields = ['posted_at', 'salary', 'title', 'relevance']
         if sort_by not in valid_sort_fields:
             sort_by = 'posted_at'
+        if sort_by == 'relevance' and not match_query:
+            sort_by = 'posted_at'
         
-        if order.upper() not in ['ASC', 'DESC']:
+        order = order.upper()
+        if order not in ['ASC', 'DESC']:
             order = 'DESC'
         
-        query += f" ORDER BY j.{sort_by} {order}"
-        query += " LIMIT ? OFFSET ?"
+        if sort_by == 'relevance':
+            # bm25() is lower for better matches, so best results come first
+            weights = ', '.join(str(w) for w in SEARCH_RANK_WEIGHTS)
+            return sort_by, 'ASC', f"bm25(jobs_fts, {weights})"
+        return sort_by, order, f"j.{sort_by}"
+    
+    @staticmethod
+    def search_jobs(keyword=None, location=None, job_type=None, work_mode=None, 
+                   salary_min=None, skills=None, skills_match='all', sort_by='posted_at',
+                   order='DESC', page=1, per_page=20, location_ids=None):
+        """Search jobs with filters"""
+        offset = (page - 1) * per_page
+        from_clause, conditions, params, match_query = Job._search_filters(
+            keyword, location, job_type, work_mode, salary_min, skills, skills_match, location_ids
+        )
+        sort_by, order, sort_expr = Job._search_order(sort_by, order, match_query)
+        
+        query = _page_query(from_clause, conditions, sort_expr, order, "LIMIT ? OFFSET ?")
         params.extend([per_page, offset])
         
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            jobs = [dict(row) for row in cursor.fetchall()]
+        
+        next_cursor = None
+        if len(jobs) == per_page:
+            next_cursor = encode_cursor(sort_by, order, jobs[-1]['sort_key'], jobs[-1]['id'], 'next')
+        return _strip_sort_keys(jobs, sort_by), next_cursor
+    
+    @staticmethod
+    def search_jobs_after(cursor, keyword=None, location=None, job_type=None, work_mode=None,
+                          salary_min=None, skills=None, skills_match='all', sort_by='posted_at',
+                          order='DESC', per_page=20, location_ids=None):
+        """Keyset-paginated search continuing from an opaque cursor.
+
+        Rows are ordered by (sort column, id) and the cursor carries the
+        last seen pair, so every page costs the same regardless of depth.
+        Returns (jobs, next_cursor, prev_cursor). Raises ValueError for a
+        malformed cursor or one issued for a different ordering.
+        """
+        from_clause, conditions, params, match_query = Job._search_filters(
+            keyword, location, job_type, work_mode, salary_min, skills, skills_match, location_ids
+        )
+        sort_by, order, sort_expr = Job._search_order(sort_by, order, match_query)
+        
+        direction = 'next'
+        if cursor:
+            key, last_id, direction = decode_cursor(cursor, sort_by, order)
+            # Walking backwards flips the comparison and the ordering
+            forward = (order == 'DESC') == (direction == 'next')
+            condition, cursor_params = _keyset_condition(sort_expr, key, last_id, descending=forward,
+                                                          nullable=sort_by == 'salary')
+            conditions.append(condition)
+            params.extend(cursor_params)
+        
+        scan_order = order
+        if direction == 'prev':
+            scan_order = 'ASC' if order == 'DESC' else 'DESC'
+        
+        query = _page_query(from_clause, conditions, sort_expr, scan_order, "LIMIT ?")
+        params.append(per_page + 1)
+        
+        with get_db() as conn:
+            cursor_obj = conn.cursor()
+            cursor_obj.execute(query, params)
+            jobs = [dict(row) for row in cursor_obj.fetchall()]
+        
+        has_more = len(jobs) > per_page
+        jobs = jobs[:per_page]
+        if direction == 'prev':
+            jobs.reverse()
+        
+        next_cursor = prev_cursor = None
+        if jobs:
+            first, last = jobs[0], jobs[-1]
+            if direction == 'next' and has_more or direction == 'prev' and cursor:
+                next_cursor = encode_cursor(sort_by, order, last['sort_key'], last['id'], 'next')
+            if direction == 'next' and cursor or direction == 'prev' and has_more:
+                prev_cursor = encode_cursor(sort_by, order, first['sort_key'], first['id'], 'prev')
+        
+        return _strip_sort_keys(jobs, sort_by), next_cursor, prev_cursor
+    
+    @staticmethod
+    def count_jobs(keyword=None, location=None, job_type=None, work_mode=None,
+                   salary_min=None, skills=None, skills_match='all', location_ids=None):
+        """Count jobs matching the filters.
+
+        Counts are exact up to COUNT_EXACT_LIMIT; beyond that the bounded
+        count stops early and the total is estimated from the newest
+        postings. Results are cached per normalized filter set for
+        COUNT_CACHE_TTL seconds, or until the jobs data version changes.
+        Returns (total, is_approximate).
+        """
+        from_clause, conditions, params, match_query = Job._search_filters(
+            keyword, location, job_type, work_mode, salary_min, skills, skills_match, location_ids
+        )
+        # A job write from any process bumps the version and so skips stale totals
+        cache_key = (
+            DataVersion.current(['jobs']),
+            match_query,
+            location.strip().lower() if location else None,
+            job_type or None,
+            work_mode or None,
+            salary_min or None,
+            tuple(parse_skills(skills)),
+            skills_match if skills else None,
+            tuple(location_ids) if location_ids is not None else None,
+        )
+        cached = _count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        where = ' AND '.join(conditions)
+        with get_db() as conn:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM {from_clause} WHERE {where} LIMIT ?)",
+                params + [COUNT_EXACT_LIMIT + 1]
+            ).fetchone()[0]
+            approximate = total > COUNT_EXACT_LIMIT
+            
+            if approximate:
+                # Scale the match rate of the newest postings up to the whole table
+                max_id = conn.execute("SELECT MAX(id) FROM jobs").fetchone()[0] or 0
+                floor_id = max(max_id - COUNT_SAMPLE_SIZE, 0)
+                sample_rows = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE id > ?", (floor_id,)
+                ).fetchone()[0]
+                sample_matches = conn.execute(
+                    f"SELECT COUNT(*) FROM {from_clause} WHERE {where} AND j.id > ?",
+                    params + [floor_id]
+                ).fetchone()[0]
+                estimate = int(sample_matches / sample_rows * max_id) if sample_rows else 0
+                total = max(estimate, COUNT_EXACT_LIMIT + 1)
+        
+        result = (total, approximate)
+        _count_cache.set(cache_key, result)
+        return result
+    
+    @staticmethod
+    def rebuild_search_index():
+        """Rebuild the full-text index from the jobs table"""
+        def rebuild(conn):
+            conn.execute("DELETE FROM jobs_fts")
+            conn.execute("""
+            INSERT INTO jobs_fts (rowid, title, description, skills_required, company_name)
+            SELECT j.id, j.title, j.description, j.skills_required, rp.company_name
+            FROM jobs j
+            LEFT JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id
+            WHERE j.is_active = 1
+            """)
+            count = conn.execute("SELECT COUNT(*) FROM jobs_fts").fetchone()[0]
+            conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+            return count
+        
+        return write_transaction(rebuild)
+    
+    @staticmethod
+    def get_skill_ids(job_id):
+        """Get the normalized skill ids a job is tagged with"""
+        query = "SELECT skill_id FROM job_skills WHERE job_id = ?"
+        with get_db() as conn:
+            return [row[0] for row in conn.execute(query, (job_id,))]
     
     @staticmethod
     def get_jobs_by_recruiter(recruiter_id):
@@ -104,8 +445,12 @@ class Job:
             return [dict(row) for row in cursor.fetchall()]
     
     @staticmethod
-    def update_job(job_id, **kwargs):
-        """Update job posting"""
+    def update_job(job_id, recruiter_id, **kwargs):
+        """Update an active job posting owned by recruiter_id.
+
+        Ownership is part of the UPDATE, so no prior lookup is needed.
+        Returns False when nothing matched.
+        """
         fields = []
         values = []
         
@@ -117,13 +462,123 @@ class Job:
         if not fields:
             return False
         
-        values.append(job_id)
-        query = f"UPDATE jobs SET {', '.join(fields)} WHERE id = ?"
-        execute_query(query, values)
-        return True
+        def update(conn):
+            assignments, params = list(fields), list(values)
+            if kwargs.get('location') is not None:
+                assignments.append("location_id = ?")
+                params.append(Location.resolve_id(conn, kwargs['location']))
+            query = f"""
+            UPDATE jobs SET {', '.join(assignments)}
+            WHERE id = ? AND recruiter_id = ? AND is_active = 1
+            RETURNING id
+            """
+            updated = bool(conn.execute(query, params + [job_id, recruiter_id]).fetchall())
+            if updated and kwargs.get('skills_required') is not None:
+                Skill.set_job_skills(conn, job_id, kwargs['skills_required'])
+            return updated
+        
+        return write_transaction(update)
+    
+    @staticmethod
+    def get_changes_since(seq, limit=10000):
+        """Return (job_ids, last_seq, gap) for job writes logged after seq.
+
+        gap is True when log entries after seq were pruned, meaning the
+        caller must reload everything instead of replaying.
+        """
+        with get_db() as conn:
+            oldest = conn.execute("SELECT MIN(seq) FROM job_changes").fetchone()[0]
+            if oldest is not None and oldest > seq + 1:
+                return [], seq, True
+            rows = conn.execute(
+                "SELECT seq, job_id FROM job_changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit)
+            ).fetchall()
+        if not rows:
+            return [], seq, False
+        return list(dict.fromkeys(row[1] for row in rows)), rows[-1][0], False
+    
+    @staticmethod
+    def prune_changes(retention_seconds=CHANGE_LOG_RETENTION_SECONDS):
+        """Delete job_changes entries older than the retention window and return how many.
+
+        The newest entry is always kept, so a reader whose position was
+        pruned away still sees a gap rather than an empty log.
+        """
+        query = """
+        DELETE FROM job_changes
+        WHERE seq < COALESCE(
+            (SELECT seq FROM job_changes WHERE changed_at >= datetime('now', ?) ORDER BY seq LIMIT 1),
+            (SELECT MAX(seq) FROM job_changes)
+        )
+        """
+        return write(query, (f'-{int(retention_seconds)} seconds',)).rowcount
+    
+    @staticmethod
+    def get_last_change_seq():
+        """Return the newest job_changes sequence number"""
+        with get_db() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM job_changes").fetchone()[0]
+    
+    @staticmethod
+    def get_jobs_for_index(job_ids=None):
+        """Yield compact job rows for in-memory indexes.
+
+        Rows carry id, is_active, salary, location, location_id, job_type,
+        work_mode, posted_at as epoch seconds and a comma-separated list of
+        skill ids, in posting order. All jobs are returned when job_ids is None.
+        """
+        query = """
+        SELECT j.id, j.is_active, j.salary, j.location, j.location_id, j.job_type, j.work_mode,
+               CAST(strftime('%s', j.posted_at) AS INTEGER) AS posted_ts,
+               (SELECT GROUP_CONCAT(skill_id) FROM job_skills WHERE job_id = j.id) AS skill_ids
+        FROM jobs j
+        """
+        params = []
+        if job_ids is not None:
+            query += f" WHERE j.id IN ({', '.join('?' * len(job_ids))})"
+            params = list(job_ids)
+        query += " ORDER BY j.posted_at, j.id"
+        
+        with get_db() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+    
+    @staticmethod
+    def get_jobs_for_matching(job_ids):
+        """Get the fields alert matching needs for active jobs"""
+        if not job_ids:
+            return []
+        query = f"""
+        SELECT id, title, description, skills_required, location, location_id, salary, job_type
+        FROM jobs
+        WHERE id IN ({', '.join('?' * len(job_ids))}) AND is_active = 1
+        """
+        with get_db() as conn:
+            return [dict(row) for row in conn.execute(query, list(job_ids))]
+    
+    @staticmethod
+    def get_jobs_by_ids(job_ids):
+        """Get active jobs with recruiter info, in the order of job_ids"""
+        if not job_ids:
+            return []
+        query = f"""
+        SELECT j.*, rp.company_name, rp.company_description
+        FROM jobs j
+        JOIN recruiter_profiles rp ON j.recruiter_id = rp.user_id
+        WHERE j.id IN ({', '.join('?' * len(job_ids))}) AND j.is_active = 1
+        """
+        with get_db() as conn:
+            rows = {row['id']: dict(row) for row in conn.execute(query, list(job_ids))}
+        return [rows[job_id] for job_id in job_ids if job_id in rows]
     
     @staticmethod
     def delete_job(job_id, recruiter_id):
-        """Delete job (soft delete by setting is_active to 0)"""
-        query = "UPDATE jobs SET is_active = 0 WHERE id = ? AND recruiter_id = ?"
-        execute_query(query, (job_id, recruiter_id))
\ No newline at end of file
+        """Delete job (soft delete by setting is_active to 0); returns False when nothing matched"""
+        query = "UPDATE jobs SET is_active = 0 WHERE id = ? AND recruiter_id = ? AND is_active = 1 RETURNING id"
+        return bool(write(query, (job_id, recruiter_id)).rows)
\ No newline at end of file
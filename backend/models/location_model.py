@@ -0,0 +1,160 @@
+import math
+import re
+from database.db import get_db, backfill_batches
+from utils.text import normalize_token
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+
+# "Bangalore, Karnataka", "Pune / Remote", "Remote - Chennai (Hybrid)"
+_PARTS = re.compile(r'[,/|;()]+|\s+-\s+')
+_COORDINATES = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+def place_candidates(text):
+    """Names to try for a free-text location: the whole text, then each part in order"""
+    if not text:
+        return []
+    candidates = []
+    for part in [text] + _PARTS.split(text):
+        name = normalize_token(part)
+        if name and name not in candidates:
+            candidates.append(name)
+    return candidates
+
+def parse_coordinates(text):
+    """Return (latitude, longitude) for a "lat,lon" string, or None"""
+    match = _COORDINATES.match(text or '')
+    if not match:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_boxes(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lon, max_lon) boxes covering a circle, split at the antimeridian"""
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - math.degrees(angle)
+    max_lat = latitude + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle contains a pole, so it spans every longitude
+        return [(max(min_lat, -90), min(max_lat, 90), -180, 180)]
+
+    spread = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude)))))
+    min_lon, max_lon = longitude - spread, longitude + spread
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180), (min_lat, max_lat, -180, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180), (min_lat, max_lat, -180, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+def _locate_rows(conn, table, key, rows):
+    ids = Location.resolve_ids(conn, [text for _, text in rows])
+    # Unchanged rows are skipped so their triggers (change log, versions) stay quiet
+    conn.executemany(f"UPDATE {table} SET location_id = ? WHERE {key} = ? AND location_id IS NOT ?",
+                     [(ids[text], owner_id, ids[text]) for owner_id, text in rows])
+
+class Location:
+    @staticmethod
+    def lookup_ids(conn, names):
+        """Map normalized names to location ids through the alias table, skipping unknown names"""
+        if not names:
+            return {}
+        placeholders = ', '.join('?' * len(names))
+        query = f"SELECT alias, location_id FROM location_aliases WHERE alias IN ({placeholders})"
+        return {row[0]: row[1] for row in conn.execute(query, list(names))}
+
+    @staticmethod
+    def resolve_ids(conn, texts):
+        """Map free-text locations to location ids, or None when no part is a known place.
+
+        All candidate names are looked up in one query.
+        """
+        candidates = {text: place_candidates(text) for text in set(texts)}
+        known = Location.lookup_ids(conn, list(dict.fromkeys(
+            name for names in candidates.values() for name in names
+        )))
+        return {text: next((known[name] for name in names if name in known), None)
+                for text, names in candidates.items()}
+
+    @staticmethod
+    def resolve_id(conn, text):
+        """Return the location id for a free-text location, or None"""
+        return Location.resolve_ids(conn, [text])[text] if text else None
+
+    @staticmethod
+    def get_id(text):
+        """Return the location id a free-text location resolves to, or None"""
+        if not text:
+            return None
+        with get_db() as conn:
+            return Location.resolve_id(conn, text)
+
+    @staticmethod
+    def get_ids(texts, batch_size=500):
+        """Map free-text locations to location ids, or None when unknown, one lookup per batch"""
+        texts = list(dict.fromkeys(text for text in texts if text))
+        ids = {}
+        with get_db() as conn:
+            for start in range(0, len(texts), batch_size):
+                ids.update(Location.resolve_ids(conn, texts[start:start + batch_size]))
+        return ids
+
+    @staticmethod
+    def find(text):
+        """Get the gazetteer entry a free-text location resolves to, or None"""
+        with get_db() as conn:
+            location_id = Location.resolve_id(conn, text)
+            if location_id is None:
+                return None
+            row = conn.execute("SELECT * FROM locations WHERE id = ?", (location_id,)).fetchone()
+            return dict(row) if row else None
+
+    @staticmethod
+    def within_radius(latitude, longitude, radius_km):
+        """Return {location_id: distance_km} for places within radius_km of a point.
+
+        The R*Tree narrows the gazetteer to the circle's bounding box; the
+        exact haversine distance decides.
+        """
+        query = """
+        SELECT l.id, l.latitude, l.longitude
+        FROM location_index r
+        JOIN locations l ON l.id = r.id
+        WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?
+        """
+        distances = {}
+        with get_db() as conn:
+            for min_lat, max_lat, min_lon, max_lon in bounding_boxes(latitude, longitude, radius_km):
+                for location_id, lat, lon in conn.execute(query, (min_lat, max_lat, min_lon, max_lon)):
+                    distance = haversine_km(latitude, longitude, lat, lon)
+                    if distance <= radius_km:
+                        distances[location_id] = distance
+        return distances
+
+    @staticmethod
+    def backfill(batch_size=500):
+        """Resolve the locations of existing jobs and student profiles in batches.
+
+        Returns (jobs_located, students_located), counting rows with a match.
+        """
+        totals = []
+        sources = [
+            ("SELECT id, location FROM jobs WHERE id > ? ORDER BY id LIMIT ?", 'jobs', 'id'),
+            ("SELECT user_id, location FROM student_profiles WHERE user_id > ? ORDER BY user_id LIMIT ?",
+             'student_profiles', 'user_id'),
+        ]
+        for query, table, key in sources:
+            backfill_batches(query, _locate_rows, table, key, batch_size=batch_size)
+            with get_db() as conn:
+                totals.append(conn.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE location_id IS NOT NULL"
+                ).fetchone()[0])
+        return tuple(totals)
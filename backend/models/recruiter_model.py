@@ -1,4 +1,4 @@
-from database.db import execute_query, get_db
+from database.db import execute_query, get_db, write
 
 class RecruiterProfile:
     @staticmethod
@@ -25,7 +25,7 @@ class RecruiterProfile:
     
     @staticmethod
     def update_profile(user_id, **kwargs):
-        """Update recruiter profile"""
+        """Update recruiter profile and return the updated row, or None"""
         fields = []
         values = []
         
@@ -35,11 +35,11 @@ class RecruiterProfile:
                 values.append(value)
         
         if not fields:
-            return False
+            return None
         
         fields.append("updated_at = CURRENT_TIMESTAMP")
         values.append(user_id)
         
-        query = f"UPDATE recruiter_profiles SET {', '.join(fields)} WHERE user_id = ?"
-        execute_query(query, values)
-        return True
\ No newline at end of file
+        query = f"UPDATE recruiter_profiles SET {', '.join(fields)} WHERE user_id = ? RETURNING *"
+        rows = write(query, values).rows
+        return dict(rows[0]) if rows else None
\ No newline at end of file
@@ -0,0 +1,123 @@
+import re
+from database.db import backfill_batches
+from utils.text import normalize_token
+
+_SEPARATORS = re.compile(r'[,;|\n•]+')
+
+def parse_skills(text):
+    """Split a free-text skills string into unique normalized names, in order"""
+    if not text:
+        return []
+    names = []
+    for part in _SEPARATORS.split(text):
+        name = normalize_token(part)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def _tag_rows(conn, tag, rows):
+    for owner_id, text in rows:
+        tag(conn, owner_id, text)
+
+def _job_skill_sets(conn, job_ids):
+    placeholders = ', '.join('?' * len(job_ids))
+    skill_sets = {}
+    for job_id, skill_id in conn.execute(
+            f"SELECT job_id, skill_id FROM job_skills WHERE job_id IN ({placeholders})", job_ids):
+        skill_sets.setdefault(job_id, set()).add(skill_id)
+    return skill_sets
+
+def _tag_job_rows(conn, tag, rows):
+    # Retagging leaves the jobs rows untouched, so log the jobs whose tags
+    # changed for the in-memory indexes to replay
+    job_ids = [job_id for job_id, _ in rows]
+    before = _job_skill_sets(conn, job_ids)
+    _tag_rows(conn, tag, rows)
+    after = _job_skill_sets(conn, job_ids)
+    conn.executemany("INSERT INTO job_changes (job_id) VALUES (?)",
+                     [(job_id,) for job_id in job_ids if before.get(job_id) != after.get(job_id)])
+
+class Skill:
+    @staticmethod
+    def lookup_ids(conn, names):
+        """Map normalized names to skill ids through aliases, skipping unknown names"""
+        if not names:
+            return {}
+        placeholders = ', '.join('?' * len(names))
+        query = f"""
+        SELECT alias AS name, skill_id FROM skill_aliases WHERE alias IN ({placeholders})
+        UNION ALL
+        SELECT name, id FROM skills WHERE name IN ({placeholders})
+        """
+        ids = {}
+        for row in conn.execute(query, list(names) + list(names)):
+            # Aliases come first and win over a same-named skill row
+            ids.setdefault(row[0], row[1])
+        return ids
+
+    @staticmethod
+    def resolve_map(conn, names):
+        """Map names to skill ids, creating dictionary entries for new skills"""
+        ids = Skill.lookup_ids(conn, names)
+        missing = [name for name in names if name not in ids]
+        if missing:
+            conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(n,) for n in missing])
+            ids.update(Skill.lookup_ids(conn, missing))
+        return ids
+
+    @staticmethod
+    def resolve_ids(conn, names):
+        """Return unique skill ids for names, creating dictionary entries for new skills"""
+        ids = Skill.resolve_map(conn, names)
+        return list(dict.fromkeys(ids[name] for name in names))
+
+    @staticmethod
+    def set_job_skills(conn, job_id, skills_text):
+        """Replace a job's skill tags; the caller commits"""
+        skill_ids = Skill.resolve_ids(conn, parse_skills(skills_text))
+        conn.execute("DELETE FROM job_skills WHERE job_id = ?", (job_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_skills (skill_id, job_id) VALUES (?, ?)",
+            [(skill_id, job_id) for skill_id in skill_ids]
+        )
+
+    @staticmethod
+    def tag_new_jobs(conn, jobs):
+        """Tag freshly inserted jobs from [(job_id, skills_text)]; the caller commits.
+
+        Names are resolved once for the whole batch instead of per job.
+        """
+        parsed = [(job_id, parse_skills(text)) for job_id, text in jobs]
+        names = list(dict.fromkeys(name for _, job_names in parsed for name in job_names))
+        if not names:
+            return
+        ids = Skill.resolve_map(conn, names)
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_skills (skill_id, job_id) VALUES (?, ?)",
+            [(ids[name], job_id) for job_id, job_names in parsed for name in job_names]
+        )
+
+    @staticmethod
+    def set_student_skills(conn, student_id, skills_text):
+        """Replace a student's skill tags; the caller commits"""
+        skill_ids = Skill.resolve_ids(conn, parse_skills(skills_text))
+        conn.execute("DELETE FROM student_skills WHERE student_id = ?", (student_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO student_skills (skill_id, student_id) VALUES (?, ?)",
+            [(skill_id, student_id) for skill_id in skill_ids]
+        )
+
+    @staticmethod
+    def backfill(batch_size=500):
+        """Tokenize skills of existing jobs and student profiles in batches.
+
+        Returns (jobs_tagged, students_tagged).
+        """
+        sources = [
+            ("SELECT id, skills_required FROM jobs WHERE id > ? ORDER BY id LIMIT ?",
+             _tag_job_rows, Skill.set_job_skills),
+            ("SELECT user_id, skills FROM student_profiles WHERE user_id > ? ORDER BY user_id LIMIT ?",
+             _tag_rows, Skill.set_student_skills),
+        ]
+        return tuple(backfill_batches(query, tag_rows, tag, batch_size=batch_size)
+                     for query, tag_rows, tag in sources)
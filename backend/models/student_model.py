@@ -1,4 +1,11 @@
-from database.db import execute_query, get_db
+from database.db import get_db, write_transaction
+from models.location_model import Location
+from models.skill_model import Skill
+from models.cv_blob_model import CVBlob
+from models.job_model import build_match_query
+
+# bm25() column weights for candidates_fts: skills, education, cv_text
+CANDIDATE_RANK_WEIGHTS = (4.0, 1.0, 1.0)
 
 class StudentProfile:
     @staticmethod
@@ -7,11 +14,18 @@ class StudentProfile:
         """Create student profile"""
         query = """
         INSERT INTO student_profiles 
-        (user_id, name, education, skills, location, expected_salary, bio, phone)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        (user_id, name, education, skills, location, expected_salary, bio, phone, location_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return execute_query(query, (user_id, name, education, skills, location, 
-                                   expected_salary, bio, phone))
+        def insert(conn):
+            cursor = conn.execute(query, (user_id, name, education, skills, location,
+                                          expected_salary, bio, phone,
+                                          Location.resolve_id(conn, location)))
+            if skills:
+                Skill.set_student_skills(conn, user_id, skills)
+            return cursor.lastrowid
+        
+        return write_transaction(insert)
     
     @staticmethod
     def get_profile_by_user_id(user_id):
@@ -25,7 +39,7 @@ class StudentProfile:
     
     @staticmethod
     def update_profile(user_id, **kwargs):
-        """Update student profile"""
+        """Update student profile and return the updated row, or None"""
         fields = []
         values = []
         
@@ -35,17 +49,103 @@ class StudentProfile:
                 values.append(value)
         
         if not fields:
-            return False
+            return None
         
         fields.append("updated_at = CURRENT_TIMESTAMP")
-        values.append(user_id)
         
-        query = f"UPDATE student_profiles SET {', '.join(fields)} WHERE user_id = ?"
-        execute_query(query, values)
-        return True
+        def update(conn):
+            assignments, params = list(fields), list(values)
+            if kwargs.get('location') is not None:
+                assignments.append("location_id = ?")
+                params.append(Location.resolve_id(conn, kwargs['location']))
+            query = f"UPDATE student_profiles SET {', '.join(assignments)} WHERE user_id = ? RETURNING *"
+            rows = conn.execute(query, params + [user_id]).fetchall()
+            if rows and kwargs.get('skills') is not None:
+                Skill.set_student_skills(conn, user_id, kwargs['skills'])
+            return dict(rows[0]) if rows else None
+        
+        return write_transaction(update)
+    
+    @staticmethod
+    def get_skill_ids(user_id):
+        """Get the normalized skill ids tagged on a student"""
+        query = "SELECT skill_id FROM student_skills WHERE student_id = ?"
+        with get_db() as conn:
+            return [row[0] for row in conn.execute(query, (user_id,))]
+    
+    @staticmethod
+    def replace_cv(user_id, sha256, path, size):
+        """Point a student's CV at a stored blob, moving the reference counts in one transaction.
+
+        Returns (stored_path, previous_filename, previous_was_blob), or None
+        without a profile. A previous file that is not a blob predates
+        content-addressed storage and is the caller's to delete.
+        """
+        def replace(conn):
+            row = conn.execute("SELECT cv_filename FROM student_profiles WHERE user_id = ?",
+                               (user_id,)).fetchone()
+            if row is None:
+                return None
+            previous = row[0]
+            stored_path = CVBlob.acquire(conn, sha256, path, size)
+            previous_was_blob = CVBlob.release(conn, previous) if previous else False
+            conn.execute("UPDATE student_profiles SET cv_filename = ? WHERE user_id = ?",
+                         (stored_path, user_id))
+            return stored_path, previous, previous_was_blob
+        
+        return write_transaction(replace)
+    
+    @staticmethod
+    def get_cv_for_viewer(student_id, viewer_id, viewer_role):
+        """Get (cv_filename, name) if the viewer may download the student's CV, else None.
+
+        The student can always read their own CV; a recruiter only once the
+        student has applied to one of their jobs. Missing CVs and denied
+        access look the same to the caller.
+        """
+        query = """
+        SELECT sp.cv_filename, sp.name FROM student_profiles sp
+        WHERE sp.user_id = ? AND sp.cv_filename IS NOT NULL
+          AND ((? = 'student' AND sp.user_id = ?)
+               OR (? = 'recruiter' AND EXISTS (
+                   SELECT 1 FROM applications a JOIN jobs j ON j.id = a.job_id
+                   WHERE a.student_id = sp.user_id AND j.recruiter_id = ?)))
+        """
+        with get_db() as conn:
+            row = conn.execute(query, (student_id, viewer_role, viewer_id, viewer_role, viewer_id)).fetchone()
+            return (row[0], row[1]) if row else None
     
     @staticmethod
-    def update_cv_filename(user_id, cv_filename):
-        """Update CV filename for student"""
-        query = "UPDATE student_profiles SET cv_filename = ? WHERE user_id = ?"
-        execute_query(query, (cv_filename, user_id))
\ No newline at end of file
+    def search_candidates(keyword, page=1, per_page=20):
+        """Rank students by skills, education and CV text for a keyword query.
+
+        Returns (candidates, has_more), or None when the keyword has no
+        searchable terms.
+        """
+        match_query = build_match_query(keyword)
+        if not match_query:
+            return None
+        
+        weights = ', '.join(str(w) for w in CANDIDATE_RANK_WEIGHTS)
+        query = f"""
+        SELECT sp.user_id, sp.name, sp.education, sp.skills, sp.location, sp.expected_salary,
+               sp.cv_filename IS NOT NULL AS has_cv,
+               snippet(candidates_fts, 2, '[', ']', '...', 16) AS cv_snippet,
+               bm25(candidates_fts, {weights}) AS score
+        FROM candidates_fts
+        JOIN student_profiles sp ON sp.user_id = candidates_fts.rowid
+        WHERE candidates_fts MATCH ?
+        ORDER BY score, sp.user_id
+        LIMIT ? OFFSET ?
+        """
+        with get_db() as conn:
+            rows = conn.execute(query, (match_query, per_page + 1, (page - 1) * per_page)).fetchall()
+        
+        candidates = []
+        for row in rows[:per_page]:
+            candidate = dict(row)
+            candidate['has_cv'] = bool(candidate['has_cv'])
+            # bm25() is negative and lower is better; report higher-is-better
+            candidate['score'] = round(-candidate['score'], 4)
+            candidates.append(candidate)
+        return candidates, len(rows) > per_page
\ No newline at end of file
@@ -0,0 +1,112 @@
+import json
+import time
+from database.db import get_db, write
+
+# Task.claim's statements; module level so the query plan check can explain
+# them without leasing real tasks
+READY_QUERY = "SELECT 1 FROM tasks WHERE status = 'queued' AND run_at <= ? LIMIT 1"
+CLAIM_QUERY = """
+UPDATE tasks
+SET status = 'running', attempts = attempts + 1, lease_expires_at = ?, worker = ?
+WHERE id = (
+    SELECT id FROM tasks
+    WHERE status = 'queued' AND run_at <= ?
+    ORDER BY priority DESC, run_at
+    LIMIT 1
+)
+RETURNING id, name, payload, attempts, max_attempts
+"""
+
+class Task:
+    @staticmethod
+    def enqueue(name, args, kwargs, priority=0, max_attempts=5, delay=0):
+        """Queue a task and return its id"""
+        query = """
+        INSERT INTO tasks (name, payload, priority, max_attempts, run_at)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        payload = json.dumps({'args': list(args), 'kwargs': kwargs})
+        return write(query, (name, payload, priority, max_attempts, time.time() + delay)).lastrowid
+    
+    @staticmethod
+    def claim(worker, lease_seconds):
+        """Lease the next due task to a worker; returns the task or None.
+
+        The readiness check is a plain read, so idle workers polling the
+        queue never wait for the writer.
+        """
+        now = time.time()
+        with get_db() as conn:
+            ready = conn.execute(READY_QUERY, (now,)).fetchone()
+        if not ready:
+            return None
+        rows = write(CLAIM_QUERY, (now + lease_seconds, worker, now)).rows
+        if not rows:
+            return None
+        task = dict(rows[0])
+        payload = json.loads(task.pop('payload'))
+        task['args'] = payload['args']
+        task['kwargs'] = payload['kwargs']
+        return task
+    
+    @staticmethod
+    def complete(task_id, worker):
+        """Delete a finished task; False if the lease was lost to another worker"""
+        return write(
+            "DELETE FROM tasks WHERE id = ? AND status = 'running' AND worker = ?", (task_id, worker)
+        ).rowcount > 0
+    
+    @staticmethod
+    def fail(task_id, worker, error, retry_delay):
+        """Requeue a failed task after retry_delay seconds, or mark it dead when
+        it has used all its attempts. Returns the new status."""
+        query = """
+        UPDATE tasks
+        SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+            run_at = ?, lease_expires_at = NULL, worker = NULL, last_error = ?
+        WHERE id = ? AND status = 'running' AND worker = ?
+        RETURNING status
+        """
+        rows = write(query, (time.time() + retry_delay, error, task_id, worker)).rows
+        return rows[0][0] if rows else None
+    
+    @staticmethod
+    def reclaim_expired():
+        """Requeue running tasks whose worker let the lease expire; returns how many"""
+        now = time.time()
+        with get_db() as conn:
+            expired = conn.execute(
+                "SELECT 1 FROM tasks WHERE status = 'running' AND lease_expires_at < ? LIMIT 1", (now,)
+            ).fetchone()
+        if not expired:
+            return 0
+        return write("""
+        UPDATE tasks
+        SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+            run_at = ?, lease_expires_at = NULL, worker = NULL, last_error = 'lease expired'
+        WHERE status = 'running' AND lease_expires_at < ?
+        """, (now, now)).rowcount
+    
+    @staticmethod
+    def requeue_dead(name=None):
+        """Give dead tasks a fresh set of attempts; returns how many were requeued"""
+        query = """
+        UPDATE tasks SET status = 'queued', attempts = 0, run_at = ?
+        WHERE status = 'dead' AND (? IS NULL OR name = ?)
+        """
+        return write(query, (time.time(), name, name)).rowcount
+    
+    @staticmethod
+    def get_counts():
+        """Get the number of tasks per status, and how many queued ones are due"""
+        # One count per partial index, so no count reads the whole table
+        query = """
+        SELECT
+            (SELECT COUNT(*) FROM tasks WHERE status = 'queued'),
+            (SELECT COUNT(*) FROM tasks WHERE status = 'running'),
+            (SELECT COUNT(*) FROM tasks WHERE status = 'dead'),
+            (SELECT COUNT(*) FROM tasks WHERE status = 'queued' AND run_at <= ?)
+        """
+        with get_db() as conn:
+            row = conn.execute(query, (time.time(),)).fetchone()
+        return dict(zip(('queued', 'running', 'dead', 'due'), row))
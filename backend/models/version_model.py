@@ -0,0 +1,36 @@
+from flask import g, has_app_context
+from database.db import get_db
+
+class DataVersion:
+    @staticmethod
+    def get_versions(scopes):
+        """Get (versions, last_modified) for scopes; unknown scopes count as version 0.
+
+        last_modified is the newest updated_at string, or None when any
+        scope has never been written.
+        """
+        if not scopes:
+            return [], None
+        query = f"""
+        SELECT scope, version, updated_at FROM data_versions
+        WHERE scope IN ({', '.join('?' * len(scopes))})
+        """
+        with get_db() as conn:
+            rows = {row['scope']: row for row in conn.execute(query, list(scopes))}
+        
+        versions = [rows[scope]['version'] if scope in rows else 0 for scope in scopes]
+        if has_app_context():
+            # Kept for the rest of the request so caches can key on them
+            g.data_versions = {**g.get('data_versions', {}), **dict(zip(scopes, versions))}
+        last_modified = None
+        if len(rows) == len(set(scopes)):
+            last_modified = max(row['updated_at'] for row in rows.values())
+        return versions, last_modified
+
+    @staticmethod
+    def current(scopes):
+        """Versions of scopes, reusing those already read in this request (by @conditional)"""
+        known = g.get('data_versions', {}) if has_app_context() else {}
+        if all(scope in known for scope in scopes):
+            return tuple(known[scope] for scope in scopes)
+        return tuple(DataVersion.get_versions(scopes)[0])
@@ -0,0 +1,90 @@
+from flask import Blueprint, request, jsonify, current_app
+from database.db import get_db
+
+batch_bp = Blueprint('batch', __name__)
+
+# Headers a sub-request may set itself; Authorization always comes from the batch request
+FORWARDED_HEADERS = ['If-None-Match', 'If-Modified-Since']
+RETURNED_HEADERS = ['ETag', 'Last-Modified']
+
+def validate_batch(items):
+    """Return an error message for an invalid list of sub-requests, or None"""
+    if not isinstance(items, list) or not items:
+        return 'requests must be a non-empty list'
+    
+    limit = current_app.config['BATCH_MAX_REQUESTS']
+    if len(items) > limit:
+        return f'At most {limit} requests per batch'
+    
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return 'Each request needs a path'
+        if not item['path'].startswith('/') or item['path'].split('?')[0].rstrip('/') == '/batch':
+            return f"Invalid path: {item['path']}"
+        if item.get('method', 'GET').upper() != 'GET':
+            return 'Only GET requests can be batched'
+        if not isinstance(item.get('headers', {}), dict):
+            return 'headers must be an object'
+    return None
+
+def dispatch(app, item):
+    """Run one sub-request through the normal routing and return its result"""
+    headers = {name: value for name, value in item.get('headers', {}).items()
+               if name in FORWARDED_HEADERS}
+    if 'Authorization' in request.headers:
+        headers['Authorization'] = request.headers['Authorization']
+    
+    # The sub-request shares the batch's app context, so flask.g (the
+    # database connection and the verified token) carries over
+    with app.test_request_context(item['path'], method='GET', headers=headers,
+                                  base_url=request.host_url):
+        try:
+            response = app.full_dispatch_request()
+        except Exception:
+            return {'path': item['path'], 'status': 500, 'headers': {},
+                    'body': {'error': 'Internal server error'}}
+        
+        try:
+            # Files and streamed exports cannot be embedded; never read their bodies
+            if response.is_streamed or not response.is_json:
+                if response.status_code < 300:
+                    return {'path': item['path'], 'status': 400, 'headers': {},
+                            'body': {'error': 'Only JSON responses can be batched'}}
+                body = None
+            else:
+                body = response.get_json(silent=True)
+            return {
+                'path': item['path'],
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in RETURNED_HEADERS
+                            if name in response.headers},
+                'body': body,
+            }
+        finally:
+            # Releases what the response holds open, such as a CV's file handle
+            response.close()
+
+@batch_bp.route('/batch', methods=['POST'])
+def batch():
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('requests')
+        
+        error = validate_batch(items)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        app = current_app._get_current_object()
+        with get_db() as conn:
+            # One read transaction so every sub-request sees the same snapshot
+            conn.execute("BEGIN")
+            try:
+                responses = [dispatch(app, item) for item in items]
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+        
+        return jsonify({'responses': responses}), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
@@ -0,0 +1,27 @@
+from flask import Blueprint, request, jsonify
+from werkzeug.exceptions import NotFound
+from models.student_model import StudentProfile
+from utils.auth import token_required
+from utils.file_handler import send_cv_file
+
+cv_bp = Blueprint('cv', __name__)
+
+@cv_bp.route('/<int:student_id>', methods=['GET'])
+@token_required
+def download_cv(student_id):
+    try:
+        user = request.current_user
+        
+        # One query decides both existence and access, so a recruiter cannot
+        # probe which students have a CV
+        cv = StudentProfile.get_cv_for_viewer(student_id, user['user_id'], user['role'])
+        if not cv:
+            return jsonify({'error': 'CV not found'}), 404
+        
+        filename, name = cv
+        return send_cv_file(filename, f'{name} CV')
+    
+    except NotFound:
+        return jsonify({'error': 'CV not found'}), 404
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
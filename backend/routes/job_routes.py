@@ -1,9 +1,44 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from models.job_model import Job
+from models.location_model import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, Location, parse_coordinates
+from models.skill_model import parse_skills
+from models.version_model import DataVersion
+from utils.response_cache import response_cache
+from utils.conditional import conditional
+from utils.job_snapshot import JobSnapshot, job_snapshot
 
 job_bp = Blueprint('job', __name__)
 
+def cached_json(body, status='HIT'):
+    """Build a JSON response from cached bytes"""
+    response = current_app.response_class(body, status=200, mimetype='application/json')
+    response.headers['X-Cache'] = status
+    return response
+
+def search_cache_key(filters, near, radius_km, sort_by, order, page, per_page, cursor):
+    """Normalize search parameters so equivalent requests share an entry"""
+    def text(value):
+        return ' '.join(value.lower().split()) if value else None
+    
+    return ('search',
+            text(filters['keyword']), text(filters['location']),
+            filters['job_type'], filters['work_mode'], filters['salary_min'],
+            tuple(parse_skills(filters['skills'])), filters['skills_match'] if filters['skills'] else None,
+            text(near), radius_km if near else None,
+            sort_by, order.upper(), per_page, page if cursor is None else None, cursor)
+
+def nearby_locations(near, radius_km):
+    """Return {location_id: distance_km} around a place name or "lat,lon", or None if unknown"""
+    point = parse_coordinates(near)
+    if point is None:
+        place = Location.find(near)
+        if place is None:
+            return None
+        point = (place['latitude'], place['longitude'])
+    return Location.within_radius(point[0], point[1], radius_km)
+
 @job_bp.route('/search', methods=['GET'])
+@conditional(lambda: ['jobs'], private=False)
 def search_jobs():
     try:
         # Get search parameters
@@ -13,49 +48,121 @@ def search_jobs():
         work_mode = request.args.get('work_mode', '')
         salary_min = request.args.get('salary_min', type=int)
         skills = request.args.get('skills', '')
+        skills_match = 'any' if request.args.get('skills_match') == 'any' else 'all'
+        near = request.args.get('near', '').strip()
+        radius_km = request.args.get('radius_km', DEFAULT_RADIUS_KM, type=float)
         sort_by = request.args.get('sort_by', 'posted_at')
         order = request.args.get('order', 'DESC')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         
         # Limit per_page to prevent abuse
-        per_page = min(per_page, 100)
-        
-        # Search jobs
-        jobs = Job.search_jobs(
-            keyword=keyword if keyword else None,
-            location=location if location else None,
-            job_type=job_type if job_type else None,
-            work_mode=work_mode if work_mode else None,
-            salary_min=salary_min,
-            skills=skills if skills else None,
-            sort_by=sort_by,
-            order=order,
-            page=page,
-            per_page=per_page
-        )
-        
-        return jsonify({
+        per_page = max(min(per_page, 100), 1)
+        page = max(page, 1)
+        
+        if near and not 0 < radius_km <= MAX_RADIUS_KM:
+            return jsonify({'error': f'radius_km must be greater than 0 and at most {MAX_RADIUS_KM}'}), 400
+        
+        filters = {
+            'keyword': keyword if keyword else None,
+            'location': location if location else None,
+            'job_type': job_type if job_type else None,
+            'work_mode': work_mode if work_mode else None,
+            'salary_min': salary_min,
+            'skills': skills if skills else None,
+            'skills_match': skills_match,
+        }
+        
+        cursor = request.args.get('cursor') if 'cursor' in request.args else None
+        cache_key = search_cache_key(filters, near, radius_km, sort_by, order, page, per_page, cursor)
+        # Search results depend on every job and company name; @conditional read the version
+        versions = DataVersion.current(['jobs'])
+        cached = response_cache.get(cache_key, versions)
+        if cached is not None:
+            return cached_json(cached)
+        
+        # Radius search: jobs at any gazetteer place within radius_km of near
+        nearby = None
+        if near:
+            nearby = nearby_locations(near, radius_km)
+            if nearby is None:
+                return jsonify({'error': 'Unknown location for near; pass a city name or "lat,lon"'}), 400
+            filters['location_ids'] = tuple(sorted(nearby))
+        
+        # Cursor mode: ?cursor= starts at the first page, later pages pass next_cursor/prev_cursor
+        if cursor is not None:
+            try:
+                jobs, next_cursor, prev_cursor = Job.search_jobs_after(
+                    cursor, sort_by=sort_by, order=order,
+                    per_page=per_page, **filters
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            total, approximate = Job.count_jobs(**filters)
+        elif current_app.config.get('JOB_SNAPSHOT', True) and JobSnapshot.supports(
+                sort_by=sort_by, order=order, **filters):
+            # Filter-only searches are answered from memory; the total is exact
+            jobs, next_cursor, total = job_snapshot.search_page(
+                filters['location'], filters['job_type'], filters['work_mode'], filters['salary_min'],
+                sort_by=sort_by, order=order, page=page, per_page=per_page,
+                location_ids=filters.get('location_ids')
+            )
+            prev_cursor = None
+            approximate = False
+        else:
+            jobs, next_cursor = Job.search_jobs(
+                sort_by=sort_by, order=order, page=page, per_page=per_page, **filters
+            )
+            prev_cursor = None
+            total, approximate = Job.count_jobs(**filters)
+        
+        if nearby is not None:
+            for job in jobs:
+                distance = nearby.get(job['location_id'])
+                job['distance_km'] = round(distance, 1) if distance is not None else None
+        
+        pagination = {
+            'per_page': per_page,
+            'total': total,
+            'total_is_approximate': approximate,
+            'total_pages': (total + per_page - 1) // per_page,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
+        if cursor is None:
+            pagination['page'] = page
+        
+        response = jsonify({
             'jobs': jobs,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': len(jobs)
-            }
-        }), 200
+            'pagination': pagination
+        })
+        response_cache.set(cache_key, response.get_data(), versions)
+        response.headers['X-Cache'] = 'MISS'
+        return response, 200
     
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 @job_bp.route('/<int:job_id>', methods=['GET'])
+@conditional(lambda job_id: [f'job:{job_id}'], private=False)
 def get_job_details(job_id):
     try:
+        cache_key = ('job', job_id)
+        # Job writes and company detail edits both bump job:<id>
+        versions = DataVersion.current([f'job:{job_id}'])
+        cached = response_cache.get(cache_key, versions)
+        if cached is not None:
+            return cached_json(cached)
+        
         job = Job.get_job_by_id(job_id)
         
         if not job:
             return jsonify({'error': 'Job not found'}), 404
         
-        return jsonify({'job': job}), 200
+        response = jsonify({'job': job})
+        response_cache.set(cache_key, response.get_data(), versions)
+        response.headers['X-Cache'] = 'MISS'
+        return response, 200
     
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
@@ -1,13 +1,71 @@
-from flask import Blueprint, request, jsonify
+import csv
+import math
+import sqlite3
+from concurrent.futures import TimeoutError
+from datetime import date, timedelta
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wsgi import get_input_stream
+from database.db import PoolTimeout
 from models.recruiter_model import RecruiterProfile
-from models.job_model import Job
-from models.application_model import Application
+from models.student_model import StudentProfile
+from models.job_model import Job, encode_cursor, decode_cursor
+from models.application_model import Application, EXPORT_COLUMNS
 from utils.auth import role_required
+from utils.conditional import conditional, check_not_modified, apply_validators
+from utils.alert_matcher import alert_matcher
+from utils.bulk_import import detect_format, iter_csv_rows, iter_ndjson_rows
+from utils.export import csv_chunks, ndjson_chunks
+from utils.applicant_ranker import rank_applicants
+from utils.validators import validate_job_choices
 
 recruiter_bp = Blueprint('recruiter', __name__)
 
+APPLICATION_STATUSES = ['pending', 'shortlisted', 'rejected', 'hired']
+MAX_BULK_STATUS_IDS = 5000
+
+JOB_FIELDS = ['title', 'description', 'skills_required', 'location', 'salary', 'work_mode', 'job_type', 'deadline']
+# SQLite's largest integer
+MAX_SALARY = 2 ** 63 - 1
+
+def validate_job_data(data):
+    """Return an error message for a job missing required fields or with an invalid choice, or None"""
+    for field in ['title', 'description']:
+        if field not in data or not data[field]:
+            return f'{field} is required'
+    return validate_job_choices(data)
+
+def bulk_job_values(data):
+    """Return (values tuple in JOB_FIELDS order, error) for one imported row"""
+    error = validate_job_data(data)
+    if error:
+        return None, error
+    
+    for field in ['title', 'description', 'skills_required', 'location', 'deadline']:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return None, f'{field} must be text'
+    
+    salary = data.get('salary')
+    if salary is not None:
+        if isinstance(salary, str):
+            # CSV cells arrive as text
+            try:
+                salary = float(salary)
+            except ValueError:
+                return None, 'salary must be a number'
+        if isinstance(salary, bool) or not isinstance(salary, (int, float)):
+            return None, 'salary must be a number'
+        if not (isinstance(salary, int) or math.isfinite(salary)) or not 0 <= salary <= MAX_SALARY:
+            return None, 'salary is out of range'
+        salary = int(salary)
+    
+    values = dict(data, salary=salary, skills_required=data.get('skills_required', ''),
+                  location=data.get('location', ''))
+    return tuple(values.get(field) for field in JOB_FIELDS), None
+
 @recruiter_bp.route('/profile', methods=['GET'])
 @role_required('recruiter')
+@conditional(lambda: [f"recruiter:{request.current_user['user_id']}"])
 def get_profile():
     try:
         user_id = request.current_user['user_id']
@@ -35,14 +93,11 @@ def update_profile():
         if not update_data:
             return jsonify({'error': 'No valid fields to update'}), 400
         
-        # Update profile
-        success = RecruiterProfile.update_profile(user_id, **update_data)
-        
-        if not success:
-            return jsonify({'error': 'Failed to update profile'}), 500
+        # Update profile; the UPDATE returns the new row
+        profile = RecruiterProfile.update_profile(user_id, **update_data)
         
-        # Get updated profile
-        profile = RecruiterProfile.get_profile_by_user_id(user_id)
+        if not profile:
+            return jsonify({'error': 'Profile not found'}), 404
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -60,10 +115,9 @@ def create_job():
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['title', 'description']
-        for field in required_fields:
-            if field not in data or not data[field]:
-                return jsonify({'error': f'{field} is required'}), 400
+        error = validate_job_data(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         # Extract job data
         title = data['title']
@@ -81,6 +135,9 @@ def create_job():
             location, salary, work_mode, job_type, deadline
         )
         
+        # Match against student alerts off the request path
+        alert_matcher.enqueue(job_id)
+        
         return jsonify({
             'message': 'Job posted successfully',
             'job_id': job_id
@@ -89,8 +146,92 @@ def create_job():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
+@recruiter_bp.route('/jobs/bulk', methods=['POST'])
+@role_required('recruiter')
+def bulk_create_jobs():
+    try:
+        user_id = request.current_user['user_id']
+        
+        body_format = detect_format(request.content_type, request.args.get('format'))
+        if body_format is None:
+            return jsonify({'error': 'Send text/csv or application/x-ndjson'}), 415
+        
+        # Read the body incrementally instead of through request.data
+        stream = get_input_stream(request.environ,
+                                  max_content_length=current_app.config['BULK_IMPORT_MAX_BYTES'])
+        rows = iter_csv_rows(stream) if body_format == 'csv' else iter_ndjson_rows(stream)
+        chunk_size = current_app.config['BULK_IMPORT_CHUNK_SIZE']
+        
+        results = []
+        chunk = []
+        chunk_rows = []
+        
+        def flush():
+            try:
+                job_ids = Job.create_jobs(user_id, chunk)
+                results.extend({'row': row_number, 'job_id': job_id}
+                               for row_number, job_id in zip(chunk_rows, job_ids))
+            except (sqlite3.IntegrityError, sqlite3.InterfaceError, OverflowError):
+                # The chunk rolled back as a whole; retry it row by row so
+                # only the rows the database rejects are reported
+                job_ids = []
+                for row_number, values in zip(chunk_rows, chunk):
+                    try:
+                        job_ids.extend(Job.create_jobs(user_id, [values]))
+                        results.append({'row': row_number, 'job_id': job_ids[-1]})
+                    except (sqlite3.IntegrityError, sqlite3.InterfaceError, OverflowError):
+                        results.append({'row': row_number, 'error': 'Rejected by the database'})
+            alert_matcher.enqueue(*job_ids)
+            chunk.clear()
+            chunk_rows.clear()
+        
+        def report(message, status):
+            # Rows committed before a failure stay imported, so always list them
+            results.sort(key=lambda result: result['row'])
+            created = sum(1 for result in results if 'job_id' in result)
+            body = {'created': created, 'failed': len(results) - created, 'results': results}
+            body['error' if status >= 400 else 'message'] = message.format(created=created)
+            return jsonify(body), status
+        
+        try:
+            for row_number, data, error in rows:
+                values = None
+                if error is None:
+                    values, error = bulk_job_values(data)
+                if error:
+                    results.append({'row': row_number, 'error': error})
+                    continue
+                
+                chunk.append(values)
+                chunk_rows.append(row_number)
+                if len(chunk) >= chunk_size:
+                    flush()
+            if chunk:
+                flush()
+        except RequestEntityTooLarge:
+            return report('Import too large; {created} jobs were imported before the limit', 413)
+        except (UnicodeDecodeError, csv.Error):
+            return report('Malformed import body; {created} jobs were imported before the error', 400)
+        except (TimeoutError, PoolTimeout, sqlite3.OperationalError) as e:
+            # Earlier chunks are committed; list the rows that were being written too
+            unavailable = not isinstance(e, sqlite3.OperationalError)
+            reported = {result['row'] for result in results}
+            results.extend({'row': row_number, 'error': 'Not confirmed; the database timed out' if unavailable
+                            else 'Not imported; database error'}
+                           for row_number in chunk_rows if row_number not in reported)
+            return report('Database error; {created} jobs were imported before the error',
+                          503 if unavailable else 500)
+        
+        if not any('job_id' in result for result in results):
+            return report('No valid rows to import', 400)
+        return report('Imported {created} jobs', 201)
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
 @recruiter_bp.route('/jobs', methods=['GET'])
 @role_required('recruiter')
+@conditional(lambda: [f"recruiter-jobs:{request.current_user['user_id']}"])
 def get_my_jobs():
     try:
         user_id = request.current_user['user_id']
@@ -108,11 +249,6 @@ def update_job(job_id):
         user_id = request.current_user['user_id']
         data = request.get_json()
         
-        # Check if job belongs to the recruiter
-        job = Job.get_job_by_id(job_id)
-        if not job or job['recruiter_id'] != user_id:
-            return jsonify({'error': 'Job not found or access denied'}), 404
-        
         # Extract allowed fields
         allowed_fields = ['title', 'description', 'skills_required', 'location', 
                          'salary', 'work_mode', 'job_type', 'deadline']
@@ -121,11 +257,13 @@ def update_job(job_id):
         if not update_data:
             return jsonify({'error': 'No valid fields to update'}), 400
         
-        # Update job
-        success = Job.update_job(job_id, **update_data)
+        error = validate_job_choices(update_data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        if not success:
-            return jsonify({'error': 'Failed to update job'}), 500
+        # Update job; only matches an active job of this recruiter
+        if not Job.update_job(job_id, user_id, **update_data):
+            return jsonify({'error': 'Job not found or access denied'}), 404
         
         return jsonify({'message': 'Job updated successfully'}), 200
     
@@ -138,14 +276,10 @@ def delete_job(job_id):
     try:
         user_id = request.current_user['user_id']
         
-        # Check if job belongs to the recruiter
-        job = Job.get_job_by_id(job_id)
-        if not job or job['recruiter_id'] != user_id:
+        # Delete job (soft delete); only matches an active job of this recruiter
+        if not Job.delete_job(job_id, user_id):
             return jsonify({'error': 'Job not found or access denied'}), 404
         
-        # Delete job (soft delete)
-        Job.delete_job(job_id, user_id)
-        
         return jsonify({'message': 'Job deleted successfully'}), 200
     
     except Exception as e:
@@ -157,15 +291,58 @@ def get_job_applications(job_id):
     try:
         user_id = request.current_user['user_id']
         
+        status = request.args.get('status')
+        if status and status not in APPLICATION_STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+        
+        sort = request.args.get('sort', 'applied_at')
+        if sort not in ('applied_at', 'match'):
+            return jsonify({'error': 'sort must be applied_at or match'}), 400
+        
+        limit = max(min(request.args.get('limit', 50, type=int), 200), 1)
+        after = None
+        if request.args.get('cursor'):
+            try:
+                key, last_id, _ = decode_cursor(request.args['cursor'], sort, 'DESC')
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            after = (key, last_id)
+        
+        # The match ranking also reads the job's skills, salary and title
+        not_modified, validators = check_not_modified([f'job-apps:{job_id}', f'job:{job_id}'])
+        if not_modified is not None:
+            return not_modified
+        
         # Check if job belongs to the recruiter
         job = Job.get_job_by_id(job_id)
         if not job or job['recruiter_id'] != user_id:
             return jsonify({'error': 'Job not found or access denied'}), 404
         
-        # Get applications
-        applications = Application.get_applications_by_job(job_id)
+        # One extra row tells whether another page follows
+        if sort == 'match':
+            applications, counts = rank_applicants(
+                job, Job.get_skill_ids(job_id), Application.iter_applicants_for_ranking(job_id),
+                status=status, limit=limit + 1, after=after
+            )
+        else:
+            applications = Application.get_applications_page(job_id, status=status, after=after, limit=limit + 1)
+            counts = Application.get_status_counts(job_id)
+        
+        next_cursor = None
+        if len(applications) > limit:
+            applications = applications[:limit]
+            last = applications[-1]
+            next_cursor = encode_cursor(sort, 'DESC', last['match_score' if sort == 'match' else 'applied_at'],
+                                        last['id'], 'next')
         
-        return jsonify({'applications': applications}), 200
+        counts = {name: counts.get(name, 0) for name in APPLICATION_STATUSES}
+        counts['total'] = sum(counts.values())
+        
+        return apply_validators(jsonify({
+            'applications': applications,
+            'counts': counts,
+            'pagination': {'sort': sort, 'limit': limit, 'next_cursor': next_cursor}
+        }), *validators), 200
     
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -180,15 +357,137 @@ def update_application_status(application_id):
             return jsonify({'error': 'Status is required'}), 400
         
         status = data['status']
-        valid_statuses = ['pending', 'shortlisted', 'rejected', 'hired']
-        
-        if status not in valid_statuses:
+        if status not in APPLICATION_STATUSES:
             return jsonify({'error': 'Invalid status'}), 400
         
-        # Update application status
-        Application.update_application_status(application_id, status)
+        # Update application status if it belongs to one of the recruiter's jobs
+        if not Application.update_application_status(application_id, status, request.current_user['user_id']):
+            return jsonify({'error': 'Application not found or access denied'}), 404
         
         return jsonify({'message': 'Application status updated successfully'}), 200
     
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@recruiter_bp.route('/applications/status', methods=['PUT'])
+@role_required('recruiter')
+def bulk_update_application_status():
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json() or {}
+        
+        status = data.get('status')
+        if status not in APPLICATION_STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+        
+        application_ids = data.get('application_ids')
+        job_id = data.get('job_id')
+        from_status = data.get('from_status')
+        if (application_ids is None) == (job_id is None):
+            return jsonify({'error': 'Provide either application_ids or job_id'}), 400
+        if from_status and from_status not in APPLICATION_STATUSES:
+            return jsonify({'error': 'Invalid from_status'}), 400
+        
+        if application_ids is not None:
+            if not isinstance(application_ids, list) or not application_ids \
+                    or not all(isinstance(i, int) and not isinstance(i, bool) for i in application_ids):
+                return jsonify({'error': 'application_ids must be a non-empty list of ids'}), 400
+            if len(application_ids) > MAX_BULK_STATUS_IDS:
+                return jsonify({'error': f'At most {MAX_BULK_STATUS_IDS} application ids per request'}), 400
+            application_ids = list(dict.fromkeys(application_ids))
+            requested = len(application_ids)
+        else:
+            # Verify job belongs to recruiter
+            job = Job.get_job_by_id(job_id) if isinstance(job_id, int) else None
+            if not job or job['recruiter_id'] != user_id:
+                return jsonify({'error': 'Job not found or access denied'}), 404
+            requested = None
+        
+        result = Application.update_statuses(user_id, status, application_ids=application_ids,
+                                             job_id=job_id, from_status=from_status)
+        
+        counts = {
+            'matched': result['matched'],
+            'updated': result['updated'],
+            'unchanged': result['matched'] - result['updated'],
+        }
+        if requested is not None:
+            counts['not_found'] = requested - result['matched']
+        return jsonify(dict(counts, message=f"Updated {result['updated']} applications")), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@recruiter_bp.route('/candidates/search', methods=['GET'])
+@role_required('recruiter')
+def search_candidates():
+    try:
+        keyword = request.args.get('q', '').strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('per_page', 20, type=int), 50), 1)
+        
+        if not keyword:
+            return jsonify({'error': 'q is required'}), 400
+        
+        result = StudentProfile.search_candidates(keyword, page=page, per_page=per_page)
+        if result is None:
+            return jsonify({'error': 'q has no searchable terms'}), 400
+        
+        candidates, has_more = result
+        return jsonify({
+            'candidates': candidates,
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'has_more': has_more
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@recruiter_bp.route('/jobs/<int:job_id>/applications/export', methods=['GET'])
+@role_required('recruiter')
+def export_job_applications(job_id):
+    try:
+        user_id = request.current_user['user_id']
+        
+        # Verify job belongs to recruiter
+        job = Job.get_job_by_id(job_id)
+        if not job or job['recruiter_id'] != user_id:
+            return jsonify({'error': 'Job not found or access denied'}), 404
+        
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return jsonify({'error': 'format must be csv or ndjson'}), 400
+        
+        status = request.args.get('status')
+        if status and status not in APPLICATION_STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+        
+        # from/to are inclusive calendar days (YYYY-MM-DD)
+        try:
+            applied_from = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+            applied_to = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+        except ValueError:
+            return jsonify({'error': 'from and to must be dates (YYYY-MM-DD)'}), 400
+        
+        batches = Application.iter_applications_by_job(
+            job_id, status=status,
+            applied_from=applied_from.isoformat() if applied_from else None,
+            applied_before=(applied_to + timedelta(days=1)).isoformat() if applied_to else None
+        )
+        
+        if export_format == 'csv':
+            body, mimetype = csv_chunks(EXPORT_COLUMNS, batches), 'text/csv'
+        else:
+            body, mimetype = ndjson_chunks(batches), 'application/x-ndjson'
+        
+        # Keep the request context (and its database connection) open while streaming
+        return Response(stream_with_context(body), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename=job-{job_id}-applications.{export_format}',
+            'X-Accel-Buffering': 'no'
+        })
+    
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
@@ -2,13 +2,35 @@ from flask import Blueprint, request, jsonify
 from models.student_model import StudentProfile
 from models.job_model import Job
 from models.application_model import Application
+from models.alert_model import JobAlert
 from utils.auth import role_required
-from utils.file_handler import save_cv_file, delete_cv_file
+from utils.conditional import conditional
+from utils.file_handler import spool_cv_file, publish_cv_file, discard_cv_file
+from utils.recommender import recommender
+from utils.cv_tasks import delete_replaced_cv, extract_cv_text
+from utils.validators import JOB_TYPES
+
+ALERT_FIELDS = ['keywords', 'location', 'salary_min', 'job_type']
+
+def student_application_scopes(user_id):
+    """Version scopes of a student's application list, including each job shown in it"""
+    job_ids = Application.get_applied_job_ids(user_id)
+    return [f'student-apps:{user_id}'] + [f'job:{job_id}' for job_id in job_ids]
+
+def validate_alert_data(data):
+    """Return an error message for invalid alert fields, or None"""
+    if data.get('job_type') and data['job_type'] not in JOB_TYPES:
+        return 'Invalid job type'
+    if data.get('salary_min') is not None:
+        if not isinstance(data['salary_min'], int) or data['salary_min'] < 0:
+            return 'salary_min must be a non-negative integer'
+    return None
 
 student_bp = Blueprint('student', __name__)
 
 @student_bp.route('/profile', methods=['GET'])
 @role_required('student')
+@conditional(lambda: [f"student:{request.current_user['user_id']}"])
 def get_profile():
     try:
         user_id = request.current_user['user_id']
@@ -36,14 +58,11 @@ def update_profile():
         if not update_data:
             return jsonify({'error': 'No valid fields to update'}), 400
         
-        # Update profile
-        success = StudentProfile.update_profile(user_id, **update_data)
+        # Update profile; the UPDATE returns the new row
+        profile = StudentProfile.update_profile(user_id, **update_data)
         
-        if not success:
-            return jsonify({'error': 'Failed to update profile'}), 500
-        
-        # Get updated profile
-        profile = StudentProfile.get_profile_by_user_id(user_id)
+        if not profile:
+            return jsonify({'error': 'Profile not found'}), 404
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -67,18 +86,31 @@ def upload_cv():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Save new CV file
-        filename = save_cv_file(file)
-        if not filename:
+        # Stream the upload to a temporary file, hashing it on the way
+        spooled = spool_cv_file(file)
+        if not spooled:
             return jsonify({'error': 'Invalid file type or failed to save file'}), 400
         
-        # Get current profile to delete old CV
-        profile = StudentProfile.get_profile_by_user_id(user_id)
-        if profile and profile['cv_filename']:
-            delete_cv_file(profile['cv_filename'])
+        # Swap the profile's blob reference, then publish the file; a
+        # duplicate of stored content only changes reference counts
+        try:
+            result = StudentProfile.replace_cv(user_id, spooled['sha256'], spooled['path'], spooled['size'])
+            if result is None:
+                discard_cv_file(spooled)
+                return jsonify({'error': 'Profile not found'}), 404
+            filename, previous, previous_was_blob = result
+            published = publish_cv_file(spooled, filename)
+        except Exception:
+            discard_cv_file(spooled)
+            raise
+        
+        # New content is parsed for candidate search by the task workers
+        if published:
+            extract_cv_text.delay(spooled['sha256'], filename)
         
-        # Update profile with new CV filename
-        StudentProfile.update_cv_filename(user_id, filename)
+        # Files from before content-addressed storage are not reference counted
+        if previous and not previous_was_blob:
+            delete_replaced_cv.delay(previous)
         
         return jsonify({
             'message': 'CV uploaded successfully',
@@ -90,6 +122,7 @@ def upload_cv():
 
 @student_bp.route('/applications', methods=['GET'])
 @role_required('student')
+@conditional(lambda: student_application_scopes(request.current_user['user_id']))
 def get_applications():
     try:
         user_id = request.current_user['user_id']
@@ -100,6 +133,38 @@ def get_applications():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
+@student_bp.route('/recommendations', methods=['GET'])
+@role_required('student')
+def get_recommendations():
+    try:
+        user_id = request.current_user['user_id']
+        limit = max(min(request.args.get('limit', 20, type=int), 100), 1)
+        job_type = request.args.get('job_type') or None
+        
+        profile = StudentProfile.get_profile_by_user_id(user_id)
+        if not profile:
+            return jsonify({'error': 'Profile not found'}), 404
+        
+        scored = recommender.recommend(
+            StudentProfile.get_skill_ids(user_id),
+            location=profile['location'],
+            expected_salary=profile['expected_salary'],
+            job_type=job_type,
+            limit=limit,
+            exclude_job_ids=Application.get_applied_job_ids(user_id)
+        )
+        
+        # Hydrate full rows only for the returned top-k
+        scores = dict(scored)
+        jobs = Job.get_jobs_by_ids([job_id for job_id, _ in scored])
+        for job in jobs:
+            job['match_score'] = scores[job['id']]
+        
+        return jsonify({'jobs': jobs}), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
 @student_bp.route('/jobs/apply/<int:job_id>', methods=['POST'])
 @role_required('student')
 def apply_to_job(job_id):
@@ -107,23 +172,127 @@ def apply_to_job(job_id):
         user_id = request.current_user['user_id']
         data = request.get_json() or {}
         
-        # Check if job exists
-        job = Job.get_job_by_id(job_id)
-        if not job:
-            return jsonify({'error': 'Job not found'}), 404
-        
-        # Check if student has already applied
-        if Application.check_application_exists(job_id, user_id):
-            return jsonify({'error': 'You have already applied to this job'}), 400
-        
-        # Create application
+        # Create application; the INSERT checks the job and duplicates itself
         cover_letter = data.get('cover_letter', '')
         application_id = Application.create_application(job_id, user_id, cover_letter)
         
+        if application_id is None:
+            # Only the failure path pays for a second query to explain why
+            if not Job.get_job_by_id(job_id):
+                return jsonify({'error': 'Job not found'}), 404
+            return jsonify({'error': 'You have already applied to this job'}), 400
+        
         return jsonify({
             'message': 'Application submitted successfully',
             'application_id': application_id
         }), 201
     
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Internal server error'}), 500
+
+@student_bp.route('/alerts', methods=['GET'])
+@role_required('student')
+@conditional(lambda: [f"alerts:{request.current_user['user_id']}"])
+def get_alerts():
+    try:
+        user_id = request.current_user['user_id']
+        alerts = JobAlert.get_alerts_by_student(user_id)
+        
+        return jsonify({'alerts': alerts}), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@student_bp.route('/alerts', methods=['POST'])
+@role_required('student')
+def create_alert():
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json() or {}
+        
+        alert_data = {k: data.get(k) or None for k in ALERT_FIELDS}
+        if not any(alert_data.values()):
+            return jsonify({'error': 'At least one of keywords, location, salary_min or job_type is required'}), 400
+        
+        error = validate_alert_data(alert_data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        alert_id = JobAlert.create_alert(user_id, **alert_data)
+        
+        return jsonify({
+            'message': 'Alert created successfully',
+            'alert': JobAlert.get_alert(alert_id, user_id)
+        }), 201
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@student_bp.route('/alerts/<int:alert_id>', methods=['PUT'])
+@role_required('student')
+def update_alert(alert_id):
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json() or {}
+        
+        update_data = {k: data[k] or None for k in ALERT_FIELDS if k in data}
+        if 'is_active' in data:
+            update_data['is_active'] = 1 if data['is_active'] else 0
+        
+        if not update_data:
+            return jsonify({'error': 'No valid fields to update'}), 400
+        
+        error = validate_alert_data(update_data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        alert = JobAlert.get_alert(alert_id, user_id)
+        if not alert:
+            return jsonify({'error': 'Alert not found'}), 404
+        # An alert without criteria would match every new job
+        if not any(update_data.get(k, alert[k]) for k in ALERT_FIELDS):
+            return jsonify({'error': 'At least one of keywords, location, salary_min or job_type is required'}), 400
+        
+        if not JobAlert.update_alert(alert_id, user_id, **update_data):
+            return jsonify({'error': 'Alert not found'}), 404
+        
+        return jsonify({
+            'message': 'Alert updated successfully',
+            'alert': JobAlert.get_alert(alert_id, user_id)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@student_bp.route('/alerts/<int:alert_id>', methods=['DELETE'])
+@role_required('student')
+def delete_alert(alert_id):
+    try:
+        user_id = request.current_user['user_id']
+        
+        if not JobAlert.delete_alert(alert_id, user_id):
+            return jsonify({'error': 'Alert not found'}), 404
+        
+        return jsonify({'message': 'Alert deleted successfully'}), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@student_bp.route('/alerts/digest', methods=['GET'])
+@role_required('student')
+@conditional(lambda: [f"alert-matches:{request.current_user['user_id']}", 'jobs'])
+def get_alert_digest():
+    try:
+        user_id = request.current_user['user_id']
+        limit = max(min(request.args.get('limit', 50, type=int), 200), 1)
+        before = request.args.get('before', type=int)
+        
+        matches = JobAlert.get_digest(user_id, before_id=before, limit=limit)
+        
+        return jsonify({
+            'matches': matches,
+            'next_before': matches[-1]['match_id'] if len(matches) == limit else None
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
@@ -0,0 +1,150 @@
+import re
+import threading
+from collections import Counter
+from models.alert_model import JobAlert
+from models.job_model import Job
+from models.location_model import Location
+from models.version_model import DataVersion
+from utils.task_queue import task
+
+_TOKEN = re.compile(r'\w+')
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+def tokenize(text):
+    """Lowercase word tokens of a text"""
+    return set(_TOKEN.findall(text.lower())) if text else set()
+
+def salary_value(salary):
+    """A stored salary as a number, or None when it is missing or not numeric text"""
+    if isinstance(salary, (int, float)):
+        return salary
+    try:
+        return float(salary)
+    except (TypeError, ValueError):
+        return None
+
+class AlertIndex:
+    """Inverted index over active alerts.
+
+    Every criterion an alert sets (each keyword token, its location and its
+    job_type) is a posting. An alert matches a job when the job hits all of
+    its postings, so matching counts hits per alert instead of scanning
+    every alert. Alerts with no indexed criteria are kept aside as
+    match-all, and salary_min is checked only for candidates.
+
+    Locations follow job search: an alert location that names a gazetteer
+    place is posted under its location id and matches every spelling of
+    that place, other text is checked as a substring of the job location.
+    """
+
+    def __init__(self, alerts=(), location_ids=None):
+        self.postings = {}
+        self.required = {}
+        self.match_all = set()
+        self.alerts = {}
+        location_ids = location_ids or {}
+        for alert in alerts:
+            self.add(alert, location_ids.get(alert['location']))
+
+    def add(self, alert, location_id=None):
+        alert_id = alert['id']
+        keys = [('kw', token) for token in tokenize(alert['keywords'])]
+        location_text = None
+        if location_id is not None:
+            keys.append(('loc', location_id))
+        elif alert['location']:
+            # Same as LIKE '%location%': a substring, case-insensitive for ASCII only
+            location_text = alert['location'].translate(_ASCII_LOWER)
+        if alert['job_type']:
+            keys.append(('type', alert['job_type']))
+
+        self.alerts[alert_id] = (alert['student_id'], alert['salary_min'], location_text)
+        if not keys:
+            self.match_all.add(alert_id)
+            return
+        self.required[alert_id] = len(keys)
+        for key in keys:
+            self.postings.setdefault(key, []).append(alert_id)
+
+    def match(self, job):
+        """Return [(alert_id, student_id)] for alerts matching a job"""
+        keys = [('kw', token) for token in tokenize(
+            ' '.join(filter(None, (job['title'], job['description'], job['skills_required'])))
+        )]
+        if job['location_id'] is not None:
+            keys.append(('loc', job['location_id']))
+        if job['job_type']:
+            keys.append(('type', job['job_type']))
+
+        hits = Counter()
+        for key in keys:
+            postings = self.postings.get(key)
+            if postings:
+                hits.update(postings)
+
+        candidates = [alert_id for alert_id, count in hits.items() if count == self.required[alert_id]]
+        candidates.extend(self.match_all)
+
+        job_location = (job['location'] or '').translate(_ASCII_LOWER)
+        salary = salary_value(job['salary'])
+        matches = []
+        for alert_id in candidates:
+            student_id, salary_min, location_text = self.alerts[alert_id]
+            if location_text and location_text not in job_location:
+                continue
+            if salary_min and (salary is None or salary < salary_min):
+                continue
+            matches.append((alert_id, student_id))
+        return matches
+
+class AlertMatcher:
+    """Matches newly posted jobs against alerts through the task queue.
+
+    Routes call enqueue() after a job is committed; the job ids are stored
+    as one durable task, so a restart never drops pending matches. A task
+    worker matches the batch through this process's AlertIndex and stores
+    all of its matches with one executemany. Saving ignores duplicates, so
+    a retried task is harmless.
+
+    The index is rebuilt whenever the 'alerts' data version moved, which
+    every alert change bumps, so workers in any process match against the
+    alerts as they were committed before the task ran.
+    """
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, *job_ids):
+        """Queue a batch of jobs for matching"""
+        if job_ids:
+            match_alerts.delay(list(job_ids))
+
+    def _current_index(self):
+        # Read before loading, so a change made during the load triggers another rebuild
+        version = DataVersion.get_versions(['alerts'])[0][0]
+        with self._lock:
+            if self._index is None or version != self._version:
+                alerts = list(JobAlert.iter_active_alerts())
+                location_ids = Location.get_ids(alert['location'] for alert in alerts)
+                self._index = AlertIndex(alerts, location_ids)
+                self._version = version
+            return self._index
+
+    def match_jobs(self, job_ids):
+        """Match a batch of jobs against all active alerts; returns the match count"""
+        index = self._current_index()
+        matches = []
+        for job in Job.get_jobs_for_matching(list(dict.fromkeys(job_ids))):
+            matches.extend((alert_id, job['id'], student_id) for alert_id, student_id in index.match(job))
+        if matches:
+            JobAlert.save_matches(matches)
+        return len(matches)
+
+alert_matcher = AlertMatcher()
+
+@task(name='alerts.match_jobs', priority=1)
+def match_alerts(job_ids):
+    """Match newly posted jobs against the active alerts"""
+    alert_matcher.match_jobs(job_ids)
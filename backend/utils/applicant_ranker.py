@@ -0,0 +1,64 @@
+import heapq
+import re
+
+# Score weights; each component is scaled to 0..1 first
+WEIGHTS = {
+    'skills': 0.7,
+    'salary': 0.2,
+    'education': 0.1,
+}
+
+_WORDS = re.compile(r'[a-z0-9+#]+')
+
+def _words(text):
+    return set(_WORDS.findall(text.lower())) if text else set()
+
+def score_applicant(applicant, job, job_skill_ids, job_words):
+    """Score how well one applicant fits a job, from 0 to 1"""
+    skill_ids = {int(s) for s in applicant['skill_ids'].split(',')} if applicant['skill_ids'] else set()
+    total = WEIGHTS['skills'] * (len(skill_ids & job_skill_ids) / len(job_skill_ids) if job_skill_ids else 0.5)
+    
+    expected = applicant['expected_salary']
+    if not job['salary'] or not expected:
+        total += WEIGHTS['salary'] * 0.5
+    elif expected <= job['salary']:
+        total += WEIGHTS['salary']
+    else:
+        total += WEIGHTS['salary'] * job['salary'] / expected
+    
+    # Education that mentions the job's title or skills, e.g. "MSc Statistics" for a statistics role
+    if job_words & _words(applicant['education']):
+        total += WEIGHTS['education']
+    return round(total, 4)
+
+def rank_applicants(job, job_skill_ids, batches, status=None, limit=50, after=None):
+    """Scan applicant batches once and return (best applicants, per-status counts).
+
+    Only the top `limit` applicants are kept, in a heap, so the scan needs
+    no sort. after is the (match_score, id) of the last applicant on the
+    previous page; the ranking continues below it. Counts cover every
+    status regardless of the filter.
+    """
+    job_skill_ids = set(job_skill_ids)
+    job_words = _words(job['title']) | _words(job['skills_required'])
+    counts = {}
+    
+    def candidates():
+        for rows in batches:
+            for row in rows:
+                counts[row['status']] = counts.get(row['status'], 0) + 1
+                if status and row['status'] != status:
+                    continue
+                score = score_applicant(row, job, job_skill_ids, job_words)
+                if after is not None and (score, row['id']) >= tuple(after):
+                    continue
+                yield score, row['id'], row
+    
+    best = heapq.nlargest(limit, candidates(), key=lambda item: (item[0], item[1]))
+    applicants = []
+    for score, _, row in best:
+        applicant = dict(row)
+        del applicant['skill_ids']
+        applicant['match_score'] = score
+        applicants.append(applicant)
+    return applicants, counts
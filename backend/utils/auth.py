@@ -2,7 +2,7 @@ import jwt
 import hashlib
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 
 def hash_password(password):
     """Hash password using SHA-256"""
@@ -47,7 +47,13 @@ def token_required(f):
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
-        payload = decode_token(token)
+        # A batch request dispatches several views in one app context; verify its token once
+        cached = g.get('auth_token')
+        if cached is not None and cached[0] == token:
+            payload = cached[1]
+        else:
+            payload = decode_token(token)
+            g.auth_token = (token, payload)
         if payload is None:
             return jsonify({'error': 'Token is invalid or expired'}), 401
         
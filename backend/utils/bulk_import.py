@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+READ_BUFFER_SIZE = 64 * 1024
+
+def detect_format(content_type, requested=None):
+    """Pick 'csv' or 'ndjson' from an explicit format or the Content-Type, else None"""
+    if requested:
+        return requested if requested in ('csv', 'ndjson') else None
+    mimetype = (content_type or '').split(';')[0].strip().lower()
+    if mimetype in ('text/csv', 'application/csv'):
+        return 'csv'
+    if mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/json-lines'):
+        return 'ndjson'
+    return None
+
+def iter_ndjson_rows(stream):
+    """Yield (row_number, data, error) for each non-blank line of a JSON-lines byte stream"""
+    reader = io.BufferedReader(stream, READ_BUFFER_SIZE)
+    row_number = 0
+    for line in reader:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield row_number, None, 'Invalid JSON'
+            continue
+        if not isinstance(data, dict):
+            yield row_number, None, 'Row must be a JSON object'
+            continue
+        yield row_number, data, None
+
+def iter_csv_rows(stream):
+    """Yield (row_number, data, error) for each record of a CSV byte stream with a header row.
+
+    Empty cells are treated as missing values.
+    """
+    text = io.TextIOWrapper(io.BufferedReader(stream, READ_BUFFER_SIZE), encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    for row_number, record in enumerate(reader, start=1):
+        if None in record:
+            yield row_number, None, 'Too many columns'
+            continue
+        yield row_number, {key.strip(): value for key, value in record.items()
+                           if key and value not in (None, '')}, None
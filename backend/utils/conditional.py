@@ -0,0 +1,63 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, make_response
+from models.version_model import DataVersion
+
+def compute_validators(scopes):
+    """Build a strong ETag and Last-Modified datetime for the current request"""
+    versions, last_modified = DataVersion.get_versions(scopes)
+    digest = hashlib.sha1()
+    # The query string selects a different representation of the same data
+    digest.update(request.full_path.encode())
+    for scope, version in zip(scopes, versions):
+        digest.update(f'|{scope}={version}'.encode())
+    
+    if last_modified is not None:
+        last_modified = datetime.strptime(last_modified, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    return digest.hexdigest()[:32], last_modified
+
+def is_not_modified(etag, last_modified):
+    """Evaluate If-None-Match, falling back to If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+def apply_validators(response, etag, last_modified, private=True):
+    """Attach validators so clients revalidate instead of refetching"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    return response
+
+def check_not_modified(scopes, private=True):
+    """Return a 304 response when the client's copy is current, else None plus validators"""
+    etag, last_modified = compute_validators(scopes)
+    if is_not_modified(etag, last_modified):
+        return apply_validators(make_response('', 304), etag, last_modified, private), None
+    return None, (etag, last_modified)
+
+def conditional(scopes_for, private=True):
+    """Decorator for GET views: answer 304 before running the view when nothing changed.
+
+    scopes_for(**view_kwargs) returns the data_versions scopes the
+    response is built from; it runs after the auth decorators, so
+    request.current_user is available. Validators are added to 200
+    responses.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            not_modified, validators = check_not_modified(scopes_for(**kwargs), private)
+            if not_modified is not None:
+                return not_modified
+            
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                apply_validators(response, *validators, private=private)
+            return response
+        return decorated
+    return decorator
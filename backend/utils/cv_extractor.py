@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import TimeoutError
+from utils.cv_text import extract_text
+
+def _serve(conn):
+    """Worker process loop: parse each path received and send back (ok, text or exception)"""
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, extract_text(path))
+        except Exception as e:
+            result = (False, e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # The parser's exception may not pickle
+            conn.send((False, RuntimeError(f'{type(e).__name__}: {e}')))
+
+class _Worker:
+    """One extraction process and our end of its pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.join(5)
+        self.conn.close()
+
+class CVTextExtractor:
+    """Runs CV text extraction in a pool of worker processes.
+
+    Parsing PDFs and DOCX files is CPU-bound, so the task workers hand it
+    to separate processes (one per core by default) instead of holding the
+    GIL; several task threads extracting at once use several cores, and
+    the task queue runs one thread per process unless told otherwise.
+
+    Each call checks out one idle process and talks to it over a pipe. A
+    parse still running after `timeout` seconds raises TimeoutError so its
+    task is retried; the process cannot be interrupted, so it is terminated
+    and a fresh one is started for a later file. Other extractions keep
+    running.
+    """
+
+    def __init__(self, workers=None, timeout=120):
+        self.workers = workers
+        self.timeout = timeout
+        self._idle = []
+        self._running = 0
+        self._available = threading.Condition()
+        # spawn: forking a threaded server process can copy held locks
+        self._context = multiprocessing.get_context('spawn')
+
+    def configure(self, workers=None, timeout=120):
+        """Set the pool size and per-file timeout; a smaller size takes effect as busy processes finish"""
+        self.workers = workers
+        self.timeout = timeout
+
+    @property
+    def size(self):
+        """Number of worker processes the pool runs"""
+        return self.workers or os.cpu_count() or 1
+
+    def extract(self, path):
+        """Return the text of a CV file, parsed in a worker process"""
+        worker = self._checkout()
+        try:
+            worker.conn.send(path)
+            finished = worker.conn.poll(self.timeout)
+            ok, value = worker.conn.recv() if finished else (False, None)
+        except BaseException as e:
+            self._discard(worker)
+            if isinstance(e, (EOFError, OSError)):
+                # The process died mid-parse, e.g. killed for memory
+                raise RuntimeError(f'CV extraction process exited while parsing {os.path.basename(path)}')
+            raise
+        if not finished:
+            self._discard(worker)
+            raise TimeoutError(f'Extracting {os.path.basename(path)} took over {self.timeout} seconds')
+        self._checkin(worker)
+        if not ok:
+            raise value
+        return value
+
+    def _checkout(self):
+        with self._available:
+            while not self._idle and self._running >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._running += 1
+        try:
+            return _Worker(self._context)
+        except Exception:
+            self._release()
+            raise
+
+    def _checkin(self, worker):
+        with self._available:
+            if self._running <= self.size:
+                self._idle.append(worker)
+                self._available.notify()
+                return
+        # The pool was configured smaller
+        self._discard(worker)
+
+    def _discard(self, worker):
+        worker.stop()
+        self._release()
+
+    def _release(self):
+        with self._available:
+            self._running -= 1
+            self._available.notify()
+
+cv_extractor = CVTextExtractor()
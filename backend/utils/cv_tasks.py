@@ -0,0 +1,17 @@
+import os
+from flask import current_app
+from models.cv_blob_model import CVBlob
+from utils.cv_extractor import cv_extractor
+from utils.file_handler import delete_cv_file
+from utils.task_queue import task
+
+@task(name='cv.delete_file', priority=1)
+def delete_replaced_cv(filename):
+    """Delete a CV file from before content-addressed storage after its profile moved on"""
+    delete_cv_file(filename)
+
+@task(name='cv.extract_text', max_attempts=3)
+def extract_cv_text(sha256, stored_path):
+    """Extract a stored CV's text; the cv_blobs trigger indexes it for candidate search"""
+    text = cv_extractor.extract(os.path.join(current_app.config['UPLOAD_FOLDER'], stored_path))
+    CVBlob.save_text(sha256, text)
@@ -0,0 +1,121 @@
+"""Plain-text extraction from uploaded CVs.
+
+These functions only read files and return strings, so they can run in
+worker processes. DOCX is a zip of WordprocessingML; PDF text is taken
+from the string operands of the text-showing operators in each content
+stream. Legacy binary .doc files are not parsed.
+"""
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+MAX_TEXT_CHARS = 200000  # stored and indexed per CV
+MAX_PART_BYTES = 32 * 1024 * 1024  # decompressed size of one DOCX part or PDF stream
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_PARTS = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+_PDF_STREAM = re.compile(rb'(?<!end)stream\r?\n')
+_PDF_TOKEN = re.compile(
+    rb'\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)'  # literal string, one level of nested parens
+    rb'|<[0-9A-Fa-f\s]*>'                         # hex string
+    rb'|-?\d*\.?\d+'                              # number (kerning inside TJ arrays)
+    rb"|T[dD*]|'|\"|ET",                          # operators that move to a new line
+    re.S
+)
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_PDF_ESCAPE = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.S)
+
+# TJ offsets below this (in thousandths of an em) are treated as a word gap
+_PDF_WORD_GAP = -200
+
+def extract_text(path):
+    """Return the text of a CV, normalized and capped at MAX_TEXT_CHARS"""
+    extension = path.rsplit('.', 1)[-1].lower()
+    if extension == 'docx':
+        text = _docx_text(path)
+    elif extension == 'pdf':
+        text = _pdf_text(path)
+    else:
+        return ''
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:MAX_TEXT_CHARS]
+
+def _docx_text(path):
+    paragraphs = []
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not _DOCX_PARTS.match(info.filename) or info.file_size > MAX_PART_BYTES:
+                continue
+            with archive.open(info) as part:
+                runs = []
+                for _, element in ElementTree.iterparse(part):
+                    tag = element.tag
+                    if tag == _WORD_NS + 't' and element.text:
+                        runs.append(element.text)
+                    elif tag in (_WORD_NS + 'tab', _WORD_NS + 'br'):
+                        runs.append(' ')
+                    elif tag == _WORD_NS + 'p':
+                        paragraphs.append(''.join(runs))
+                        runs = []
+                        element.clear()
+    return '\n'.join(paragraphs)
+
+def _pdf_text(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    pieces = []
+    for match in _PDF_STREAM.finditer(data):
+        end = data.find(b'endstream', match.end())
+        if end < 0:
+            break
+        header = data[data.rfind(b'obj', 0, match.start()) + 3:match.start()]
+        raw = data[match.end():end]
+        if b'/FlateDecode' in header:
+            try:
+                raw = zlib.decompressobj().decompress(raw, MAX_PART_BYTES)
+            except zlib.error:
+                continue
+        elif b'/Filter' in header:
+            # Images and other encodings carry no text
+            continue
+        if b'BT' in raw:
+            pieces.append(_pdf_content_text(raw))
+    return '\n'.join(pieces)
+
+def _pdf_content_text(content):
+    out = []
+    for match in _PDF_TOKEN.finditer(content):
+        token = match.group()
+        first = token[:1]
+        if first == b'(':
+            out.append(_decode_pdf_bytes(_PDF_ESCAPE.sub(_unescape, token[1:-1])))
+        elif first == b'<':
+            hex_digits = re.sub(rb'\s', b'', token[1:-1])
+            if len(hex_digits) % 2:
+                hex_digits += b'0'
+            out.append(_decode_pdf_bytes(bytes.fromhex(hex_digits.decode('ascii'))))
+        elif first in b'-.0123456789':
+            if float(token) < _PDF_WORD_GAP:
+                out.append(' ')
+        else:
+            out.append('\n')
+    return ''.join(out)
+
+def _unescape(match):
+    escaped = match.group(1)
+    if escaped[:1].isdigit():
+        return bytes([int(escaped, 8) & 0xFF])
+    if escaped in (b'\n', b'\r', b'\r\n'):
+        return b''  # line continuation
+    return _PDF_ESCAPES.get(escaped, escaped)
+
+def _decode_pdf_bytes(raw):
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', 'ignore')
+    # Two-byte glyph codes from Identity-encoded fonts are often plain UTF-16
+    if len(raw) >= 2 and raw[0::2].count(0) == len(raw) // 2:
+        return raw.decode('utf-16-be', 'ignore')
+    return raw.decode('latin-1')
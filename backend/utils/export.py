@@ -0,0 +1,21 @@
+import csv
+import io
+import json
+
+def csv_chunks(columns, batches):
+    """Encode row batches as CSV, yielding one chunk per batch after the header"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(tuple(row) for row in rows)
+        yield buffer.getvalue()
+
+def ndjson_chunks(batches):
+    """Encode row batches as one JSON object per line, yielding one chunk per batch"""
+    for rows in batches:
+        yield ''.join(json.dumps(dict(row), default=str) + '\n' for row in rows)
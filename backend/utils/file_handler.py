@@ -1,29 +1,78 @@
+import hashlib
+import mimetypes
 import os
-import uuid
+import tempfile
+import time
+from flask import current_app, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
-from flask import current_app
+
+# Uploads are copied and hashed this many bytes at a time
+CHUNK_SIZE = 64 * 1024
+
+# Content-addressed CVs live under UPLOAD_FOLDER/cv/<aa>/<bb>/<sha256>.<ext>
+BLOB_DIR = 'cv'
+SPOOL_DIR = os.path.join(BLOB_DIR, 'tmp')
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
-def save_cv_file(file):
-    """Save uploaded CV file and return filename"""
-    if file and allowed_file(file.filename):
-        # Generate unique filename
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
-        
-        # Create uploads directory if it doesn't exist
-        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
-        
-        # Save file
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
-        
-        return unique_filename
-    return None
+def blob_path(sha256, extension):
+    """Relative storage path of a blob, sharded by the first two bytes of its hash"""
+    return '/'.join([BLOB_DIR, sha256[:2], sha256[2:4], f'{sha256}.{extension}'])
+
+def spool_cv_file(file):
+    """Stream an uploaded CV to a temporary file while hashing it.
+
+    Returns {'sha256', 'size', 'path', 'temp_path'} or None for a
+    disallowed file type. The temporary file sits on the same filesystem
+    as the blob store so publishing it is an atomic rename.
+    """
+    if not file or not allowed_file(file.filename):
+        return None
+
+    spool_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], SPOOL_DIR)
+    os.makedirs(spool_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=spool_dir, prefix='upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+    sha256 = digest.hexdigest()
+    extension = file.filename.rsplit('.', 1)[1].lower()
+    return {'sha256': sha256, 'size': size, 'path': blob_path(sha256, extension), 'temp_path': temp_path}
+
+def publish_cv_file(spooled, stored_path):
+    """Move a spooled upload into the blob store once its reference is committed.
+
+    When the content is already stored the upload is simply dropped.
+    """
+    final_path = os.path.join(current_app.config['UPLOAD_FOLDER'], stored_path)
+    if os.path.exists(final_path):
+        discard_cv_file(spooled)
+        return False
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(spooled['temp_path'], final_path)
+    return True
+
+def discard_cv_file(spooled):
+    """Remove a spooled upload that will not be published"""
+    if os.path.exists(spooled['temp_path']):
+        os.remove(spooled['temp_path'])
 
 def delete_cv_file(filename):
     """Delete CV file from uploads folder"""
@@ -32,4 +81,79 @@ def delete_cv_file(filename):
         if os.path.exists(file_path):
             os.remove(file_path)
             return True
-    return False
\ No newline at end of file
+    return False
+
+def delete_unregistered_cv_file(stored_path, is_registered):
+    """Delete a blob file whose row was removed, unless an upload registered it again.
+
+    The file is renamed aside first: from then on an upload of the same
+    content finds no file and publishes its own copy. An upload committed
+    before that may have dropped its copy, so if is_registered(stored_path)
+    reports one the file is moved back. Returns True when it was deleted.
+    """
+    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], stored_path)
+    retired_path = file_path + '.gc'
+    try:
+        os.replace(file_path, retired_path)
+    except FileNotFoundError:
+        return False
+    if is_registered(stored_path):
+        # Same content, so replacing a copy published meanwhile is harmless
+        os.replace(retired_path, file_path)
+        return False
+    os.remove(retired_path)
+    return True
+
+def delete_stale_spool_files(max_age_seconds):
+    """Remove spooled uploads abandoned by crashed requests; returns how many were removed"""
+    spool_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], SPOOL_DIR)
+    if not os.path.isdir(spool_dir):
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for entry in os.scandir(spool_dir):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+def send_cv_file(stored_path, download_name):
+    """Build the response for a stored CV.
+
+    Served directly, Werkzeug answers Range and conditional requests and
+    hands the open file to the server's wsgi.file_wrapper, which sendfile()s
+    it. With CV_OFFLOAD set the body is left to the front proxy instead:
+    'x-accel-redirect' for nginx, 'x-sendfile' for Apache or lighttpd.
+    """
+    full_path = safe_join(current_app.config['UPLOAD_FOLDER'], stored_path)
+    if full_path is None or not os.path.isfile(full_path):
+        raise NotFound()
+    # send_file resolves relative paths against the app root, and X-Sendfile
+    # hands the path to the proxy as is
+    full_path = os.path.abspath(full_path)
+
+    extension = stored_path.rsplit('.', 1)[-1].lower()
+    download_name = f"{secure_filename(download_name) or 'cv'}.{extension}"
+    mimetype = mimetypes.guess_type(stored_path)[0] or 'application/octet-stream'
+    # Content-addressed files never change, so the hash is a strong validator
+    name = os.path.basename(stored_path)
+    etag = name.rsplit('.', 1)[0] if stored_path.startswith(BLOB_DIR + '/') else True
+
+    offload = current_app.config.get('CV_OFFLOAD')
+    if offload == 'x-accel-redirect':
+        # nginx serves the internal location itself, including Range and validators
+        response = current_app.response_class(mimetype=mimetype)
+        prefix = current_app.config['CV_ACCEL_REDIRECT_PREFIX'].rstrip('/')
+        response.headers['X-Accel-Redirect'] = f'{prefix}/{stored_path}'
+        response.headers.set('Content-Disposition', 'inline', filename=download_name)
+    else:
+        # With CV_OFFLOAD=x-sendfile, USE_X_SENDFILE makes this an empty body with the header
+        response = send_file(full_path, mimetype=mimetype, download_name=download_name,
+                             conditional=True, etag=etag)
+
+    # The URL keeps its name when the student uploads a new CV: always revalidate
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.cache_control.max_age = None
+    return response
@@ -0,0 +1,305 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+from operator import itemgetter
+from models.job_model import Job, encode_cursor
+from models.location_model import Location
+from utils.validators import JOB_TYPES, WORK_MODES
+
+# Sort keys the snapshot can order by; others (title, relevance) go to SQL
+SORT_COLUMNS = ('posted_at', 'salary')
+
+# SQLite sorts NULL below every number and text above it
+NULL_SALARY = float('-inf')
+TEXT_SALARY = float('inf')
+
+# bytes.translate tables turning a column of category codes into a 0/1 mask;
+# code 0 is NULL, so a value is its list position plus one
+_JOB_TYPE_MASKS = {value: bytes(1 if code == i + 1 else 0 for code in range(256))
+                   for i, value in enumerate(JOB_TYPES)}
+_WORK_MODE_MASKS = {value: bytes(1 if code == i + 1 else 0 for code in range(256))
+                    for i, value in enumerate(WORK_MODES)}
+
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+def _salary_key(salary):
+    if salary is None:
+        return NULL_SALARY
+    if isinstance(salary, (int, float)):
+        return float(salary)
+    return TEXT_SALARY
+
+def _and(masks, size):
+    """Combine 0/1 byte masks with one big-integer AND"""
+    result = -1
+    for mask in masks:
+        result &= int.from_bytes(mask, 'little')
+    return result.to_bytes(size, 'little')
+
+def _permutation(indexes):
+    """Return a function picking values[i] for each i in indexes, as one C-level call"""
+    if len(indexes) == 1:
+        # itemgetter returns a bare item rather than a tuple for one index
+        index = indexes[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indexes)
+
+class JobSnapshot:
+    """In-memory, column-oriented snapshot of jobs for filter-only search.
+
+    Searches without a keyword or skills filter only look at job type,
+    work mode, location, salary and posting time. Those live here in
+    parallel typed arrays, one slot per job, with job type and work mode
+    as one-byte codes and locations interned together with their
+    gazetteer id. A search builds a 0/1 byte mask per filter
+    (bytes.translate for codes, posting sets for locations and radius
+    searches, the salary order for salary_min), ANDs them as big
+    integers, permutes the result into the requested sort order with a
+    cached itemgetter and reads the page off with bytes.find. Only the
+    page is hydrated from SQLite.
+
+    Slots sorted by (key, job id) are kept for each sort column and
+    updated with insort as jobs change. Like the recommender, the snapshot
+    replays the job_changes log before every search, so writes from any
+    process are visible to the next request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._slots = {}
+        self._job_ids = array('q')
+        self._salary = array('d')
+        self._posted = array('q')
+        self._job_type = bytearray()
+        self._work_mode = bytearray()
+        self._location = array('l')
+        self._active = bytearray()
+        self._location_codes = {}
+        self._location_names = []
+        self._location_ids = []
+        self._location_slots = []
+        self._orders = {}
+        self._gathers = {}
+        self._scatters = {}
+        self._last_seq = 0
+        self._loaded = False
+
+    def _key(self, sort_by):
+        column = self._salary if sort_by == 'salary' else self._posted
+        job_ids = self._job_ids
+        return lambda slot: (column[slot], job_ids[slot])
+
+    def _store(self, row):
+        """Insert or overwrite the slot for one job row"""
+        slot = self._slots.get(row['id'])
+        if slot is None:
+            slot = len(self._job_ids)
+            self._slots[row['id']] = slot
+            self._job_ids.append(row['id'])
+            for column in (self._salary, self._posted, self._job_type, self._work_mode, self._location,
+                           self._active):
+                column.append(0)
+        else:
+            self._location_slots[self._location[slot]].discard(slot)
+            for sort_by, order in self._orders.items():
+                key = self._key(sort_by)
+                del order[bisect_left(order, key(slot), key=key)]
+
+        # Rows not yet resolved against the gazetteer keep their own code
+        location = (row['location'] or '', row['location_id'])
+        location_code = self._location_codes.get(location)
+        if location_code is None:
+            location_code = self._location_codes[location] = len(self._location_names)
+            self._location_names.append(location[0].translate(_ASCII_LOWER))
+            self._location_ids.append(location[1])
+            self._location_slots.append(set())
+
+        self._salary[slot] = _salary_key(row['salary'])
+        self._posted[slot] = row['posted_ts'] or 0
+        self._job_type[slot] = JOB_TYPES.index(row['job_type']) + 1 if row['job_type'] in JOB_TYPES else 0
+        self._work_mode[slot] = WORK_MODES.index(row['work_mode']) + 1 if row['work_mode'] in WORK_MODES else 0
+        self._location[slot] = location_code
+        self._location_slots[location_code].add(slot)
+        self._active[slot] = 1 if row['is_active'] else 0
+
+        for sort_by, order in self._orders.items():
+            insort(order, slot, key=self._key(sort_by))
+
+    def refresh(self):
+        """Load the snapshot on first use, then replay job changes since the last call"""
+        with self._lock:
+            if not self._loaded:
+                self._full_load()
+                return
+
+            job_ids, last_seq, gap = Job.get_changes_since(self._last_seq)
+            if gap:
+                self._reset()
+                self._full_load()
+                return
+            if job_ids:
+                found = set()
+                for row in Job.get_jobs_for_index(job_ids):
+                    self._store(row)
+                    found.add(row['id'])
+                # Deleted rows are simply gone; their slots stay but never match
+                for job_id in job_ids:
+                    if job_id not in found and job_id in self._slots:
+                        self._active[self._slots[job_id]] = 0
+                self._gathers.clear()
+                self._scatters.clear()
+                self._last_seq = last_seq
+
+    def _full_load(self):
+        # Read the log position first so writes during the load are replayed later
+        self._last_seq = Job.get_last_change_seq()
+        for row in Job.get_jobs_for_index():
+            self._store(row)
+        self._orders = {sort_by: array('l', sorted(range(len(self._job_ids)), key=self._key(sort_by)))
+                        for sort_by in SORT_COLUMNS}
+        self._loaded = True
+
+    def _gather(self, sort_by):
+        """itemgetter reading a slot-ordered mask in (key, job id) order"""
+        gather = self._gathers.get(sort_by)
+        if gather is None:
+            gather = self._gathers[sort_by] = _permutation(self._orders[sort_by])
+        return gather
+
+    def _scatter(self, sort_by):
+        """itemgetter reading an order-ranked mask back in slot order"""
+        scatter = self._scatters.get(sort_by)
+        if scatter is None:
+            ranks = array('l', [0]) * len(self._orders[sort_by])
+            for rank, slot in enumerate(self._orders[sort_by]):
+                ranks[slot] = rank
+            scatter = self._scatters[sort_by] = _permutation(ranks)
+        return scatter
+
+    @staticmethod
+    def supports(keyword=None, location=None, skills=None, sort_by='posted_at', order='DESC', **filters):
+        """Whether search() can answer these parameters exactly"""
+        if keyword or skills:
+            return False
+        # LIKE treats % and _ in the location as wildcards
+        if location and ('%' in location or '_' in location):
+            return False
+        return Job._search_order(sort_by, order, None)[0] in SORT_COLUMNS
+
+    def search(self, location=None, job_type=None, work_mode=None, salary_min=None,
+               sort_by='posted_at', order='DESC', offset=0, limit=20, location_ids=None):
+        """Return (job_ids, total) for active jobs matching the filters, in search order"""
+        sort_by, order, _ = Job._search_order(sort_by, order, None)
+        location_id = Location.get_id(location)
+        self.refresh()
+
+        with self._lock:
+            size = len(self._job_ids)
+            if not size:
+                return [], 0
+            masks = [self._active]
+
+            if job_type:
+                table = _JOB_TYPE_MASKS.get(job_type)
+                if table is None:
+                    return [], 0
+                masks.append(self._job_type.translate(table))
+
+            if work_mode:
+                table = _WORK_MODE_MASKS.get(work_mode)
+                if table is None:
+                    return [], 0
+                masks.append(self._work_mode.translate(table))
+
+            if location and location_id is not None:
+                masks.append(self._location_mask(size, lambda code: self._location_ids[code] == location_id))
+            elif location:
+                # Same as LIKE '%location%': a substring, case-insensitive for ASCII only
+                needle = location.translate(_ASCII_LOWER)
+                masks.append(self._location_mask(size, lambda code: needle in self._location_names[code]))
+
+            if location_ids is not None:
+                wanted = set(location_ids)
+                masks.append(self._location_mask(size, lambda code: self._location_ids[code] in wanted))
+
+            if salary_min:
+                # The salary order holds every salary >= salary_min in one suffix
+                order_by_salary = self._orders['salary']
+                start = bisect_left(order_by_salary, float(salary_min),
+                                    key=lambda slot: self._salary[slot])
+                masks.append(bytes(self._scatter('salary')(b'\0' * start + b'\1' * (size - start))))
+
+            ranked = bytes(self._gather(sort_by)(_and(masks, size) if len(masks) > 1 else self._active))
+            total = ranked.count(1)
+            order_slots = self._orders[sort_by]
+
+            positions = []
+            if order == 'ASC':
+                position = -1
+                for _ in range(min(offset + limit, total)):
+                    position = ranked.find(1, position + 1)
+                    positions.append(position)
+            else:
+                position = size
+                for _ in range(min(offset + limit, total)):
+                    position = ranked.rfind(1, 0, position)
+                    positions.append(position)
+            return [self._job_ids[order_slots[position]] for position in positions[offset:]], total
+
+    def _location_mask(self, size, matches):
+        """0/1 mask of the slots whose location code satisfies matches(code)"""
+        mask = bytearray(size)
+        for code, slots in enumerate(self._location_slots):
+            if matches(code):
+                for slot in slots:
+                    mask[slot] = 1
+        return mask
+
+    def search_page(self, location=None, job_type=None, work_mode=None, salary_min=None,
+                    sort_by='posted_at', order='DESC', page=1, per_page=20, location_ids=None):
+        """Return (jobs, next_cursor, total) like Job.search_jobs, hydrating only the page"""
+        job_ids, total = self.search(location, job_type, work_mode, salary_min, sort_by, order,
+                                     offset=(page - 1) * per_page, limit=per_page, location_ids=location_ids)
+        jobs = Job.get_jobs_by_ids(job_ids)
+
+        next_cursor = None
+        if len(jobs) == per_page:
+            sort_by, order, _ = Job._search_order(sort_by, order, None)
+            next_cursor = encode_cursor(sort_by, order, jobs[-1][sort_by], jobs[-1]['id'], 'next')
+        return jobs, next_cursor, total
+
+    def stats(self):
+        """Return snapshot size and memory footprint"""
+        with self._lock:
+            columns = (self._job_ids, self._salary, self._posted, self._job_type, self._work_mode,
+                       self._location, self._active)
+            column_bytes = sum(sys.getsizeof(column) for column in columns)
+            order_bytes = sum(sys.getsizeof(order) for order in self._orders.values())
+            # The slot and location lookups, counting the int objects they hold
+            lookup_bytes = sys.getsizeof(self._slots) + sum(sys.getsizeof(job_id) for job_id in self._slots)
+            lookup_bytes += sys.getsizeof(self._location_codes) + sys.getsizeof(self._location_slots)
+            lookup_bytes += sum(sys.getsizeof(location[0]) for location in self._location_codes)
+            lookup_bytes += sum(sys.getsizeof(name) for name in self._location_names)
+            lookup_bytes += sum(sys.getsizeof(slots) for slots in self._location_slots)
+            # A cached itemgetter keeps a tuple of int objects, one per slot
+            getters = len(self._gathers) + len(self._scatters)
+            getter_bytes = getters * len(self._job_ids) * (8 + sys.getsizeof(len(self._job_ids)))
+            return {
+                'jobs': len(self._job_ids),
+                'active_jobs': self._active.count(1),
+                'locations': len(self._location_names),
+                'last_change_seq': self._last_seq,
+                'memory_bytes': {
+                    'columns': column_bytes,
+                    'sort_orders': order_bytes,
+                    'lookups': lookup_bytes,
+                    'permutations': getter_bytes,
+                    'total': column_bytes + order_bytes + lookup_bytes + getter_bytes,
+                },
+            }
+
+job_snapshot = JobSnapshot()
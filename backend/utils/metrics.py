@@ -0,0 +1,274 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import request
+from database.db import pool_stats, request_sql_counters, writer_stats
+from models.task_model import Task
+from utils.response_cache import response_cache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    'http_requests_total': ('counter', 'Requests handled', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency inside the app', DURATION_BUCKETS),
+    'db_statements_total': ('counter', 'SQL statements executed by requests', None),
+    'db_seconds_total': ('counter', 'Time requests spent executing SQL and fetching rows', None),
+    'db_statements_per_request': ('histogram', 'SQL statements per request', STATEMENT_BUCKETS),
+    'db_pool_connections': ('gauge', 'Pooled database connections', None),
+    'db_pool_checkouts_total': ('counter', 'Connections checked out of the pool', None),
+    'db_pool_waits_total': ('counter', 'Checkouts that waited for a free connection', None),
+    'db_pool_wait_seconds_total': ('counter', 'Time spent waiting for a free connection', None),
+    'db_pool_timeouts_total': ('counter', 'Checkouts that gave up waiting', None),
+    'db_writer_transactions_total': ('counter', 'Transactions committed by the writer thread', None),
+    'db_writer_writes_total': ('counter', 'Writes applied by the writer thread', None),
+    'db_writer_queued': ('gauge', 'Writes waiting for the writer thread', None),
+    'response_cache_requests_total': ('counter', 'Response cache lookups', None),
+    'response_cache_evictions_total': ('counter', 'Entries evicted to stay within the size limit', None),
+    'response_cache_entries': ('gauge', 'Cached responses', None),
+    'response_cache_bytes': ('gauge', 'Size of cached responses', None),
+    'tasks': ('gauge', 'Background tasks in the queue', None),
+}
+
+# Metrics read from the database describe the whole deployment, not a process
+SHARED_METRICS = {'tasks'}
+
+class Metrics:
+    """Request, SQL, pool and cache metrics in the Prometheus text format.
+
+    Requests are recorded into a dict owned by the handling thread, so the
+    hot path takes no lock; render() sums the dicts of all threads. SQL
+    counts come from the instrumented connections of the request and of
+    the writer thread.
+
+    With METRICS_DIR set, each process also writes its values to
+    metrics-<pid>.json in that directory every METRICS_FLUSH_INTERVAL
+    seconds, and /metrics in any worker reports the sum over all of them.
+    Counters of exited processes are kept so totals never go backwards;
+    their gauges are dropped.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.flush_interval = 5.0
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._flusher_pid = None
+
+    def init_app(self, app):
+        """Record every request of app"""
+        self.directory = app.config.get('METRICS_DIR')
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', self.flush_interval)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _values(self):
+        values = getattr(self._local, 'values', None)
+        if values is None:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), values))
+        return values
+
+    def _inc(self, values, name, labels, amount=1):
+        key = (name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def _observe(self, values, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        entry = values.get(key)
+        if entry is None:
+            # One count per bucket plus +Inf, then the sum of observations
+            entry = values[key] = [0] * (len(buckets) + 2)
+        entry[bisect_left(buckets, value)] += 1
+        entry[-1] += value
+
+    def _before_request(self):
+        if self.directory and self._flusher_pid != os.getpid():
+            self._start_flusher()
+        # The environ, unlike g, is not shared with /batch sub-requests
+        request.environ['metrics.started'] = time.perf_counter()
+        request.environ['metrics.sql'] = request_sql_counters()
+
+    def _after_request(self, response):
+        started = request.environ.get('metrics.started')
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        values = self._values()
+
+        self._inc(values, 'http_requests_total',
+                  (('endpoint', endpoint), ('method', request.method), ('status', str(response.status_code))))
+        self._observe(values, 'http_request_duration_seconds', (('endpoint', endpoint),), elapsed)
+
+        statements, seconds = request_sql_counters()
+        base_statements, base_seconds = request.environ['metrics.sql']
+        statements -= base_statements
+        seconds -= base_seconds
+        labels = (('endpoint', endpoint),)
+        self._inc(values, 'db_statements_total', labels, statements)
+        self._inc(values, 'db_seconds_total', labels, seconds)
+        self._observe(values, 'db_statements_per_request', labels, statements)
+        return response
+
+    def _collect_requests(self):
+        """Sum the request metrics of every thread, folding in exited ones"""
+        total = {}
+        with self._lock:
+            alive = []
+            for thread, values in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, values))
+                else:
+                    _merge(self._retired, values)
+            self._shards = alive
+            _merge(total, self._retired)
+            for _, values in alive:
+                _merge(total, dict(values))
+        return total
+
+    def _collect_process(self):
+        """Pool and cache statistics of this process"""
+        pool = pool_stats()
+        writer = writer_stats()
+        cache = response_cache.stats()
+        return {
+            ('db_pool_connections', (('state', 'idle'),)): pool['idle'],
+            ('db_pool_connections', (('state', 'in_use'),)): pool['in_use'],
+            ('db_pool_checkouts_total', ()): pool['checkouts'],
+            ('db_pool_waits_total', ()): pool['waits'],
+            ('db_pool_wait_seconds_total', ()): pool['wait_time_ms'] / 1000,
+            ('db_pool_timeouts_total', ()): pool['timeouts'],
+            ('db_writer_transactions_total', ()): writer['transactions'],
+            ('db_writer_writes_total', ()): writer['writes'],
+            ('db_writer_queued', ()): writer['queued'],
+            ('response_cache_requests_total', (('result', 'hit'),)): cache['hits'],
+            ('response_cache_requests_total', (('result', 'miss'),)): cache['misses'],
+            ('response_cache_evictions_total', ()): cache['evictions'],
+            ('response_cache_entries', ()): cache['entries'],
+            ('response_cache_bytes', ()): cache['bytes'],
+        }
+
+    def collect(self):
+        """Return {(name, labels): value} for this process, or all processes with METRICS_DIR"""
+        values = self._collect_requests()
+        _merge(values, self._collect_process())
+        if self.directory:
+            _merge(values, self._read_other_processes())
+        counts = Task.get_counts()
+        for status in ('queued', 'running', 'dead'):
+            values[('tasks', (('status', status),))] = counts[status]
+        return values
+
+    def render(self):
+        """Format collect() as Prometheus text exposition"""
+        by_name = {}
+        for (name, labels), value in self.collect().items():
+            by_name.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name in sorted(by_name):
+            kind, help_text, buckets = METRICS[name]
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(by_name[name]):
+                if kind != 'histogram':
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + ('+Inf',), value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", str(bound)),))} {cumulative}')
+                lines.append(f'{name}_sum{_labels(labels)} {_number(value[-1])}')
+                lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def _start_flusher(self):
+        with self._lock:
+            # A forked worker inherits the flag but not the thread
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def flush(self):
+        """Write this process's values to METRICS_DIR"""
+        values = self._collect_requests()
+        _merge(values, self._collect_process())
+        path = os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump([[name, [list(pair) for pair in labels], value]
+                       for (name, labels), value in values.items()], f)
+        os.replace(temporary, path)
+
+    def _read_other_processes(self):
+        values = {}
+        own = f'metrics-{os.getpid()}.json'
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith('metrics-') and filename.endswith('.json')) or filename == own:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = _process_alive(int(filename[len('metrics-'):-len('.json')]))
+            for name, labels, value in entries:
+                if name not in METRICS or name in SHARED_METRICS:
+                    continue
+                if METRICS[name][0] == 'gauge' and not alive:
+                    continue
+                _merge(values, {(name, tuple(tuple(pair) for pair in labels)): value})
+        return values
+
+def _merge(into, values):
+    for key, value in values.items():
+        current = into.get(key)
+        if isinstance(value, list):
+            into[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+        else:
+            into[key] = value if current is None else current + value
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+metrics = Metrics()
@@ -0,0 +1,245 @@
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from models.job_model import Job
+from utils.validators import JOB_TYPES, WORK_MODES
+
+# Score weights; each component is scaled to 0..1 first
+WEIGHTS = {
+    'skills': 0.5,
+    'location': 0.15,
+    'salary': 0.15,
+    'job_type': 0.1,
+    'recency': 0.1,
+}
+RECENCY_HALF_LIFE_DAYS = 14
+CANDIDATE_BUDGET = 60000  # skill postings read (or jobs scored) per request at most
+
+def normalize_location(location):
+    """Reduce a free-text location to its city part for equality matching"""
+    if not location:
+        return ''
+    return ' '.join(location.split(',')[0].lower().split())
+
+class JobRecommender:
+    """In-memory, column-oriented index of jobs for scoring recommendations.
+
+    Each job occupies a slot in parallel typed arrays (salary, posting
+    time, categorical codes). Skills are stored as a sparse job x skill
+    matrix in column form: skill id -> sorted array of the slots of active
+    jobs. Scoring a student only touches the slots of jobs sharing a skill
+    with them, and the top-k is kept in a heap. The index replays the
+    job_changes log to pick up writes from any process.
+
+    Slots are assigned in posting order, so a higher slot is a newer job
+    and the newest postings of a skill are the tail of its array. A
+    request reads at most CANDIDATE_BUDGET postings, newest first, and
+    walks the candidates by skill overlap, highest first, newest first
+    within an overlap. A walk stops once even a job matching every other
+    signal could not enter the top-k. The ranking is exact whenever a
+    student's postings fit the budget; beyond it older matches are left
+    out. Students sharing no skill with any job are ranked the same way
+    over the newest active jobs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._slots = {}
+        self._job_ids = array('q')
+        self._salary = array('q')
+        self._posted = array('q')
+        self._job_type = array('b')
+        self._work_mode = array('b')
+        self._location = array('l')
+        self._active = bytearray()
+        self._skills = []
+        self._postings = {}
+        self._location_codes = {}
+        self._last_seq = 0
+        self._loaded = False
+
+    def _store(self, row):
+        """Insert or overwrite the slot for one job row"""
+        slot = self._slots.get(row['id'])
+        if slot is None:
+            slot = len(self._job_ids)
+            self._slots[row['id']] = slot
+            self._job_ids.append(row['id'])
+            for column in (self._salary, self._posted, self._job_type, self._work_mode, self._location):
+                column.append(0)
+            self._active.append(0)
+            self._skills.append(())
+        elif self._active[slot]:
+            for skill_id in self._skills[slot]:
+                posting = self._postings[skill_id]
+                del posting[bisect_left(posting, slot)]
+
+        location = normalize_location(row['location'])
+        location_code = self._location_codes.setdefault(location, len(self._location_codes))
+
+        self._salary[slot] = row['salary'] if row['salary'] is not None else -1
+        self._posted[slot] = row['posted_ts'] or 0
+        self._job_type[slot] = JOB_TYPES.index(row['job_type']) if row['job_type'] in JOB_TYPES else -1
+        self._work_mode[slot] = WORK_MODES.index(row['work_mode']) if row['work_mode'] in WORK_MODES else -1
+        self._location[slot] = location_code
+        self._active[slot] = 1 if row['is_active'] else 0
+
+        skill_ids = tuple(dict.fromkeys(int(s) for s in row['skill_ids'].split(','))) if row['skill_ids'] else ()
+        self._skills[slot] = skill_ids
+        if self._active[slot]:
+            for skill_id in skill_ids:
+                posting = self._postings.get(skill_id)
+                if posting is None:
+                    posting = self._postings[skill_id] = array('l')
+                # New jobs take the highest slot, so this is usually an append
+                insort(posting, slot)
+
+    def refresh(self):
+        """Load the index on first use, then replay job changes since the last call"""
+        with self._lock:
+            if not self._loaded:
+                self._full_load()
+                return
+
+            job_ids, last_seq, gap = Job.get_changes_since(self._last_seq)
+            if gap:
+                self._reset()
+                self._full_load()
+                return
+            if job_ids:
+                for row in Job.get_jobs_for_index(job_ids):
+                    self._store(row)
+                self._last_seq = last_seq
+
+    def _full_load(self):
+        # Read the log position first so writes during the load are replayed later
+        self._last_seq = Job.get_last_change_seq()
+        for row in Job.get_jobs_for_index():
+            self._store(row)
+        self._loaded = True
+
+    def recommend(self, skill_ids, location=None, expected_salary=None, job_type=None,
+                  limit=20, exclude_job_ids=()):
+        """Return [(job_id, score)] for the best matching active jobs"""
+        self.refresh()
+        now = time.time()
+
+        with self._lock:
+            excluded = {self._slots[j] for j in exclude_job_ids if j in self._slots}
+            postings = [self._postings[skill_id] for skill_id in set(skill_ids) if skill_id in self._postings]
+            oldest = self._oldest_within_budget(postings)
+            overlap = Counter()
+            for posting in postings:
+                overlap.update(posting[bisect_left(posting, oldest):])
+
+            if overlap:
+                levels = {}
+                for slot, count in overlap.items():
+                    levels.setdefault(count, []).append(slot)
+                walks = [(count, sorted(levels[count], reverse=True)) for count in sorted(levels, reverse=True)]
+            else:
+                # No skill overlap at all: rank every active job on the other signals
+                active = self._active
+                walks = [(0, (slot for slot in range(len(active) - 1, -1, -1) if active[slot]))]
+
+            skill_count = len(skill_ids) or 1
+            location_code = self._location_codes.get(normalize_location(location), -2)
+            preferred_type = JOB_TYPES.index(job_type) if job_type in JOB_TYPES else None
+            remote = WORK_MODES.index('remote')
+            half_life = RECENCY_HALF_LIFE_DAYS * 86400
+            salary, posted, types, modes, locations = (
+                self._salary, self._posted, self._job_type, self._work_mode, self._location
+            )
+            w_skills, w_location, w_salary, w_type, w_recency = (
+                WEIGHTS['skills'], WEIGHTS['location'], WEIGHTS['salary'],
+                WEIGHTS['job_type'], WEIGHTS['recency']
+            )
+            # The most the location, salary and job type signals can add for this student
+            best_other = ((w_location if location_code >= 0 else w_location * 0.5)
+                          + (w_salary if expected_salary else w_salary * 0.5)
+                          + (w_type if preferred_type is not None else w_type * 0.5))
+
+            def other_signals(slot):
+                total = 0.0
+                if locations[slot] == location_code:
+                    total += w_location
+                elif modes[slot] == remote:
+                    total += w_location * 0.5
+
+                job_salary = salary[slot]
+                if not expected_salary or job_salary < 0:
+                    total += w_salary * 0.5
+                elif job_salary >= expected_salary:
+                    total += w_salary
+                else:
+                    total += w_salary * job_salary / expected_salary
+
+                if preferred_type is None:
+                    total += w_type * 0.5
+                elif types[slot] == preferred_type:
+                    total += w_type
+                return total
+
+            best = []
+            budget = CANDIDATE_BUDGET
+            for count, slots in walks:
+                skill_part = w_skills * count / skill_count
+                ceiling = skill_part + best_other
+                for slot in slots:
+                    if slot in excluded:
+                        continue
+                    fresh = w_recency * 0.5 ** (max(now - posted[slot], 0) / half_life)
+                    # Older jobs with this overlap score no higher than the bound
+                    if len(best) == limit and best[0][0] > ceiling + fresh:
+                        break
+                    entry = (skill_part + fresh + other_signals(slot), slot)
+                    if len(best) < limit:
+                        heapq.heappush(best, entry)
+                    else:
+                        heapq.heappushpop(best, entry)
+                    budget -= 1
+                    if not budget:
+                        break
+                if not budget:
+                    break
+
+            best.sort(reverse=True)
+            return [(self._job_ids[slot], round(value, 4)) for value, slot in best]
+
+    @staticmethod
+    def _oldest_within_budget(postings):
+        """Lowest slot such that the postings at or above it fit CANDIDATE_BUDGET"""
+        def newer(slot):
+            return sum(len(posting) - bisect_left(posting, slot) for posting in postings)
+
+        if newer(0) <= CANDIDATE_BUDGET:
+            return 0
+        low, high = 0, max(posting[-1] for posting in postings if posting) + 1
+        while low < high:
+            middle = (low + high) // 2
+            if newer(middle) <= CANDIDATE_BUDGET:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def stats(self):
+        """Return index size information"""
+        with self._lock:
+            columns = (self._job_ids, self._salary, self._posted, self._job_type,
+                       self._work_mode, self._location)
+            return {
+                'jobs': len(self._job_ids),
+                'active_jobs': sum(self._active),
+                'skills': len(self._postings),
+                'column_bytes': sum(c.itemsize * len(c) for c in columns) + len(self._active),
+                'last_change_seq': self._last_seq,
+            }
+
+recommender = JobRecommender()
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+class ResponseCache:
+    """Bounded LRU/TTL cache of serialized responses validated against data versions.
+
+    Every entry records the data_versions of the scopes it was built from,
+    e.g. ('jobs',) for search results or ('job:42',) for a job, which the
+    database triggers bump on every write from any process. A request
+    passes the versions it read for its validators, and an entry is only
+    served while they still match, so a write handled by another worker
+    invalidates it at once.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=60):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0}
+
+    def configure(self, max_bytes=None, ttl=None):
+        """Change limits and drop every entry"""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if ttl is not None:
+                self.ttl = ttl
+            self._entries.clear()
+            self._bytes = 0
+
+    def get(self, key, versions):
+        """Return cached bytes for key if it was built from these versions, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+
+            body, built_from, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return None
+            if built_from != tuple(versions):
+                # Versions only grow; an entry newer than the request's is kept
+                if built_from < tuple(versions):
+                    self._remove(key)
+                    self._counters['stale'] += 1
+                self._counters['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return body
+
+    def set(self, key, body, versions):
+        """Store body as built from versions, read before the data was queried"""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                if self._entries[key][1] > tuple(versions):
+                    return
+                self._remove(key)
+            self._entries[key] = (body, tuple(versions), time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def _remove(self, key):
+        body = self._entries.pop(key)[0]
+        self._bytes -= len(body)
+
+    def stats(self):
+        """Return hit/miss/eviction counters and memory use"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+            stats['max_bytes'] = self.max_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+response_cache = ResponseCache()
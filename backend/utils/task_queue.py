@@ -0,0 +1,209 @@
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from functools import wraps
+from models.task_model import Task
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_DELAY = 5  # seconds before the first retry; doubles with every attempt
+RETRY_MAX_DELAY = 3600
+RECLAIM_INTERVAL = 30  # seconds between checks for expired leases
+
+class TaskQueue:
+    """Durable task queue stored in the tasks table.
+
+    Functions registered with @task get a .delay(*args, **kwargs) method
+    that stores the call (arguments must be JSON-serializable) and returns
+    at once. Workers lease tasks in priority order and run each inside an
+    app context; a failure is retried with exponential backoff and jitter
+    until max_attempts, after which the task is kept as 'dead'. A worker
+    that dies mid-task loses its lease and the task runs again, so tasks
+    must be safe to repeat.
+
+    The web process runs `threads` worker threads, started with the first
+    request or queued task; `flask run-tasks` runs workers on their own.
+    """
+
+    def __init__(self, threads=2, poll_interval=1.0, lease_seconds=300):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._registry = {}
+        self._app = None
+        self._workers = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Bind the queue to an app and start in-process workers with its first request"""
+        self._app = app
+        self.threads = app.config['TASK_WORKERS']
+        self.poll_interval = app.config['TASK_POLL_INTERVAL']
+        self.lease_seconds = app.config['TASK_LEASE_SECONDS']
+        app.before_request(self.ensure_workers)
+
+    def task(self, name=None, priority=0, max_attempts=5):
+        """Register a function as a task"""
+        def decorator(func):
+            task_name = name or f'{func.__module__}.{func.__name__}'
+            self._registry[task_name] = func
+
+            @wraps(func)
+            def delay(*args, **kwargs):
+                task_id = Task.enqueue(task_name, args, kwargs, priority=priority, max_attempts=max_attempts)
+                self.ensure_workers()
+                with self._wakeup:
+                    self._wakeup.notify()
+                return task_id
+
+            func.task_name = task_name
+            func.delay = delay
+            return func
+        return decorator
+
+    def ensure_workers(self):
+        """Start the in-process worker threads, replacing any that died"""
+        if not self.threads or self._app is None:
+            return
+        if self._workers and all(worker.is_alive() for worker in self._workers):
+            return
+        with self._lock:
+            if self._workers:
+                self._replace_dead()
+            else:
+                self._workers = self._start_threads(self.threads)
+
+    def _replace_dead(self):
+        for number, worker in enumerate(self._workers):
+            if not worker.is_alive() and not self._stop.is_set():
+                logger.error('Task worker thread %s died; starting a replacement', worker.name)
+                self._workers[number] = self._start_thread(number)
+
+    def _start_threads(self, count):
+        self._stop.clear()
+        return [self._start_thread(number) for number in range(count)]
+
+    def _start_thread(self, number):
+        worker = f'{socket.gethostname()}:{os.getpid()}:{number}'
+        thread = threading.Thread(target=self._run, args=(worker,), name=f'task-worker-{number}', daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self, worker):
+        # Spread lease checks so the workers of one process do not run them together
+        next_reclaim = time.monotonic() + random.uniform(0, RECLAIM_INTERVAL)
+        while not self._stop.is_set():
+            with self._app.app_context():
+                if time.monotonic() >= next_reclaim:
+                    self._reclaim()
+                    next_reclaim = time.monotonic() + RECLAIM_INTERVAL
+                ran = self.run_once(worker)
+            if not ran:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+
+    def _reclaim(self):
+        try:
+            reclaimed = Task.reclaim_expired()
+            if reclaimed:
+                logger.warning('Requeued %d tasks with expired leases', reclaimed)
+        except Exception:
+            logger.exception('Checking for expired task leases failed')
+
+    def run_once(self, worker):
+        """Claim and run one due task; returns False when none was due"""
+        try:
+            task = Task.claim(worker, self.lease_seconds)
+        except Exception:
+            logger.exception('Claiming a task failed')
+            return False
+        if task is None:
+            return False
+
+        func = self._registry.get(task['name'])
+        try:
+            if func is None:
+                raise LookupError(f"Unknown task {task['name']}")
+            func(*task['args'], **task['kwargs'])
+        except Exception:
+            delay = min(RETRY_BASE_DELAY * 2 ** (task['attempts'] - 1), RETRY_MAX_DELAY)
+            status = self._record(Task.fail, task, worker, traceback.format_exc(limit=5),
+                                  random.uniform(delay / 2, delay))
+            logger.exception('Task %s (%s) failed on attempt %d/%d, now %s', task['id'], task['name'],
+                             task['attempts'], task['max_attempts'], status or 'still leased')
+        else:
+            self._record(Task.complete, task, worker)
+        return True
+
+    def _record(self, outcome, task, worker, *args):
+        """Store a task's result; on error log it and return None so the worker keeps running.
+
+        The task stays leased and runs again once the lease expires.
+        """
+        try:
+            return outcome(task['id'], worker, *args)
+        except Exception:
+            logger.exception('Recording the result of task %s (%s) failed', task['id'], task['name'])
+            return None
+
+    def run_forever(self, threads, processes=1):
+        """Run workers in the foreground until interrupted (flask run-tasks)"""
+        if processes > 1:
+            context = multiprocessing.get_context('spawn')
+            children = [context.Process(target=_run_worker_process, args=(threads,), name=f'task-process-{n}')
+                        for n in range(processes)]
+            for child in children:
+                child.start()
+            try:
+                for child in children:
+                    child.join()
+            except KeyboardInterrupt:
+                # The children got the same SIGINT and finish their current task
+                for child in children:
+                    child.join()
+            return
+
+        with self._lock:
+            self._workers = self._start_threads(threads)
+        try:
+            while not self._stop.wait(1):
+                with self._lock:
+                    self._replace_dead()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Ask workers to exit after their current task and wait for them"""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        with self._lock:
+            for worker in self._workers:
+                worker.join()
+            self._workers = []
+
+    def stats(self):
+        """Return task counts by status and the number of local worker threads"""
+        counts = Task.get_counts()
+        counts['local_workers'] = sum(1 for worker in self._workers if worker.is_alive())
+        return counts
+
+def _run_worker_process(threads):
+    from app import create_app
+    create_app()
+    try:
+        task_queue.run_forever(threads)
+    except KeyboardInterrupt:
+        pass
+
+task_queue = TaskQueue()
+task = task_queue.task
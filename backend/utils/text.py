@@ -0,0 +1,4 @@
+def normalize_token(raw):
+    """Normalize a skill or place name: lowercase, single spaces, no stray punctuation"""
+    name = ' '.join(raw.lower().split())
+    return name.strip(' .-_*')
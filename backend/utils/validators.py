@@ -0,0 +1,9 @@
+JOB_TYPES = ['full-time', 'part-time', 'internship', 'contract']
+WORK_MODES = ['remote', 'onsite', 'hybrid']
+
+def validate_job_choices(data):
+    """Return an error message for a work_mode or job_type outside the allowed values, or None"""
+    for field, allowed in (('work_mode', WORK_MODES), ('job_type', JOB_TYPES)):
+        if data.get(field) is not None and data[field] not in allowed:
+            return f"{field} must be one of {', '.join(allowed)}"
+    return None
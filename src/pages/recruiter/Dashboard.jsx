@@ -33,9 +33,9 @@ const RecruiterDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [profileResponse, jobsResponse] = await Promise.all([
-        apiClient.get('/recruiter/profile'),
-        apiClient.get('/recruiter/jobs'),
+      const [profileResponse, jobsResponse] = await apiClient.batch([
+        '/recruiter/profile',
+        '/recruiter/jobs',
       ]);
       
       setProfile(profileResponse.profile);
@@ -11,16 +11,30 @@ const JobApplications = () => {
   const [error, setError] = useState('');
   const [applications, setApplications] = useState([]);
   const [jobTitle, setJobTitle] = useState('');
+  const [counts, setCounts] = useState({});
+  const [statusFilter, setStatusFilter] = useState('');
+  const [sort, setSort] = useState('applied_at');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const applicationParams = (cursor) => {
+    const params = { sort, limit: 50 };
+    if (statusFilter) params.status = statusFilter;
+    if (cursor) params.cursor = cursor;
+    return params;
+  };
 
   const fetchData = async () => {
     setLoading(true);
     setError('');
     try {
       const [appsRes, jobRes] = await Promise.all([
-        apiClient.get(`/recruiter/jobs/${jobId}/applications`),
+        apiClient.get(`/recruiter/jobs/${jobId}/applications`, applicationParams()),
         apiClient.get(`/jobs/${jobId}`),
       ]);
       setApplications(appsRes.applications || []);
+      setCounts(appsRes.counts || {});
+      setNextCursor(appsRes.pagination?.next_cursor || null);
       setJobTitle(jobRes.job?.title || '');
     } catch (err) {
       setError(err.message || 'Failed to load applications');
@@ -29,7 +43,29 @@ const JobApplications = () => {
     }
   };
 
-  useEffect(() => { fetchData(); }, [jobId]);
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const appsRes = await apiClient.get(`/recruiter/jobs/${jobId}/applications`, applicationParams(nextCursor));
+      setApplications((current) => [...current, ...(appsRes.applications || [])]);
+      setCounts(appsRes.counts || {});
+      setNextCursor(appsRes.pagination?.next_cursor || null);
+    } catch (err) {
+      setError(err.message || 'Failed to load applications');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  useEffect(() => { fetchData(); }, [jobId, statusFilter, sort]);
+
+  const viewCv = async (studentId) => {
+    try {
+      await apiClient.openFile(`/cvs/${studentId}`);
+    } catch (err) {
+      setError(err.message || 'Failed to open CV');
+    }
+  };
 
   const updateStatus = async (applicationId, status) => {
     try {
@@ -40,6 +76,20 @@ const JobApplications = () => {
     }
   };
 
+  const rejectAllPending = async () => {
+    if (!window.confirm(`Reject all ${counts.pending || 0} pending applications?`)) return;
+    try {
+      await apiClient.put('/recruiter/applications/status', {
+        status: 'rejected',
+        job_id: Number(jobId),
+        from_status: 'pending',
+      });
+      fetchData();
+    } catch (err) {
+      setError(err.message || 'Failed to update status');
+    }
+  };
+
   if (loading) {
     return (
       <div className="flex items-center justify-center min-h-64">
@@ -57,6 +107,31 @@ const JobApplications = () => {
 
       {error && <div className="mb-4 bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded-lg text-sm">{error}</div>}
 
+      <div className="flex flex-wrap items-center justify-between gap-3">
+        <div className="flex flex-wrap gap-2">
+          {['', ...statusOptions].map((s) => (
+            <button
+              key={s || 'all'}
+              onClick={() => setStatusFilter(s)}
+              className={`px-3 py-1.5 rounded-lg border text-sm ${statusFilter === s ? 'bg-purple-600 text-white border-purple-600' : 'border-gray-300 hover:bg-gray-50'}`}
+            >
+              {s || 'all'} ({(s ? counts[s] : counts.total) || 0})
+            </button>
+          ))}
+        </div>
+        <div className="flex items-center gap-3">
+          {counts.pending > 0 && (
+            <button onClick={rejectAllPending} className="px-3 py-2 border border-red-200 text-red-700 rounded-lg hover:bg-red-50 text-sm">
+              Reject all pending
+            </button>
+          )}
+          <select value={sort} onChange={(e) => setSort(e.target.value)} className="px-3 py-2 border border-gray-300 rounded-lg">
+            <option value="applied_at">Newest first</option>
+            <option value="match">Best match</option>
+          </select>
+        </div>
+      </div>
+
       {applications.length === 0 ? (
         <div className="text-center py-16 bg-white/60 rounded-2xl border border-purple-100">No applications yet</div>
       ) : (
@@ -65,13 +140,18 @@ const JobApplications = () => {
             <div key={app.id} className="bg-white/80 backdrop-blur-lg rounded-2xl shadow-lg border border-purple-100 p-6">
               <div className="flex items-center justify-between">
                 <div>
-                  <h3 className="text-lg font-semibold text-gray-900">{app.name}</h3>
+                  <h3 className="text-lg font-semibold text-gray-900">
+                    {app.name}
+                    {app.match_score !== undefined && (
+                      <span className="ml-2 text-sm font-medium text-purple-600">{Math.round(app.match_score * 100)}% match</span>
+                    )}
+                  </h3>
                   <div className="text-gray-600">{app.email}</div>
                   <div className="text-sm text-gray-600 mt-1">{app.education}</div>
                   <div className="text-sm text-gray-600">{app.skills}</div>
                   {app.cv_filename && (
                     <div className="mt-2">
-                      <a href={`/uploads/${app.cv_filename}`} target="_blank" rel="noreferrer" className="text-purple-600 hover:text-purple-700 font-medium">View CV</a>
+                      <button type="button" onClick={() => viewCv(app.student_id)} className="text-purple-600 hover:text-purple-700 font-medium">View CV</button>
                     </div>
                   )}
                 </div>
@@ -90,6 +170,13 @@ const JobApplications = () => {
               )}
             </div>
           ))}
+          {nextCursor && (
+            <div className="text-center">
+              <button onClick={loadMore} disabled={loadingMore} className="px-4 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50">
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
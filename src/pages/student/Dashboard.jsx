@@ -14,9 +14,9 @@ const StudentDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [profileResponse, applicationsResponse] = await Promise.all([
-        apiClient.get('/student/profile'),
-        apiClient.get('/student/applications'),
+      const [profileResponse, applicationsResponse] = await apiClient.batch([
+        '/student/profile',
+        '/student/applications',
       ]);
       
       setProfile(profileResponse.profile);
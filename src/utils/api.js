@@ -62,6 +62,42 @@ class ApiClient {
     });
   }
 
+  async batch(endpoints) {
+    // Several GETs in one round trip, read from one database snapshot
+    const data = await this.post('/batch', {
+      requests: endpoints.map((path) => ({ path })),
+    });
+
+    return data.responses.map((response) => {
+      if (response.status >= 400) {
+        throw new Error(response.body?.error || 'An error occurred');
+      }
+      return response.body;
+    });
+  }
+
+  async openFile(endpoint) {
+    // Files need the Authorization header, so fetch the body and open it as a blob URL.
+    // The tab is opened first so popup blockers treat it as part of the click.
+    const tab = window.open('', '_blank');
+    try {
+      const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+        headers: this.token ? { Authorization: `Bearer ${this.token}` } : {},
+      });
+
+      if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.error || 'An error occurred');
+      }
+
+      const blob = await response.blob();
+      tab.location.href = URL.createObjectURL(blob);
+    } catch (error) {
+      tab?.close();
+      throw error;
+    }
+  }
+
   async upload(endpoint, formData) {
     return this.request(endpoint, {
       method: 'POST',